@@ -8,7 +8,6 @@ except ImportError:
 
 from typing import Iterator, List, Literal, Optional, TypedDict, Union, overload
 
-import gql
 import graphql.language as l
 from latch_sdk_gql.execute import execute
 from latch_sdk_gql.utils import _GqlJsonValue, _json_value, _name_node, _parse_selection
@@ -91,15 +90,17 @@ class Account:
         """
         return cls(id=current_workspace())
 
-    def load(self) -> None:
+    def load(self, *, bypass_cache: bool = False) -> None:
         """(Re-)populate this account instance's cache.
 
         Future calls to most getters will return immediately without making a network request.
 
-        Always makes a network request.
+        Always makes a network request, unless the GraphQL response cache is enabled
+        (see :func:`latch_sdk_gql.execute.enable_response_cache`) and holds a response
+        from the last minute. Pass `bypass_cache` to always make a network request.
         """
         data: _Account = execute(
-            gql.gql("""
+            """
             query AccountQuery($ownerId: BigInt!) {
                 accountInfo(id: $ownerId) {
                     catalogProjectsByOwnerId(
@@ -121,8 +122,10 @@ class Account:
                     }
                 }
             }
-            """),
+            """,
             {"ownerId": self.id},
+            cache_ttl=60,
+            bypass_cache=bypass_cache,
         )["accountInfo"]
 
         if data is None:
@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 import click
-import gql
 
 from latch_cli.utils.path import normalize_path
 from latch_sdk_gql.execute import execute
@@ -96,13 +95,13 @@ def rename_current_execution(name: str):
         return
 
     execute(
-        gql.gql("""
+        """
             mutation RenameExecution($argName: String!, $argToken: String!) {
                 renameExecutionByToken(input: {argToken: $argToken, argName: $argName}) {
                     clientMutationId
                 }
             }
-        """),
+        """,
         {"argName": name, "argToken": token},
     )
 
@@ -124,7 +123,7 @@ def add_execution_results(results: List[str]):
     ]
 
     execute(
-        gql.gql("""
+        """
             mutation addExecutionResults(
                 $argToken: String!,
                 $argPaths: [String]!
@@ -135,7 +134,7 @@ def add_execution_results(results: List[str]):
                     clientMutationId
                 }
             }
-        """),
+        """,
         {"argToken": token, "argPaths": results},
     )
 
@@ -146,7 +145,7 @@ def report_nextflow_used_storage(used_bytes: int):
         return
 
     execute(
-        gql.gql("""
+        """
             mutation updateNextflowStorageSize(
                 $argToken: String!,
                 $argUsedStorageBytes: BigInt!
@@ -157,7 +156,7 @@ def report_nextflow_used_storage(used_bytes: int):
                     clientMutationId
                 }
             }
-        """),
+        """,
         {"argToken": token, "argUsedStorageBytes": used_bytes},
     )
 
@@ -185,8 +184,7 @@ def get_execution_metadata(token: Optional[str] = None) -> ExecutionMetadata:
         )
 
     res = execute(
-        gql.gql(
-            """
+        """
             query GetExecutionMetadata($token: String!) {
                 executionCreatorByToken(token: $token) {
                     info {
@@ -200,8 +198,7 @@ def get_execution_metadata(token: Optional[str] = None) -> ExecutionMetadata:
                     }
                 }
             }
-            """
-        ),
+            """,
         {"token": token},
     )["executionCreatorByToken"]
 
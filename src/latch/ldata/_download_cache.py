@@ -0,0 +1,252 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from latch_sdk_config.user import user_config
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+# linux `FICLONE` ioctl - shares extents between two files on filesystems that
+# support it (btrfs, xfs, ...)
+_ficlone = 0x40049409
+
+
+def cache_key(node_id: str, version_id: str) -> str:
+    return hashlib.sha256(f"{node_id}:{version_id}".encode()).hexdigest()
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _ficlone, s.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+    return True
+
+
+def link_into(blob: Path, dst: Path) -> None:
+    """Make `dst` a copy of `blob`, sharing storage with it where possible.
+
+    Tries a reflink, then falls back to copying. Never hard links, since editing
+    a hard-linked destination in place would also change the cached copy (and
+    every other destination linked to it). `dst` is replaced atomically if it
+    already exists.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    if not reflink(blob, tmp):
+        shutil.copyfile(blob, tmp)
+
+    os.replace(tmp, dst)
+
+
+class DownloadCache:
+    """Persistent, size-bounded cache of downloaded LData objects.
+
+    Objects are keyed by node ID and version ID, so a cached copy is reused
+    until the remote file is overwritten. Destinations are reflinked to the
+    cached copy when the filesystem allows, otherwise the copy is duplicated -
+    either way, destinations can be modified without affecting the cache. Once
+    the cache holds more than `max_bytes`, the least recently used objects are
+    evicted.
+
+    Safe to share between threads and processes - a per-object lock file
+    ensures each object is downloaded once, and objects are never evicted while
+    another process holds their lock. A cached copy which was modified anyway is
+    detected (by size and mtime) and dropped instead of being served.
+    """
+
+    def __init__(self, *, max_bytes: int, root: Optional[Path] = None):
+        if root is None:
+            root = user_config.root / "download_cache"
+
+        self.root = root
+        self.max_bytes = max_bytes
+        # sqlite connections can't be used from other threads or after a fork,
+        # so each thread of each process opens its own
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection to the index, opening it (and creating the
+        cache directories) if needed."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            (self.root / "objects").mkdir(parents=True, exist_ok=True)
+            (self.root / "locks").mkdir(parents=True, exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.root / "index.sqlite", timeout=60, isolation_level=None
+            )
+            conn.execute("pragma journal_mode = wal")
+            conn.execute("pragma synchronous = normal")
+            conn.execute("""
+                create table if not exists objects (
+                    key text primary key,
+                    size integer not null,
+                    mtime_ns integer not null,
+                    last_access real not null
+                )
+            """)
+
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    def _blob_path(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / key
+
+    @contextmanager
+    def _lock(self, key: str, *, blocking: bool = True) -> Iterator[bool]:
+        if fcntl is None:
+            yield True
+            return
+
+        with open(self.root / "locks" / f"{key}.lock", "w") as f:
+            flags = fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+
+            try:
+                fcntl.flock(f.fileno(), flags)
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _remove(self, key: str) -> None:
+        self._blob_path(key).unlink(missing_ok=True)
+        self.conn.execute("delete from objects where key = ?", (key,))
+
+    def _lookup(self, key: str) -> Optional[Path]:
+        """The cached copy of `key`, if it is present and unmodified.
+
+        Must hold the lock for `key`.
+        """
+        row = self.conn.execute(
+            "select size, mtime_ns from objects where key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        blob = self._blob_path(key)
+        try:
+            st = blob.stat()
+        except FileNotFoundError:
+            self._remove(key)
+            return None
+
+        if (st.st_size, st.st_mtime_ns) != tuple(row):
+            self._remove(key)
+            return None
+
+        self.conn.execute(
+            "update objects set last_access = ? where key = ?", (time.time(), key)
+        )
+        return blob
+
+    def _evict(self, keep: str) -> None:
+        (total,) = self.conn.execute(
+            "select coalesce(sum(size), 0) from objects"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            "select key, size from objects order by last_access asc"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+
+            if key == keep:
+                continue
+
+            with self._lock(key, blocking=False) as acquired:
+                if not acquired:
+                    # in use by another process
+                    continue
+
+                self._remove(key)
+
+            total -= size
+
+    def fetch(
+        self,
+        node_id: str,
+        version_id: str,
+        dst: Path,
+        download: Callable[[Path], None],
+    ) -> bool:
+        """Place the object with `node_id` and `version_id` at `dst`.
+
+        `download` is called to write the object to a given path if it is not
+        cached yet. Returns whether the cached copy was reused.
+        """
+        key = cache_key(node_id, version_id)
+        # creates the lock directory
+        self._connect()
+
+        with self._lock(key):
+            blob = self._lookup(key)
+            hit = blob is not None
+
+            if blob is None:
+                blob = self._blob_path(key)
+                blob.parent.mkdir(parents=True, exist_ok=True)
+
+                tmp = blob.with_name(
+                    f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                try:
+                    download(tmp)
+                    os.replace(tmp, blob)
+                finally:
+                    tmp.unlink(missing_ok=True)
+
+                st = blob.stat()
+                self.conn.execute(
+                    """
+                    insert or replace into objects (key, size, mtime_ns, last_access)
+                    values (?, ?, ?, ?)
+                    """,
+                    (key, st.st_size, st.st_mtime_ns, time.time()),
+                )
+
+            link_into(blob, dst)
+
+        if not hit:
+            self._evict(keep=key)
+
+        return hit
+
+    def clear(self) -> None:
+        for (key,) in self.conn.execute("select key from objects").fetchall():
+            with self._lock(key, blocking=False) as acquired:
+                if acquired:
+                    self._remove(key)
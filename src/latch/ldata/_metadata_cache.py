@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Optional, Tuple, TypeVar
+
+from latch_cli.utils.path import normalize_path
+
+T = TypeVar("T")
+
+
+def cache_key(path: str) -> str:
+    return normalize_path(path).rstrip("/")
+
+
+class MetadataCache(Generic[T]):
+    """Process-wide cache of LData node metadata, shared by every `LPath`.
+
+    Entries are keyed by normalized path and can also be looked up by node ID.
+    Each entry expires `ttl` seconds after it was stored, and the least recently
+    used entries are evicted once there are more than `max_entries`.
+
+    Thread-safe.
+    """
+
+    def __init__(self, *, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # key -> (expiry, node id, data)
+        self.entries: "OrderedDict[str, Tuple[float, Optional[str], T]]" = (
+            OrderedDict()
+        )
+        self.keys_by_node_id: Dict[str, str] = {}
+
+        self.lock = threading.Lock()
+
+    def _remove(self, key: str) -> None:
+        _, node_id, _ = self.entries.pop(key)
+        if node_id is not None and self.keys_by_node_id.get(node_id) == key:
+            del self.keys_by_node_id[node_id]
+
+    def _get(self, key: str) -> Optional[T]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expiry, _, data = entry
+        if expiry < time.monotonic():
+            self._remove(key)
+            return None
+
+        self.entries.move_to_end(key)
+        return data
+
+    def get(self, path: str) -> Optional[T]:
+        with self.lock:
+            return self._get(cache_key(path))
+
+    def get_by_node_id(self, node_id: str) -> Optional[T]:
+        with self.lock:
+            key = self.keys_by_node_id.get(node_id)
+            if key is None:
+                return None
+
+            return self._get(key)
+
+    def put(self, path: str, node_id: Optional[str], data: T) -> None:
+        key = cache_key(path)
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = (time.monotonic() + self.ttl, node_id, data)
+            if node_id is not None:
+                self.keys_by_node_id[node_id] = key
+
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, path: str) -> None:
+        """Forget `path` and everything below it."""
+        key = cache_key(path)
+
+        with self.lock:
+            for x in list(self.entries.keys()):
+                if x == key or x.startswith(key + "/"):
+                    self._remove(x)
+
+    def invalidate_node_id(self, node_id: str) -> None:
+        """Forget the node `node_id` and everything below it."""
+        with self.lock:
+            key = self.keys_by_node_id.get(node_id)
+
+        if key is not None:
+            self.invalidate(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_node_id.clear()
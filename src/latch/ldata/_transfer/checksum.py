@@ -0,0 +1,300 @@
+import hashlib
+import math
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from latch_cli.constants import Units, latch_constants
+from latch_sdk_config.user import user_config
+
+from .utils import get_max_workers, http_session
+
+hash_block_size = 8 * Units.MiB
+
+
+class HashIndex:
+    """On-disk cache of local file checksums and remote ETags.
+
+    Local entries are keyed by the file's device, inode, size and mtime, so a
+    file is only hashed again once it has changed (or was replaced). Checksums
+    are stored per part size since multipart ETags depend on it (part size 0 is
+    a plain MD5 of the whole file).
+
+    Remote entries are keyed by node ID and version ID, so a remote object's
+    ETag is only fetched again once it has been overwritten.
+
+    Not thread-safe - use from a single thread.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            path = user_config.root / "hash_index.sqlite"
+
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._conn.execute("pragma journal_mode = wal")
+            self._conn.execute("pragma synchronous = normal")
+            self._conn.execute("""
+                create table if not exists hashes (
+                    dev integer not null,
+                    inode integer not null,
+                    size integer not null,
+                    mtime_ns integer not null,
+                    part_size integer not null,
+                    etag text not null,
+                    primary key (dev, inode, size, mtime_ns, part_size)
+                )
+            """)
+            self._conn.execute("""
+                create table if not exists remote_etags (
+                    node_id text not null,
+                    version_id text not null,
+                    etag text not null,
+                    primary key (node_id, version_id)
+                )
+            """)
+
+        return self._conn
+
+    def get(self, st: os.stat_result) -> Dict[int, str]:
+        """Checksums of the file with stat `st`, keyed by part size."""
+        rows = self.conn.execute(
+            """
+            select part_size, etag from hashes
+            where dev = ? and inode = ? and size = ? and mtime_ns = ?
+            """,
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns),
+        ).fetchall()
+
+        return dict(rows)
+
+    def put(self, st: os.stat_result, part_size: int, etag: str) -> None:
+        self.conn.execute(
+            """
+            insert or replace into hashes
+                (dev, inode, size, mtime_ns, part_size, etag)
+            values (?, ?, ?, ?, ?, ?)
+            """,
+            (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, part_size, etag),
+        )
+
+    def get_remote(self, node_id: str, version_id: str) -> Optional[str]:
+        """ETag of version `version_id` of the remote object `node_id`."""
+        row = self.conn.execute(
+            "select etag from remote_etags where node_id = ? and version_id = ?",
+            (node_id, version_id),
+        ).fetchone()
+
+        return None if row is None else row[0]
+
+    def put_remote(self, node_id: str, version_id: str, etag: str) -> None:
+        # older versions can never be requested again
+        self.conn.execute("delete from remote_etags where node_id = ?", (node_id,))
+        self.conn.execute(
+            """
+            insert into remote_etags (node_id, version_id, etag)
+            values (?, ?, ?)
+            """,
+            (node_id, version_id, etag),
+        )
+
+
+@dataclass(frozen=True)
+class ChecksumJob:
+    """A local file to compare against the remote object behind `signed_url`.
+
+    If `node_id` and `version_id` identify the remote object, its ETag is only
+    fetched once per version.
+    """
+
+    path: Path
+    signed_url: str
+    node_id: Optional[str] = None
+    version_id: Optional[str] = None
+
+
+def parse_etag(etag: str) -> Tuple[str, int]:
+    """Split an S3 ETag into its digest and part count (0 if not multipart)."""
+    etag = etag.strip('"')
+
+    digest, sep, part_count = etag.partition("-")
+    if sep == "" or not part_count.isdigit():
+        return digest, 0
+
+    return digest, int(part_count)
+
+
+def guess_part_size(size: int, part_count: int) -> int:
+    """The part size a file of `size` bytes was most likely uploaded with, given
+    that it was uploaded in `part_count` parts.
+
+    Uploads made by `latch cp`/`latch sync` use `get_upload_layout`, so the
+    default chunk size is tried first, then the smallest whole number of MiB
+    that produces `part_count` parts (which covers `--chunk-size-mib`).
+    """
+    if part_count <= 1:
+        return max(size, 1)
+
+    default = max(
+        latch_constants.file_chunk_size,
+        math.ceil(size / latch_constants.maximum_upload_parts),
+    )
+    if math.ceil(size / default) == part_count:
+        return default
+
+    return math.ceil(size / part_count / Units.MiB) * Units.MiB
+
+
+def compute_etag(path: Path, part_count: int, part_size: int) -> str:
+    """The S3 ETag `path` would have if uploaded in `part_count` parts of
+    `part_size` bytes (or in a single request if `part_count` is 0)."""
+    if part_count == 0:
+        res = hashlib.md5()
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(hash_block_size)
+                if len(block) == 0:
+                    break
+                res.update(block)
+
+        return res.hexdigest()
+
+    digests = hashlib.md5()
+    with open(path, "rb") as f:
+        for _ in range(part_count):
+            part = hashlib.md5()
+            remaining = part_size
+            while remaining > 0:
+                block = f.read(min(hash_block_size, remaining))
+                if len(block) == 0:
+                    break
+                part.update(block)
+                remaining -= len(block)
+
+            digests.update(part.digest())
+
+    return f"{digests.hexdigest()}-{part_count}"
+
+
+def get_remote_etag(signed_url: str) -> Optional[str]:
+    """The ETag of the object behind a presigned download URL.
+
+    Presigned URLs are only valid for GET, so a single byte is requested
+    instead of sending a HEAD.
+    """
+    with http_session.get(
+        signed_url, headers={"Range": "bytes=0-0"}, stream=True
+    ) as res:
+        if res.status_code not in {200, 206, 416}:
+            return None
+
+        return res.headers.get("ETag")
+
+
+def check_one(
+    path: Path,
+    signed_url: str,
+    cached: Dict[int, str],
+    remote_etag: Optional[str] = None,
+) -> Optional[Tuple[int, str, bool, str]]:
+    """Compare `path` against the object behind `signed_url`, whose ETag is
+    fetched unless given as `remote_etag`.
+
+    Returns the part size used, the local checksum, whether they match and the
+    remote ETag, or `None` if the remote ETag could not be fetched.
+    """
+    if remote_etag is None:
+        remote_etag = get_remote_etag(signed_url)
+        if remote_etag is None:
+            return None
+
+    digest, part_count = parse_etag(remote_etag)
+
+    # single-request uploads are hashed whole, which is recorded as part size 0
+    part_size = 0
+    if part_count > 0:
+        part_size = guess_part_size(path.stat().st_size, part_count)
+
+    local = cached.get(part_size)
+    if local is None:
+        local = compute_etag(path, part_count, part_size)
+
+    expected = digest if part_count == 0 else f"{digest}-{part_count}"
+    return part_size, local, local == expected, remote_etag
+
+
+def matching_files(
+    jobs: List[ChecksumJob],
+    *,
+    index: Optional[HashIndex] = None,
+    cores: Optional[int] = None,
+) -> Set[Path]:
+    """The local files whose content matches the remote object they are paired
+    with.
+
+    Local checksums and remote ETags are looked up in (and added to) `index`, so
+    files which have not changed since the last check are not read again, and
+    remote objects which have not been overwritten are not requested again.
+    """
+    if index is None:
+        index = HashIndex()
+
+    stats: Dict[Path, os.stat_result] = {}
+    cached: Dict[Path, Dict[int, str]] = {}
+    remote_etags: Dict[Path, Optional[str]] = {}
+    for job in jobs:
+        st = job.path.stat()
+        stats[job.path] = st
+        cached[job.path] = index.get(st)
+
+        remote_etags[job.path] = None
+        if job.node_id is not None and job.version_id is not None:
+            remote_etags[job.path] = index.get_remote(job.node_id, job.version_id)
+
+    res: Set[Path] = set()
+    if len(jobs) == 0:
+        return res
+
+    max_workers = cores if cores is not None else get_max_workers()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futs = {
+            executor.submit(
+                check_one,
+                job.path,
+                job.signed_url,
+                cached[job.path],
+                remote_etags[job.path],
+            ): job
+            for job in jobs
+        }
+
+        for fut, job in futs.items():
+            x = fut.result()
+            if x is None:
+                continue
+
+            part_size, etag, matches, remote_etag = x
+            if part_size not in cached[job.path]:
+                index.put(stats[job.path], part_size, etag)
+
+            if (
+                remote_etags[job.path] is None
+                and job.node_id is not None
+                and job.version_id is not None
+            ):
+                index.put_remote(job.node_id, job.version_id, remote_etag)
+
+            if matches:
+                res.add(job.path)
+
+    return res
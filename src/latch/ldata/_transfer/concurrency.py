@@ -0,0 +1,211 @@
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Executor, Future, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, TypeVar
+
+from latch_cli.constants import Units
+
+from .utils import get_max_workers, initial_workers
+
+# requests are compared by their latency per byte, but small objects are
+# dominated by round trip time so they are treated as if they were this large
+min_sample_bytes = 256 * Units.KiB
+
+min_epoch_duration = 1  # seconds
+
+T = TypeVar("T")
+
+
+class ConcurrencyController:
+    """AIMD controller for the number of concurrent transfer requests.
+
+    Starts in slow-start, doubling the limit every epoch while throughput keeps
+    rising. Afterwards the limit grows by one per epoch as long as throughput
+    rises and latency stays flat, and is cut multiplicatively when requests
+    are throttled (429/503) or latency inflates past the best observed value.
+
+    An epoch ends once at least `limit` requests and `min_epoch_duration`
+    seconds have elapsed, so every decision is based on a full window of
+    requests at the current limit.
+
+    `acquire` and `release` bound the number of requests in flight by the
+    limit, so one controller can be shared by every worker of a transfer
+    no matter how they are nested (e.g. files and the ranges within them).
+
+    If `fixed` is set (e.g. via `--cores`), the limit never changes.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        minimum: int = 1,
+        maximum: int,
+        fixed: bool = False,
+        increase_threshold: float = 1.05,
+        latency_threshold: float = 2,
+        decrease_factor: float = 0.5,
+    ):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = max(self.minimum, min(initial, self.maximum))
+        self.fixed = fixed
+
+        self.increase_threshold = increase_threshold
+        self.latency_threshold = latency_threshold
+        self.decrease_factor = decrease_factor
+
+        self.slow_start = True
+        self.best_throughput = 0.0
+        self.base_latency: Optional[float] = None
+        self.last_decrease = 0.0
+
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)
+        self._reset_epoch()
+
+    def _reset_epoch(self):
+        self.epoch_start = time.monotonic()
+        self.epoch_requests = 0
+        self.epoch_bytes = 0
+        self.epoch_latency = 0.0
+
+    def get_limit(self) -> int:
+        return self.limit
+
+    def get_maximum(self) -> int:
+        return self.maximum
+
+    def acquire(self) -> None:
+        """Wait until fewer than `limit` requests are in flight, then start one."""
+        with self.cond:
+            while self.in_flight >= self.limit:
+                self.cond.wait()
+
+            self.in_flight += 1
+
+    def release(self) -> None:
+        """Finish a request started by `acquire`."""
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify()
+
+    def record(self, num_bytes: int, latency: float, *, throttled: bool = False):
+        """Record a finished request of `num_bytes` that took `latency` seconds."""
+        if self.fixed:
+            return
+
+        with self.lock:
+            self.epoch_requests += 1
+            self.epoch_bytes += num_bytes
+            self.epoch_latency += latency / max(num_bytes, min_sample_bytes)
+
+            if throttled:
+                # back off immediately rather than waiting out the epoch, but
+                # only once for a burst of throttled requests
+                if time.monotonic() - self.last_decrease >= min_epoch_duration:
+                    self._decrease()
+                    self._reset_epoch()
+                return
+
+            elapsed = time.monotonic() - self.epoch_start
+            if self.epoch_requests < self.limit or elapsed < min_epoch_duration:
+                return
+
+            throughput = self.epoch_bytes / elapsed
+            latency_per_byte = self.epoch_latency / self.epoch_requests
+
+            if self.base_latency is None or latency_per_byte < self.base_latency:
+                self.base_latency = latency_per_byte
+
+            if latency_per_byte > self.base_latency * self.latency_threshold:
+                self._decrease()
+            elif throughput > self.best_throughput * self.increase_threshold:
+                self.best_throughput = throughput
+                self._increase()
+            elif self.slow_start:
+                # throughput plateaued, so continue probing more gently
+                self.slow_start = False
+
+            self._reset_epoch()
+
+    def _increase(self):
+        if self.slow_start:
+            self.limit = min(self.maximum, self.limit * 2)
+        else:
+            self.limit = min(self.maximum, self.limit + 1)
+
+        self.cond.notify_all()
+
+    def _decrease(self):
+        self.last_decrease = time.monotonic()
+        self.slow_start = False
+        self.limit = max(self.minimum, int(self.limit * self.decrease_factor))
+
+        # the link may have changed, so re-learn what "good" looks like
+        self.best_throughput = 0.0
+        self.base_latency = None
+
+
+@contextmanager
+def request_slot(controller: ConcurrencyController) -> Iterator[None]:
+    """Hold one of `controller`'s in flight request slots.
+
+    A function rather than a method so that it also works through manager
+    proxies.
+    """
+    controller.acquire()
+    try:
+        yield
+    finally:
+        controller.release()
+
+
+def controller_args(
+    cores: Optional[int], *, initial: int = initial_workers, maximum: Optional[int] = None
+) -> Dict[str, Any]:
+    """`ConcurrencyController` arguments for a transfer.
+
+    If `cores` is set, the limit is pinned to it.
+    """
+    if cores is not None:
+        return {"initial": cores, "maximum": cores, "fixed": True}
+
+    return {
+        "initial": initial,
+        "maximum": maximum if maximum is not None else get_max_workers(),
+    }
+
+
+class BoundedExecutor:
+    """Submits tasks to `executor` while keeping at most `controller.get_limit()`
+    of them pending.
+
+    `executor` should have `controller.maximum` workers so that the limit is
+    never bounded by the pool instead. Exceptions raised by tasks are re-raised
+    from `submit` or `wait`.
+    """
+
+    def __init__(self, executor: Executor, controller: ConcurrencyController):
+        self.executor = executor
+        self.controller = controller
+        self.futs: Set[Future[Any]] = set()
+
+    def _reap(self, return_when: str) -> List[Any]:
+        done, self.futs = wait(self.futs, return_when=return_when)
+        return [fut.result() for fut in done]
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> List[Any]:
+        """Submit `fn`, returning the results of any tasks finished meanwhile."""
+        results: List[Any] = []
+        while len(self.futs) >= self.controller.get_limit():
+            results.extend(self._reap(FIRST_COMPLETED))
+
+        self.futs.add(self.executor.submit(fn, *args, **kwargs))
+        return results
+
+    def wait(self) -> List[Any]:
+        """Wait for every pending task, returning their results."""
+        return self._reap(ALL_COMPLETED)
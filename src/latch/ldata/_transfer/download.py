@@ -1,25 +1,59 @@
 import json
+import os
 import time
-from concurrent.futures import ProcessPoolExecutor
-from contextlib import closing
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack, closing
 from dataclasses import dataclass
-from itertools import repeat
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, TypedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, TypedDict
 
 import click
+from requests import Response
+from requests.exceptions import RequestException
 
 from latch.ldata.type import LDataNodeType
 from latch_cli.constants import Units
-from latch_cli.utils import get_auth_header, human_readable_time, with_si_suffix
+from latch_cli.utils import (
+    get_auth_header,
+    human_readable_time,
+    urljoins,
+    with_si_suffix,
+)
 from latch_cli.utils.path import normalize_path
 from latch_sdk_config.latch import config as latch_config
-from latch_sdk_config.user import user_config
 
+from .concurrency import (
+    BoundedExecutor,
+    ConcurrencyController,
+    controller_args,
+    request_slot,
+)
 from .manager import TransferStateManager
-from .node import get_node_data
+from .node import get_node_data, get_node_data_batched
+from .partial import PartialDownload
 from .progress import Progress, ProgressBars, get_free_index
-from .utils import get_max_workers, http_session
+from .utils import (
+    get_version_xattr,
+    http_session,
+    set_version_xattr,
+    use_process_pool,
+    was_throttled,
+)
+
+
+# files at least this large are split into ranges which are downloaded
+# concurrently, each written in place into a preallocated file
+ranged_download_threshold = 64 * Units.MiB
+download_range_size = 16 * Units.MiB
+max_ranges_in_flight = 16
+max_range_retries = 5
 
 
 class GetSignedUrlData(TypedDict):
@@ -34,6 +68,14 @@ class GetSignedUrlsRecursiveData(TypedDict):
 class DownloadJob:
     signed_url: str
     dest: Path
+    version_id: Optional[str] = None
+    size: Optional[int] = None
+    # if set, the downloaded file's modification time is set to this
+    modify_time: Optional[datetime] = None
+    # size of the byte ranges large files are split into
+    range_size: int = download_range_size
+    # ID of the remote node, used to cache its ETag per version
+    node_id: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -49,6 +91,7 @@ def download(
     progress: Progress,
     verbose: bool,
     confirm_overwrite: bool = True,
+    cores: Optional[int] = None,
 ) -> DownloadResult:
     if not dest.parent.exists():
         raise ValueError(
@@ -69,7 +112,113 @@ def download(
         LDataNodeType.mount_azure,
     }
 
+    json_data = get_signed_urls(src, normalized, recursive=can_have_children)
+
     if can_have_children:
+        dir_data: GetSignedUrlsRecursiveData = json_data["data"]
+
+        if dest.exists() and not normalized.endswith("/"):
+            dest = dest / node_data.name
+
+        try:
+            dest.mkdir(exist_ok=True)
+        except FileNotFoundError:
+            raise ValueError(f"No such download destination {dest}")
+        except (FileExistsError, NotADirectoryError):
+            raise ValueError(f"Download destination {dest} is not a directory")
+
+        unconfirmed_jobs: List[DownloadJob] = [
+            job for _, job in get_download_jobs(normalized, dir_data["urls"], dest)
+        ]
+        confirmed_jobs: List[DownloadJob] = []
+        rejected_jobs: Set[Path] = set()
+
+        for job in unconfirmed_jobs:
+            reject_job = False
+            for parent in job.dest.parents:
+                if parent in rejected_jobs:
+                    reject_job = True
+                    break
+
+            if reject_job:
+                continue
+
+            try:
+                job.dest.parent.mkdir(parents=True, exist_ok=True)
+                confirmed_jobs.append(job)
+            except FileExistsError:
+                if confirm_overwrite and click.confirm(
+                    f"A file already exists at {job.dest.parent}. Overwrite?",
+                    default=False,
+                ):
+                    job.dest.parent.unlink()
+                    job.dest.parent.mkdir(parents=True, exist_ok=True)
+                    confirmed_jobs.append(job)
+                else:
+                    print(f"Skipping {job.dest.parent}, file already exists")
+                    rejected_jobs.add(job.dest.parent)
+
+        num_unchanged = len(confirmed_jobs)
+        confirmed_jobs = [job for job in confirmed_jobs if not is_unchanged(job)]
+        num_unchanged -= len(confirmed_jobs)
+
+        if num_unchanged > 0 and progress != Progress.none:
+            click.echo(f"Skipping {num_unchanged} unchanged files")
+
+        return download_jobs(
+            confirmed_jobs, progress=progress, verbose=verbose, cores=cores
+        )
+
+    file_data: GetSignedUrlData = json_data["data"]
+
+    if dest.exists() and dest.is_dir():
+        dest = dest / node_data.name
+
+    job = DownloadJob(file_data["url"], dest, node_data.version_id, node_data.size)
+    if is_unchanged(job):
+        if progress != Progress.none:
+            click.echo(f"Skipping {dest}, unchanged since last download")
+
+        return DownloadResult(0, 0, 0)
+
+    return download_one(job, progress=progress, verbose=verbose, cores=cores)
+
+
+def download_one(
+    job: DownloadJob,
+    *,
+    progress: Progress,
+    verbose: bool,
+    cores: Optional[int] = None,
+) -> DownloadResult:
+    """Download a single file, fetching the ranges of large files concurrently.
+
+    Runs entirely in the calling process, on threads.
+    """
+    if progress == Progress.none:
+        num_bars = 0
+    else:
+        num_bars = 1
+
+    controller = ConcurrencyController(
+        **controller_args(cores, maximum=max_ranges_in_flight)
+    )
+
+    with closing(
+        ProgressBars(num_bars, show_total_progress=False, verbose=verbose)
+    ) as progress_bars:
+        start = time.monotonic()
+        total_bytes = download_file(job, progress_bars, controller)
+        end = time.monotonic()
+
+    total_time = end - start
+
+    return DownloadResult(1, total_bytes, total_time)
+
+
+def get_signed_urls(src: str, normalized: str, *, recursive: bool) -> Dict[str, Any]:
+    """Presign `src` for download, or all of its descendants if `recursive`."""
+    if recursive:
         endpoint = latch_config.api.data.get_signed_urls_recursive
     else:
         endpoint = latch_config.api.data.get_signed_url
@@ -113,148 +262,447 @@ def download(
             )
         raise RuntimeError(f"{msg} with code {res.status_code}: {res.json()['error']}")
 
-    json_data = res.json()
-    if can_have_children:
-        dir_data: GetSignedUrlsRecursiveData = json_data["data"]
+    return res.json()
 
-        if dest.exists() and not normalized.endswith("/"):
-            dest = dest / node_data.name
 
-        try:
-            dest.mkdir(exist_ok=True)
-        except FileNotFoundError:
-            raise ValueError(f"No such download destination {dest}")
-        except (FileExistsError, NotADirectoryError):
-            raise ValueError(f"Download destination {dest} is not a directory")
+def get_download_jobs(
+    normalized: str,
+    urls: Dict[str, str],
+    dest: Path,
+    *,
+    preserve_modify_time: bool = False,
+) -> List[Tuple[str, DownloadJob]]:
+    """Jobs downloading `urls` (keyed by path relative to `normalized`) into
+    `dest`, each paired with the remote path of its file.
+
+    Version IDs and sizes are fetched in bulk so that files which are unchanged
+    since they were last downloaded can be skipped. If `preserve_modify_time`
+    is set, downloaded files take on the remote modification time.
+    """
+    remote_paths = {rel_path: urljoins(normalized, rel_path) for rel_path in urls}
+    remote_data = get_node_data_batched(
+        list(remote_paths.values()), allow_resolve_to_parent=True
+    ).data
+
+    ret: List[Tuple[str, DownloadJob]] = []
+    for rel_path, url in urls.items():
+        remote_path = remote_paths[rel_path]
+
+        child = remote_data.get(remote_path)
+        if child is None or not child.exists():
+            ret.append((remote_path, DownloadJob(url, dest / rel_path)))
+            continue
+
+        ret.append((
+            remote_path,
+            DownloadJob(
+                url,
+                dest / rel_path,
+                version_id=child.version_id,
+                size=child.size,
+                modify_time=child.modify_time if preserve_modify_time else None,
+                node_id=child.id,
+            ),
+        ))
+
+    return ret
+
+
+def download_jobs(
+    jobs: List[DownloadJob],
+    *,
+    progress: Progress,
+    verbose: bool,
+    cores: Optional[int] = None,
+) -> DownloadResult:
+    """Download many files in parallel. Parents of every `job.dest` must exist.
+
+    Large batches are spread over worker processes, small ones (see
+    `use_process_pool`) run on threads in the calling process.
+    """
+    num_files = len(jobs)
+    concurrency_args = controller_args(cores)
+
+    if progress == Progress.none:
+        num_bars = 0
+        show_total_progress = False
+    elif progress == Progress.total:
+        num_bars = 0
+        show_total_progress = True
+    else:
+        num_bars = min(concurrency_args["initial"], num_files)
+        show_total_progress = True
+
+    with ExitStack() as stack:
+        controller: ConcurrencyController
+        progress_bars: ProgressBars
+        executor: Executor
+        if use_process_pool(num_files):
+            manager = stack.enter_context(TransferStateManager())
+            controller = manager.ConcurrencyController(**concurrency_args)
+            progress_bars = manager.ProgressBars(
+                num_bars, show_total_progress=show_total_progress, verbose=verbose
+            )
+            # todo(ayush): benchmark this against asyncio
+            executor = ProcessPoolExecutor(max_workers=concurrency_args["maximum"])
+        else:
+            controller = ConcurrencyController(**concurrency_args)
+            progress_bars = ProgressBars(
+                num_bars, show_total_progress=show_total_progress, verbose=verbose
+            )
+            executor = ThreadPoolExecutor(max_workers=concurrency_args["maximum"])
 
-        unconfirmed_jobs: List[DownloadJob] = []
-        confirmed_jobs: List[DownloadJob] = []
-        rejected_jobs: Set[Path] = set()
+        stack.enter_context(closing(progress_bars))
+        # shut down before the progress bars and manager
+        stack.enter_context(executor)
 
-        for rel_path, url in dir_data["urls"].items():
-            unconfirmed_jobs.append(DownloadJob(url, dest / rel_path))
+        progress_bars.set_total(num_files, "Copying Files")
 
-        for job in unconfirmed_jobs:
-            reject_job = False
-            for parent in job.dest.parents:
-                if parent in rejected_jobs:
-                    reject_job = True
-                    break
+        start = time.monotonic()
 
-            if reject_job:
-                continue
+        bounded = BoundedExecutor(executor, controller)
 
-            try:
-                job.dest.parent.mkdir(parents=True, exist_ok=True)
-                confirmed_jobs.append(job)
-            except FileExistsError:
-                if confirm_overwrite and click.confirm(
-                    f"A file already exists at {job.dest.parent}. Overwrite?",
-                    default=False,
-                ):
-                    job.dest.parent.unlink()
-                    job.dest.parent.mkdir(parents=True, exist_ok=True)
-                    confirmed_jobs.append(job)
-                else:
-                    print(f"Skipping {job.dest.parent}, file already exists")
-                    rejected_jobs.add(job.dest.parent)
+        total_bytes = 0
+        for job in jobs:
+            total_bytes += sum(
+                bounded.submit(download_file, job, progress_bars, controller)
+            )
+        total_bytes += sum(bounded.wait())
 
-        num_files = len(confirmed_jobs)
+        end = time.monotonic()
 
-        if progress == Progress.none:
-            num_bars = 0
-            show_total_progress = False
-        elif progress == Progress.total:
-            num_bars = 0
-            show_total_progress = True
-        else:
-            num_bars = min(get_max_workers(), num_files)
-            show_total_progress = True
-
-        with TransferStateManager() as manager:
-            progress_bars: ProgressBars
-            with closing(
-                manager.ProgressBars(
-                    num_bars, show_total_progress=show_total_progress, verbose=verbose
-                )
-            ) as progress_bars:
-                progress_bars.set_total(num_files, "Copying Files")
+    return DownloadResult(num_files, total_bytes, end - start)
 
-                start = time.monotonic()
 
-                # todo(ayush): benchmark this against asyncio
-                with ProcessPoolExecutor(max_workers=get_max_workers()) as executor:
-                    total_bytes = sum(
-                        executor.map(
-                            download_file, confirmed_jobs, repeat(progress_bars)
+# dest will always be a path which includes the copied file as its leaf
+# e.g. download_file("a/b.txt", Path("c/d.txt")) will copy the content of 'b.txt' into 'd.txt'
+def download_file(
+    job: DownloadJob,
+    progress_bars: ProgressBars,
+    controller: Optional[ConcurrencyController] = None,
+) -> int:
+    if controller is None:
+        controller = ConcurrencyController(
+            max_ranges_in_flight, maximum=max_ranges_in_flight, fixed=True
+        )
+
+    # content is written to `<dest>.partial` and only moved into place once
+    # complete, so an interrupted download never leaves a truncated file behind
+    partial = PartialDownload(job.dest)
+
+    with get_free_index(progress_bars) as pbar_index:
+        start = time.monotonic()
+
+        fd: Optional[int] = None
+        try:
+            with request_slot(controller):
+                req_start = time.monotonic()
+
+                # requesting an open-ended range returns the whole object along
+                # with its size, so small files still only need a single request
+                res = http_session.get(
+                    job.signed_url, headers={"Range": "bytes=0-"}, stream=True
+                )
+                with closing(res):
+                    if res.status_code == 416:
+                        # ranges are never satisfiable for empty objects
+                        partial.path.write_bytes(b"")
+                        total_bytes = 0
+                        ranges: List[Tuple[int, int]] = []
+                    elif res.status_code not in {200, 206}:
+                        raise RuntimeError(
+                            f"failed to download {job.dest.name}: {res.status_code}:"
+                            f" {res.json()['error']}"
+                        )
+                    else:
+                        total_bytes = get_object_size(res)
+                        progress_bars.set(
+                            index=pbar_index, total=total_bytes, desc=job.dest.name
                         )
-                    )
 
-                end = time.monotonic()
+                        if (
+                            res.status_code == 206
+                            and total_bytes >= ranged_download_threshold
+                        ):
+                            fd = os.open(partial.path, os.O_RDWR | os.O_CREAT, 0o666)
+                            ranges = start_ranged_download(
+                                job,
+                                res,
+                                fd,
+                                total_bytes,
+                                progress_bars,
+                                pbar_index,
+                                controller,
+                                partial,
+                                req_start,
+                            )
+                        else:
+                            with open(partial.path, "wb") as f:
+                                for data in res.iter_content(
+                                    chunk_size=5 * Units.MiB
+                                ):  # todo(ayush): figure out why chunk_size = None breaks in pods
+                                    f.write(data)
+                                    progress_bars.update(pbar_index, len(data))
+
+                            controller.record(
+                                total_bytes,
+                                time.monotonic() - req_start,
+                                throttled=was_throttled(res),
+                            )
+                            ranges = []
+
+            if len(ranges) > 0:
+                assert fd is not None
+                download_ranges(
+                    job, fd, ranges, progress_bars, pbar_index, controller, partial
+                )
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+        partial.finish()
+        finish_download(job)
+
+        end = time.monotonic()
+        progress_bars.update_total_progress(1)
+        progress_bars.write(
+            f"Downloaded {job.dest.name} ({with_si_suffix(total_bytes)})"
+            f" in {human_readable_time(end - start)}"
+        )
+
+    return total_bytes
+
+
+def start_ranged_download(
+    job: DownloadJob,
+    res: Response,
+    fd: int,
+    total_bytes: int,
+    progress_bars: ProgressBars,
+    pbar_index: Optional[int],
+    controller: ConcurrencyController,
+    partial: PartialDownload,
+    req_start: float,
+) -> List[Tuple[int, int]]:
+    """Prepare the partial file of a ranged download and write the first range
+    from `res`, the request that is already open.
+
+    Returns the ranges which remain to be downloaded.
+    """
+    version_id = job.version_id
+    if version_id is None:
+        version_id = res.headers.get("ETag")
+
+    if partial.resume(version_id, total_bytes):
+        progress_bars.update(pbar_index, partial.completed_bytes())
     else:
-        file_data: GetSignedUrlData = json_data["data"]
+        os.ftruncate(fd, 0)
+        preallocate(fd, total_bytes)
 
-        num_files = 1
+    ranges = [
+        (offset, min(job.range_size, total_bytes - offset))
+        for offset in range(0, total_bytes, job.range_size)
+    ]
+    ranges = [x for x in ranges if not partial.is_done(*x)]
 
-        if dest.exists() and dest.is_dir():
-            dest = dest / node_data.name
+    if len(ranges) == 0 or ranges[0][0] != 0:
+        return ranges
 
-        if progress == Progress.none:
-            num_bars = 0
-        else:
-            num_bars = 1
+    n = 0
+    try:
+        for chunk in write_range(res, fd, 0, ranges[0][1], progress_bars, pbar_index):
+            n += chunk
+    except (RequestException, OSError):
+        # the range is downloaded again with the others
+        pass
 
-        with TransferStateManager() as manager:
-            progress_bars: ProgressBars
-            with closing(
-                manager.ProgressBars(
-                    num_bars, show_total_progress=False, verbose=verbose
-                )
-            ) as progress_bars:
-                start = time.monotonic()
-                total_bytes = download_file(
-                    DownloadJob(file_data["url"], dest), progress_bars
+    if n == ranges[0][1]:
+        partial.record(*ranges.pop(0))
+    else:
+        progress_bars.update(pbar_index, -n)
+
+    controller.record(n, time.monotonic() - req_start, throttled=was_throttled(res))
+
+    return ranges
+
+
+def finish_download(job: DownloadJob) -> None:
+    """Record the remote version of a completed download and, if requested, give
+    it the remote modification time."""
+    if job.version_id is not None:
+        set_version_xattr(job.dest, job.version_id)
+
+    if job.modify_time is not None:
+        ts = job.modify_time.timestamp()
+        os.utime(job.dest, (ts, ts))
+
+
+def is_unchanged(job: DownloadJob) -> bool:
+    """Whether `job.dest` was downloaded from the current version of the object."""
+    if job.version_id is None:
+        return False
+
+    try:
+        st = job.dest.stat()
+    except OSError:
+        return False
+
+    # guards against the local copy being modified after it was downloaded
+    if job.size is not None and st.st_size != job.size:
+        return False
+
+    return get_version_xattr(job.dest) == job.version_id
+
+
+def get_object_size(res: Response) -> int:
+    if res.status_code == 206:
+        content_range = res.headers.get("Content-Range")
+        assert content_range is not None, "Must have a content-range header"
+
+        # bytes <start>-<end>/<size>
+        return int(content_range.rsplit("/", 1)[1])
+
+    content_length = res.headers.get("Content-Length")
+    assert content_length is not None, "Must have a content-length header"
+
+    return int(content_length)
+
+
+def preallocate(fd: int, size: int) -> None:
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        # not available on macOS and some filesystems, fall back to a sparse file
+        os.ftruncate(fd, size)
+
+
+def write_range(
+    res: Response,
+    fd: int,
+    offset: int,
+    length: int,
+    progress_bars: ProgressBars,
+    pbar_index: Optional[int],
+) -> Iterator[int]:
+    """Write up to `length` bytes of `res` to `fd` at `offset`.
+
+    Yields the size of each chunk once it is written, so callers know how much
+    of the range is on disk even if reading the body fails part way. Writes
+    less than `length` bytes only if the body ended early.
+    """
+    written = 0
+    for data in res.iter_content(chunk_size=min(length, 5 * Units.MiB)):
+        data = data[: length - written]
+
+        view = memoryview(data)
+        while len(view) > 0:
+            n = os.pwrite(fd, view, offset + written)
+            view = view[n:]
+            written += n
+
+        progress_bars.update(pbar_index, len(data))
+        yield len(data)
+
+        if written == length:
+            break
+
+
+def download_range(
+    job: DownloadJob,
+    fd: int,
+    offset: int,
+    length: int,
+    progress_bars: ProgressBars,
+    pbar_index: Optional[int],
+    controller: ConcurrencyController,
+    partial: Optional[PartialDownload] = None,
+) -> None:
+    written = 0
+    attempt = 0
+    while written < length:
+        start = offset + written
+        end = offset + length - 1
+
+        try:
+            with request_slot(controller):
+                req_start = time.monotonic()
+
+                res = http_session.get(
+                    job.signed_url,
+                    headers={"Range": f"bytes={start}-{end}"},
+                    stream=True,
                 )
-                end = time.monotonic()
+                with closing(res):
+                    if res.status_code != 206:
+                        raise RuntimeError(
+                            f"failed to download bytes {start}-{end} of"
+                            f" {job.dest.name}: {res.status_code}"
+                        )
 
-    total_time = end - start
+                    n = 0
+                    for chunk in write_range(
+                        res, fd, start, length - written, progress_bars, pbar_index
+                    ):
+                        n += chunk
+                        written += chunk
 
-    return DownloadResult(num_files, total_bytes, total_time)
+                controller.record(
+                    n, time.monotonic() - req_start, throttled=was_throttled(res)
+                )
+        except (RequestException, OSError):
+            # connection dropped mid-body - requests only retries the request
+            # itself, so continue after the last byte that was written
+            if attempt >= max_range_retries:
+                raise
 
+            attempt += 1
+            time.sleep(min(2**attempt, 60))
+            continue
 
-# dest will always be a path which includes the copied file as its leaf
-# e.g. download_file("a/b.txt", Path("c/d.txt")) will copy the content of 'b.txt' into 'd.txt'
-def download_file(job: DownloadJob, progress_bars: ProgressBars) -> int:
-    # todo(ayush): benchmark parallelized downloads using the range header
-    with open(job.dest, "wb") as f:
-        res = http_session.get(job.signed_url, stream=True)
-        if res.status_code != 200:
+        if n == 0:
             raise RuntimeError(
-                f"failed to download {job.dest.name}: {res.status_code}:"
-                f" {res.json()['error']}"
+                f"failed to download bytes {start}-{end} of {job.dest.name}: empty"
+                " response"
             )
 
-        total_bytes = res.headers.get("Content-Length")
-        assert total_bytes is not None, "Must have a content-length header"
-
-        with get_free_index(progress_bars) as pbar_index:
-            progress_bars.set(
-                index=pbar_index, total=int(total_bytes), desc=job.dest.name
+    if partial is not None:
+        partial.record(offset, length)
+
+
+def download_ranges(
+    job: DownloadJob,
+    fd: int,
+    ranges: List[Tuple[int, int]],
+    progress_bars: ProgressBars,
+    pbar_index: Optional[int],
+    controller: ConcurrencyController,
+    partial: Optional[PartialDownload] = None,
+) -> None:
+    """Download `ranges` of `job` concurrently.
+
+    Every request holds one of `controller`'s slots, so the ranges of all files
+    sharing the controller are bounded by a single limit.
+    """
+    num_workers = min(len(ranges), controller.get_maximum())
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futs = [
+            executor.submit(
+                download_range,
+                job,
+                fd,
+                offset,
+                length,
+                progress_bars,
+                pbar_index,
+                controller,
+                partial,
             )
+            for offset, length in ranges
+        ]
 
-            start = time.monotonic()
-            try:
-                for data in res.iter_content(
-                    chunk_size=5 * Units.MiB
-                ):  # todo(ayush): figure out why chunk_size = None breaks in pods
-                    f.write(data)
-                    progress_bars.update(pbar_index, len(data))
-            finally:
-                end = time.monotonic()
-                progress_bars.update_total_progress(1)
-                progress_bars.write(
-                    f"Downloaded {job.dest.name} ({with_si_suffix(int(total_bytes))})"
-                    f" in {human_readable_time(end - start)}"
-                )
+        done, not_done = wait(futs, return_when=FIRST_EXCEPTION)
+        for fut in not_done:
+            fut.cancel()
 
-        return int(total_bytes)
+        for fut in done:
+            fut.result()
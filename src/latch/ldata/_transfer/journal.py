@@ -0,0 +1,220 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from latch_sdk_config.user import user_config
+
+
+# workers receive a fresh (unpickled) journal with every task, so connections
+# are kept per thread of each process instead of per instance
+_connections: Dict[Tuple[str, int, int], sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    upload_id: str
+    urls: List[str]
+    part_count: int
+    part_size: int
+    completed: bool
+    # (part_number, etag)
+    parts: List[Tuple[int, str]]
+
+
+class UploadJournal:
+    """On-disk record of the multipart uploads belonging to a single transfer.
+
+    Stores the upload ID, part URLs and completed part ETags of every file so
+    that an interrupted upload can be resumed without re-sending finished
+    parts. Entries are keyed by destination path and are only reused if the
+    source file's size and mtime are unchanged.
+
+    Instances can be shared with worker processes and threads - each thread of
+    each process opens its own connection to the journal.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def for_transfer(cls, src: Path, dest: str) -> "UploadJournal":
+        key = hashlib.sha256(f"{src.resolve()}\0{dest}".encode()).hexdigest()
+        return cls(user_config.root / "transfers" / f"{key}.sqlite")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        key = (str(self.path), os.getpid(), threading.get_ident())
+
+        res = _connections.get(key)
+        if res is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            # only used by the thread that opened it, but `remove` may close it
+            # from another thread
+            res = sqlite3.connect(
+                self.path, timeout=60, isolation_level=None, check_same_thread=False
+            )
+            res.execute("pragma journal_mode = wal")
+            res.execute("pragma synchronous = normal")
+            res.execute("""
+                create table if not exists uploads (
+                    dest text primary key,
+                    src text not null,
+                    size integer not null,
+                    mtime_ns integer not null,
+                    upload_id text not null,
+                    urls text not null,
+                    part_count integer not null,
+                    part_size integer not null,
+                    completed integer not null default 0
+                )
+            """)
+            res.execute("""
+                create table if not exists parts (
+                    dest text not null,
+                    part_number integer not null,
+                    etag text not null,
+                    primary key (dest, part_number)
+                )
+            """)
+
+            with _connections_lock:
+                _connections[key] = res
+
+        return res
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.conn
+        conn.execute("begin immediate")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        conn.execute("commit")
+
+    def get(self, src: Path, dest: str) -> Optional[JournalEntry]:
+        """Return the journaled upload for `dest`, if `src` has not changed since."""
+        row = self.conn.execute(
+            """
+            select size, mtime_ns, upload_id, urls, part_count, part_size, completed
+            from uploads
+            where dest = ?
+            """,
+            (dest,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        size, mtime_ns, upload_id, urls, part_count, part_size, completed = row
+
+        try:
+            st = src.stat()
+        except FileNotFoundError:
+            return None
+
+        if st.st_size != size or st.st_mtime_ns != mtime_ns:
+            self.forget(dest)
+            return None
+
+        parts = self.conn.execute(
+            "select part_number, etag from parts where dest = ?", (dest,)
+        ).fetchall()
+
+        return JournalEntry(
+            upload_id=upload_id,
+            urls=orjson.loads(urls),
+            part_count=part_count,
+            part_size=part_size,
+            completed=bool(completed),
+            parts=parts,
+        )
+
+    def is_finished(self, dest: str) -> bool:
+        row = self.conn.execute(
+            "select completed from uploads where dest = ?", (dest,)
+        ).fetchone()
+        return row is not None and bool(row[0])
+
+    def start(
+        self,
+        src: Path,
+        dest: str,
+        *,
+        upload_id: str,
+        urls: List[str],
+        part_count: int,
+        part_size: int,
+    ) -> None:
+        st = src.stat()
+        with self.transaction() as conn:
+            conn.execute("delete from parts where dest = ?", (dest,))
+            conn.execute(
+                """
+                insert or replace into uploads
+                    (dest, src, size, mtime_ns, upload_id, urls, part_count, part_size)
+                values (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    dest,
+                    str(src),
+                    st.st_size,
+                    st.st_mtime_ns,
+                    upload_id,
+                    orjson.dumps(urls).decode(),
+                    part_count,
+                    part_size,
+                ),
+            )
+
+    def record_part(self, dest: str, part_number: int, etag: str) -> None:
+        self.conn.execute(
+            "insert or replace into parts (dest, part_number, etag) values (?, ?, ?)",
+            (dest, part_number, etag),
+        )
+
+    def finish(self, dest: str) -> None:
+        self.conn.execute("update uploads set completed = 1 where dest = ?", (dest,))
+
+    def finish_empty(self, src: Path, dest: str) -> None:
+        """Record that `dest` is complete without an upload ID.
+
+        Empty files are created by `start_upload` directly.
+        """
+        st = src.stat()
+        self.conn.execute(
+            """
+            insert or replace into uploads
+                (dest, src, size, mtime_ns, upload_id, urls, part_count, part_size, completed)
+            values (?, ?, ?, ?, '', '[]', 0, 0, 1)
+            """,
+            (dest, str(src), st.st_size, st.st_mtime_ns),
+        )
+
+    def forget(self, dest: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("delete from parts where dest = ?", (dest,))
+            conn.execute("delete from uploads where dest = ?", (dest,))
+
+    def remove(self) -> None:
+        """Delete the journal once the transfer has finished."""
+        prefix = (str(self.path), os.getpid())
+        with _connections_lock:
+            conns = [
+                _connections.pop(key) for key in list(_connections) if key[:2] == prefix
+            ]
+
+        for conn in conns:
+            conn.close()
+
+        for suffix in ["", "-wal", "-shm"]:
+            Path(f"{self.path}{suffix}").unlink(missing_ok=True)
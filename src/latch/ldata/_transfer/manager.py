@@ -1,6 +1,7 @@
 from multiprocessing.managers import SyncManager
 from typing import Type
 
+from .concurrency import ConcurrencyController
 from .progress import ProgressBars
 from .throttle import Throttle
 
@@ -8,7 +9,9 @@ from .throttle import Throttle
 class TransferStateManager(SyncManager):
     ProgressBars: Type[ProgressBars]
     Throttle: Type[Throttle]
+    ConcurrencyController: Type[ConcurrencyController]
 
 
 TransferStateManager.register("ProgressBars", ProgressBars)
 TransferStateManager.register("Throttle", Throttle)
+TransferStateManager.register("ConcurrencyController", ConcurrencyController)
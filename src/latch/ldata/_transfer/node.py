@@ -1,8 +1,12 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Dict, List, TypedDict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict
 
+import dateutil.parser as dp
 import graphql.language as l
-from latch_sdk_gql.utils import _name_node, _parse_selection
+from latch_sdk_gql.execute import close_async_session, execute, execute_async
+from latch_sdk_gql.utils import _json_value, _name_node, _parse_selection
 from typing_extensions import TypeAlias
 
 from latch.ldata.type import LatchPathError, LDataNodeType
@@ -12,10 +16,21 @@ from .utils import query_with_retry
 
 AccId: TypeAlias = int
 
+# number of paths resolved by a single aliased query
+node_data_batch_size = 500
+# number of those queries in flight at once
+node_data_max_concurrent_batches = 8
+
+descendants_page_size = 1000
+
+# number of nodes removed by a single aliased mutation
+remove_batch_size = 100
+
 
 class LDataObjectMeta(TypedDict):
-    contentSize: str
-    contentType: str
+    contentSize: Optional[str]
+    modifyTime: Optional[str]
+    versionId: Optional[str]
 
 
 class FinalLinkTargetPayload(TypedDict):
@@ -23,7 +38,7 @@ class FinalLinkTargetPayload(TypedDict):
     type: str
     name: str
     removed: bool
-    ldataObjectMeta: LDataObjectMeta
+    ldataObjectMeta: Optional[LDataObjectMeta]
 
 
 class LdataNodePayload(TypedDict):
@@ -45,6 +60,9 @@ class NodeData:
     name: str
     type: LDataNodeType
     remaining: str
+    size: Optional[int] = None
+    modify_time: Optional[datetime] = None
+    version_id: Optional[str] = None
 
     def is_direct_parent(self) -> bool:
         return self.remaining is not None and "/" not in self.remaining
@@ -59,11 +77,7 @@ class GetNodeDataResult:
     data: Dict[str, NodeData]
 
 
-def get_node_data(
-    *remote_paths: str, allow_resolve_to_parent: bool = False
-) -> GetNodeDataResult:
-    normalized: Dict[str, str] = {}
-
+def _node_data_document(remote_paths: Tuple[str, ...]) -> l.DocumentNode:
     acc_sel = _parse_selection("""
         accountInfoCurrent {
             id
@@ -74,8 +88,6 @@ def get_node_data(
     sels: List[l.FieldNode] = [acc_sel]
 
     for i, remote_path in enumerate(remote_paths):
-        normalized[remote_path] = normalize_path(remote_path)
-
         sel = _parse_selection("""
             ldataResolvePathToNode(path: {}) {
                 path
@@ -84,6 +96,11 @@ def get_node_data(
                         id
                         name
                         type
+                        ldataObjectMeta {
+                            contentSize
+                            modifyTime
+                            versionId
+                        }
                     }
                 }
             }
@@ -91,7 +108,7 @@ def get_node_data(
         assert isinstance(sel, l.FieldNode)
 
         val = l.StringValueNode()
-        val.value = normalized[remote_path]
+        val.value = normalize_path(remote_path)
 
         args = l.ArgumentNode()
         args.name = _name_node("path")
@@ -117,8 +134,15 @@ def get_node_data(
     assert isinstance(query, l.OperationDefinitionNode)
     query.selection_set = sel_set
 
-    res = query_with_retry(doc)
+    return doc
 
+
+def _parse_node_data(
+    res: Dict[str, Any],
+    remote_paths: Tuple[str, ...],
+    *,
+    allow_resolve_to_parent: bool,
+) -> GetNodeDataResult:
     acc_info: AccountInfoCurrentPayload = res["accountInfoCurrent"]
     acc_id = acc_info["id"]
 
@@ -136,11 +160,23 @@ def get_node_data(
                 )
 
             final_link_target = node["ldataNode"]["finalLinkTarget"]
+            meta = final_link_target["ldataObjectMeta"]
             ret[remote_path] = NodeData(
                 id=final_link_target["id"],
                 name=final_link_target["name"],
                 type=LDataNodeType(final_link_target["type"].lower()),
                 remaining=remaining,
+                size=(
+                    None
+                    if meta is None or meta["contentSize"] is None
+                    else int(meta["contentSize"])
+                ),
+                modify_time=(
+                    None
+                    if meta is None or meta["modifyTime"] is None
+                    else dp.isoparse(meta["modifyTime"])
+                ),
+                version_id=None if meta is None else meta["versionId"],
             )
         except (TypeError, ValueError):
             raise LatchPathError(
@@ -148,3 +184,222 @@ def get_node_data(
             )
 
     return GetNodeDataResult(acc_id, ret)
+
+
+def get_node_data(
+    *remote_paths: str, allow_resolve_to_parent: bool = False
+) -> GetNodeDataResult:
+    res = query_with_retry(_node_data_document(remote_paths))
+    return _parse_node_data(
+        res, remote_paths, allow_resolve_to_parent=allow_resolve_to_parent
+    )
+
+
+async def get_node_data_async(
+    *remote_paths: str, allow_resolve_to_parent: bool = False
+) -> GetNodeDataResult:
+    """Like `get_node_data`, but without blocking the event loop."""
+    res = await execute_async(_node_data_document(remote_paths))
+    return _parse_node_data(
+        res, remote_paths, allow_resolve_to_parent=allow_resolve_to_parent
+    )
+
+
+def get_node_data_batched(
+    remote_paths: List[str], *, allow_resolve_to_parent: bool = False
+) -> GetNodeDataResult:
+    """`get_node_data` for an arbitrary number of paths.
+
+    Paths are resolved `node_data_batch_size` at a time, with one aliased query
+    per batch. Up to `node_data_max_concurrent_batches` batches are in flight at
+    once, unless this is called from a running event loop.
+    """
+    if len(remote_paths) == 0:
+        return get_node_data()
+
+    batches = [
+        remote_paths[i : i + node_data_batch_size]
+        for i in range(0, len(remote_paths), node_data_batch_size)
+    ]
+
+    try:
+        asyncio.get_running_loop()
+        in_event_loop = True
+    except RuntimeError:
+        in_event_loop = False
+
+    if len(batches) == 1 or in_event_loop:
+        results = [
+            get_node_data(*batch, allow_resolve_to_parent=allow_resolve_to_parent)
+            for batch in batches
+        ]
+    else:
+        results = asyncio.run(
+            _get_node_data_batches(
+                batches, allow_resolve_to_parent=allow_resolve_to_parent
+            )
+        )
+
+    ret: Dict[str, NodeData] = {}
+    for res in results:
+        ret.update(res.data)
+
+    return GetNodeDataResult(results[-1].acc_id, ret)
+
+
+async def _get_node_data_batches(
+    batches: List[List[str]], *, allow_resolve_to_parent: bool
+) -> List[GetNodeDataResult]:
+    sema = asyncio.Semaphore(node_data_max_concurrent_batches)
+
+    async def run(batch: List[str]) -> GetNodeDataResult:
+        async with sema:
+            return await get_node_data_async(
+                *batch, allow_resolve_to_parent=allow_resolve_to_parent
+            )
+
+    try:
+        return await asyncio.gather(*(run(batch) for batch in batches))
+    finally:
+        await close_async_session()
+
+
+def iter_descendant_paths(
+    remote_path: str, *, page_size: int = descendants_page_size
+) -> Iterator[str]:
+    """Paths of the objects below `remote_path`, relative to it.
+
+    Fetched `page_size` at a time.
+    """
+    offset = 0
+    while True:
+        res = query_with_retry(
+            """
+                query LatchCLIDescendants($path: String!, $first: Int!, $offset: Int!) {
+                    ldataResolvePathData(argPath: $path) {
+                        finalLinkTarget {
+                            descendants(first: $first, offset: $offset) {
+                                nodes {
+                                    relPath
+                                }
+                            }
+                        }
+                    }
+                }
+            """,
+            {
+                "path": normalize_path(remote_path),
+                "first": page_size,
+                "offset": offset,
+            },
+        )["ldataResolvePathData"]
+        if res is None:
+            return
+
+        nodes = res["finalLinkTarget"]["descendants"]["nodes"]
+        for node in nodes:
+            yield node["relPath"]
+
+        if len(nodes) < page_size:
+            return
+
+        offset += len(nodes)
+
+
+def _remove_nodes_document(node_ids: List[str]) -> l.DocumentNode:
+    sels: List[l.FieldNode] = []
+    for i, node_id in enumerate(node_ids):
+        sel = _parse_selection("""
+            ldataRmr(input: {}) {
+                clientMutationId
+            }
+        """)
+        assert isinstance(sel, l.FieldNode)
+
+        input_field = l.ObjectFieldNode()
+        input_field.name = _name_node("argNodeId")
+        input_field.value = _json_value(node_id)
+
+        input_value = l.ObjectValueNode()
+        input_value.fields = (input_field,)
+
+        args = l.ArgumentNode()
+        args.name = _name_node("input")
+        args.value = input_value
+
+        sel.alias = _name_node(f"q{i}")
+        sel.arguments = (args,)
+
+        sels.append(sel)
+
+    sel_set = l.SelectionSetNode()
+    sel_set.selections = tuple(sels)
+
+    doc = l.parse("""
+        mutation LatchCLIRemoveNodes {
+            placeholder
+        }
+    """)
+
+    assert len(doc.definitions) == 1
+    mutation = doc.definitions[0]
+
+    assert isinstance(mutation, l.OperationDefinitionNode)
+    mutation.selection_set = sel_set
+
+    return doc
+
+
+def remove_nodes_batch(node_ids: List[str]) -> None:
+    """Recursively remove every node in `node_ids` with one aliased mutation.
+
+    Not retried: if a failed attempt removed some of the nodes, a retry would
+    fail on those.
+    """
+    execute(_remove_nodes_document(node_ids), max_retries=0)
+
+
+async def remove_nodes_batch_async(node_ids: List[str]) -> None:
+    """Like `remove_nodes_batch`, but without blocking the event loop."""
+    await execute_async(_remove_nodes_document(node_ids), max_retries=0)
+
+
+def remove_nodes(node_ids: List[str], *, max_concurrent_batches: int = 1) -> None:
+    """Recursively remove every node in `node_ids`.
+
+    Nodes are removed `remove_batch_size` at a time, with one aliased mutation
+    per batch. Up to `max_concurrent_batches` batches are sent at once, unless
+    this is called from a running event loop.
+    """
+    batches = [
+        node_ids[i : i + remove_batch_size]
+        for i in range(0, len(node_ids), remove_batch_size)
+    ]
+
+    try:
+        asyncio.get_running_loop()
+        in_event_loop = True
+    except RuntimeError:
+        in_event_loop = False
+
+    if max_concurrent_batches <= 1 or len(batches) <= 1 or in_event_loop:
+        for batch in batches:
+            remove_nodes_batch(batch)
+        return
+
+    asyncio.run(_remove_node_batches(batches, max_concurrent_batches))
+
+
+async def _remove_node_batches(
+    batches: List[List[str]], max_concurrent_batches: int
+) -> None:
+    sema = asyncio.Semaphore(max_concurrent_batches)
+
+    async def run(batch: List[str]) -> None:
+        async with sema:
+            await remove_nodes_batch_async(batch)
+
+    try:
+        await asyncio.gather(*(run(batch) for batch in batches))
+    finally:
+        await close_async_session()
@@ -0,0 +1,98 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+import orjson
+
+
+def partial_path(dest: Path) -> Path:
+    return dest.with_name(f"{dest.name}.partial")
+
+
+def sidecar_path(dest: Path) -> Path:
+    return dest.with_name(f"{dest.name}.partial.json")
+
+
+class PartialDownload:
+    """A download in progress, written to `<dest>.partial`.
+
+    For ranged downloads, the ranges already written are recorded in a sidecar
+    (`<dest>.partial.json`) along with the remote object's version and size, so
+    that an interrupted download can continue where it left off. The sidecar
+    is only trusted if the remote object still has the same version and size -
+    otherwise the partial file is discarded.
+
+    The sidecar is rewritten atomically after every range, which protects
+    against the process being interrupted but not against the OS crashing
+    before the range's data reaches the disk.
+
+    Once the download is complete, the partial file is renamed to `dest`.
+    """
+
+    def __init__(self, dest: Path):
+        self.dest = dest
+        self.path = partial_path(dest)
+        self.sidecar = sidecar_path(dest)
+
+        self.version_id: Optional[str] = None
+        self.size = 0
+        # (offset, length)
+        self.ranges: Set[Tuple[int, int]] = set()
+
+        self.lock = threading.Lock()
+
+    def resume(self, version_id: Optional[str], size: int) -> bool:
+        """Load the ranges written by a previous attempt.
+
+        Returns `False` (and forgets the previous attempt) if there was none or if
+        the remote object has changed since.
+        """
+        self.version_id = version_id
+        self.size = size
+        self.ranges = set()
+
+        if version_id is None:
+            return False
+
+        try:
+            data = orjson.loads(self.sidecar.read_bytes())
+            resumable = (
+                data["version_id"] == version_id
+                and data["size"] == size
+                and self.path.stat().st_size == size
+            )
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+            resumable = False
+
+        if not resumable:
+            self.sidecar.unlink(missing_ok=True)
+            return False
+
+        self.ranges = {(offset, length) for offset, length in data["ranges"]}
+        return True
+
+    def is_done(self, offset: int, length: int) -> bool:
+        return (offset, length) in self.ranges
+
+    def completed_bytes(self) -> int:
+        return sum(length for _, length in self.ranges)
+
+    def record(self, offset: int, length: int) -> None:
+        with self.lock:
+            self.ranges.add((offset, length))
+
+            ranges: List[Tuple[int, int]] = sorted(self.ranges)
+            tmp = self.sidecar.with_name(f"{self.sidecar.name}.tmp")
+            tmp.write_bytes(
+                orjson.dumps({
+                    "version_id": self.version_id,
+                    "size": self.size,
+                    "ranges": ranges,
+                })
+            )
+            os.replace(tmp, self.sidecar)
+
+    def finish(self) -> None:
+        os.replace(self.path, self.dest)
+        self.sidecar.unlink(missing_ok=True)
@@ -67,6 +67,14 @@ class ProgressBars:
         self.task_bar_sema.acquire(block=True)
         return self.free_indices.pop()
 
+    def try_get_free_task_bar_index(self) -> Optional[int]:
+        if len(self.task_bars) == 0:
+            return None
+
+        if not self.task_bar_sema.acquire(block=False):
+            return None
+        return self.free_indices.pop()
+
     def return_task_bar(self, index: Optional[int]):
         if index is None:
             return
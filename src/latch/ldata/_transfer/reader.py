@@ -0,0 +1,232 @@
+import io
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Optional
+
+from requests.exceptions import RequestException
+
+from latch_cli.constants import Units
+from latch_cli.utils.path import normalize_path
+
+from .download import get_object_size, get_signed_urls, max_range_retries
+from .utils import http_session
+
+default_block_size = 8 * Units.MiB
+default_cache_blocks = 16
+default_readahead_blocks = 2
+
+
+class RangeReader(io.RawIOBase):
+    """Read-only, seekable file over a Latch Data object.
+
+    Data is fetched with presigned Range GETs in blocks of `block_size` bytes,
+    of which the `cache_blocks` most recently used are kept in memory. When
+    reads are sequential, the following `readahead_blocks` blocks are fetched
+    with the same request, so streaming through a file needs few round trips
+    while random access only transfers the blocks it touches.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        block_size: int = default_block_size,
+        cache_blocks: int = default_cache_blocks,
+        readahead_blocks: int = default_readahead_blocks,
+    ):
+        super().__init__()
+
+        if block_size <= 0:
+            raise ValueError(f"block size must be positive: {block_size}")
+
+        self.path = path
+        self.normalized = normalize_path(path)
+
+        self.block_size = block_size
+        self.cache_blocks = max(1, cache_blocks, readahead_blocks + 1)
+        self.readahead_blocks = max(0, readahead_blocks)
+
+        self.blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self.last_block: Optional[int] = None
+        self.pos = 0
+
+        self.url = self._sign()
+        self.size = self._get_size()
+
+    def _sign(self) -> str:
+        return get_signed_urls(self.path, self.normalized, recursive=False)["data"][
+            "url"
+        ]
+
+    def _get_size(self) -> int:
+        res = self._get("bytes=0-0")
+        with closing(res):
+            if res.status_code == 416:
+                # empty object
+                return 0
+
+            return get_object_size(res)
+
+    def _get(self, range_header: str):
+        res = http_session.get(
+            self.url, headers={"Range": range_header}, stream=True
+        )
+        if res.status_code == 403:
+            # presigned urls expire, so long-lived readers need to re-sign
+            res.close()
+            self.url = self._sign()
+            res = http_session.get(
+                self.url, headers={"Range": range_header}, stream=True
+            )
+
+        if res.status_code not in {200, 206, 416}:
+            res.close()
+            raise RuntimeError(
+                f"failed to read {range_header} of {self.path}: {res.status_code}"
+            )
+
+        return res
+
+    def _fetch(self, first: int, count: int) -> None:
+        """Fetch `count` blocks starting at block `first` into the cache."""
+        start = first * self.block_size
+        end = min(self.size, (first + count) * self.block_size) - 1
+
+        buf = bytearray()
+        attempt = 0
+        while start + len(buf) <= end:
+            cur = start + len(buf)
+            try:
+                res = self._get(f"bytes={cur}-{end}")
+                with closing(res):
+                    # a server which ignores Range responds with 200 and the
+                    # entire object, which is only usable from its start
+                    if res.status_code == 416 or (res.status_code != 206 and cur != 0):
+                        raise RuntimeError(
+                            f"failed to read bytes {cur}-{end} of {self.path}:"
+                            f" {res.status_code}"
+                        )
+
+                    for chunk in res.iter_content(Units.MiB):
+                        buf.extend(chunk)
+                        # stop reading a 200 body once the range is complete
+                        # instead of buffering the rest of the object
+                        if start + len(buf) > end:
+                            break
+            except (RequestException, OSError):
+                # connection dropped mid-body - continue from where the body was
+                # cut off
+                if attempt >= max_range_retries:
+                    raise
+
+            if start + len(buf) > end:
+                break
+
+            if attempt >= max_range_retries:
+                raise RuntimeError(
+                    f"failed to read bytes {cur}-{end} of {self.path}: response too"
+                    " short"
+                )
+
+            attempt += 1
+            time.sleep(min(2**attempt, 60))
+
+        # the last chunk of a 200 response can extend past the range
+        del buf[end - start + 1 :]
+
+        data = bytes(buf)
+        for i in range(count):
+            block = data[i * self.block_size : (i + 1) * self.block_size]
+            if len(block) == 0:
+                break
+
+            self.blocks[first + i] = block
+            self.blocks.move_to_end(first + i)
+
+        while len(self.blocks) > self.cache_blocks:
+            self.blocks.popitem(last=False)
+
+    def _get_block(self, idx: int) -> bytes:
+        block = self.blocks.get(idx)
+        if block is not None:
+            self.blocks.move_to_end(idx)
+        else:
+            count = 1
+            if self.last_block is not None and idx == self.last_block + 1:
+                count += self.readahead_blocks
+
+            num_blocks = (self.size + self.block_size - 1) // self.block_size
+            count = min(count, num_blocks - idx)
+            # don't refetch blocks which were already read ahead
+            while count > 1 and (idx + count - 1) in self.blocks:
+                count -= 1
+
+            self._fetch(idx, count)
+            block = self.blocks[idx]
+
+        self.last_block = idx
+        return block
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+
+        if pos < 0:
+            raise ValueError(f"negative seek position: {pos}")
+
+        self.pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        view = memoryview(b).cast("B")
+
+        n = 0
+        while n < len(view) and self.pos < self.size:
+            idx, offset = divmod(self.pos, self.block_size)
+            block = self._get_block(idx)
+
+            chunk = block[offset : offset + len(view) - n]
+            if len(chunk) == 0:
+                # the object is shorter than when it was opened
+                raise RuntimeError(
+                    f"unexpected end of {self.path} at byte {self.pos} of"
+                    f" {self.size}: the object may have been modified"
+                )
+
+            view[n : n + len(chunk)] = chunk
+
+            n += len(chunk)
+            self.pos += len(chunk)
+
+        return n
+
+    def readall(self) -> bytes:
+        res = bytearray()
+        while True:
+            data = self.read(self.block_size)
+            if not data:
+                return bytes(res)
+            res.extend(data)
+
+    def close(self) -> None:
+        self.blocks.clear()
+        super().close()
@@ -1,6 +1,5 @@
 from textwrap import dedent
 
-import gql
 from gql.transport.exceptions import TransportQueryError
 
 from latch.ldata.type import LatchPathError, LDataNodeType
@@ -33,7 +32,7 @@ def remote_copy(src: str, dst: str, create_parents: bool = False) -> None:
 
     try:
         query_with_retry(
-            gql.gql("""
+            """
             mutation Copy(
                 $argSrcNode: BigInt!
                 $argDstParent: BigInt!
@@ -48,7 +47,7 @@ def remote_copy(src: str, dst: str, create_parents: bool = False) -> None:
                 ) {
                     clientMutationId
                 }
-            }"""),
+            }""",
             {
                 "argSrcNode": src_data.id,
                 "argDstParent": dst_data.id,
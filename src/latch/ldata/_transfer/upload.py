@@ -4,14 +4,35 @@ import mimetypes
 import os
 import random
 import time
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed, wait
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from contextlib import closing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import chain, islice
 from http.client import HTTPException
 from multiprocessing.managers import DictProxy, ListProxy
 from pathlib import Path
 from queue import Queue
-from typing import TYPE_CHECKING, List, Optional, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
 from typing_extensions import TypeAlias
 
@@ -22,17 +43,26 @@ from latch_cli.utils.path import normalize_path
 from latch_sdk_config.latch import config as latch_config
 from latch_sdk_config.user import user_config
 
+from .concurrency import ConcurrencyController, controller_args
+from .journal import UploadJournal
 from .manager import TransferStateManager
 from .node import get_node_data
 from .progress import Progress, ProgressBars
 from .throttle import Throttle
-from .utils import get_max_workers, http_session
+from .utils import (
+    FileSlice,
+    get_initial_in_flight_requests,
+    get_max_in_flight_requests,
+    http_session,
+    process_pool_min_files,
+    use_process_pool,
+    was_throttled,
+)
 
 if TYPE_CHECKING:
     PathQueueType: TypeAlias = "Queue[Optional[Path]]"
     LatencyQueueType: TypeAlias = "Queue[Optional[float]]"
     PartsBySrcType: TypeAlias = DictProxy[Path, ListProxy["CompletedPart"]]
-    UploadInfoBySrcType: TypeAlias = DictProxy[Path, "StartUploadReturnType"]
 
 
 class StartUploadData(TypedDict):
@@ -53,6 +83,11 @@ class UploadResult:
     total_time: float
 
 
+class UploadEngine(Enum):
+    process = "process"
+    aio = "async"
+
+
 def upload(
     src: str,  # pathlib.Path strips trailing slashes but we want to keep them here as they determine cp behavior
     dest: str,
@@ -61,6 +96,8 @@ def upload(
     create_parents: bool = False,
     cores: Optional[int] = None,
     chunk_size_mib: Optional[int] = None,
+    engine: UploadEngine = UploadEngine.process,
+    resume: bool = False,
 ) -> UploadResult:
     src_path = Path(src)
     if not src_path.exists():
@@ -95,8 +132,13 @@ def upload(
             raise ValueError(f"no such file or directory: {dest}")
         normalized = urljoins(normalized, src_path.name)
 
-    if cores is None:
-        cores = get_max_workers()
+    if src_path.is_dir():
+        if dest_data.exists() and not src.endswith("/"):
+            normalized = urljoins(normalized, src_path.name)
+    elif dest_data.exists() and dest_is_dir:
+        normalized = urljoins(normalized, src_path.name)
+
+    concurrency_args = controller_args(cores)
 
     if progress == Progress.none:
         num_bars = 0
@@ -105,197 +147,351 @@ def upload(
         num_bars = 1
         show_total_progress = False
     else:
-        num_bars = cores
+        num_bars = concurrency_args["initial"]
         show_total_progress = True
 
-    ingress_source: Optional[dict[str, str]] = None
+    ingress_source = get_ingress_source()
+
+    journal = UploadJournal.for_transfer(src_path, normalized)
+    if not resume:
+        journal.remove()
+
+    if engine == UploadEngine.aio:
+        from .upload_async import upload as _upload_async
+
+        return _upload_async(
+            src_path,
+            normalized,
+            num_bars=num_bars,
+            show_total_progress=show_total_progress,
+            verbose=verbose,
+            concurrency_args=controller_args(
+                cores,
+                initial=get_initial_in_flight_requests(),
+                maximum=get_max_in_flight_requests(),
+            ),
+            chunk_size_mib=chunk_size_mib,
+            ingress_source=ingress_source,
+            journal=journal,
+        )
 
+    walk_stats = WalkStats()
+    if src_path.is_dir():
+        jobs = walk_jobs(src_path, normalized, walk_stats)
+    else:
+        jobs = iter([UploadJob(src_path, normalized)])
+        walk_stats.num_files = 1
+        walk_stats.total_bytes = src_path.stat().st_size
+
+    res = upload_jobs(
+        jobs,
+        walk_stats,
+        num_bars=num_bars,
+        show_total_progress=show_total_progress,
+        verbose=verbose,
+        concurrency_args=concurrency_args,
+        chunk_size_mib=chunk_size_mib,
+        ingress_source=ingress_source,
+        journal=journal,
+    )
+
+    if progress != Progress.none and src_path.is_dir():
+        print("\x1b[0GFinalizing uploads...")
+
+    journal.remove()
+
+    return res
+
+
+def get_ingress_source() -> Optional[dict[str, str]]:
     try:
         pod_id = Path("/root/.latch/id").read_text("utf-8")
-        ingress_source = {"pod_id": pod_id}
+        return {"pod_id": pod_id}
     except OSError:
-        pass
-
-    with ProcessPoolExecutor(max_workers=cores) as exec:
-        with TransferStateManager() as man:
-            parts_by_src: "PartsBySrcType" = man.dict()
-            upload_info_by_src: "UploadInfoBySrcType" = man.dict()
-
-            if src_path.is_dir():
-                if dest_data.exists() and not src.endswith("/"):
-                    normalized = urljoins(normalized, src_path.name)
-
-                jobs: List[UploadJob] = []
-                total_bytes = 0
-
-                throttle: Throttle = man.Throttle()
-                latency_q: "LatencyQueueType" = man.Queue()
-                throttle_listener = exec.submit(throttler, throttle, latency_q)
-
-                for dir_path, _, file_names in os.walk(src_path, followlinks=True):
-                    for file_name in file_names:
-                        rel_path = Path(dir_path) / file_name
-
-                        try:
-                            total_bytes += rel_path.stat().st_size
-                        except FileNotFoundError:
-                            print(f"WARNING: file {rel_path} not found, skipping...")
-                            continue
-
-                        parts_by_src[rel_path] = man.list()
-                        jobs.append(
-                            UploadJob(
-                                rel_path,
-                                urljoins(
-                                    normalized, str(rel_path.relative_to(src_path))
-                                ),
-                            )
-                        )
+        return None
+
+
+class UploadPool:
+    """Workers and shared state used by `upload_jobs`.
+
+    With `processes`, parts are uploaded from worker processes which share state
+    through a `TransferStateManager`, otherwise from threads in the calling
+    process. Starting the processes is expensive, so callers which upload many
+    small batches (e.g. `latch sync --watch`) create one pool and pass it to
+    every `upload_jobs` call. The concurrency limit and throttle are then also
+    carried over from one batch to the next.
+    """
+
+    def __init__(self, concurrency_args: Dict[str, Any], *, processes: bool = True):
+        self.concurrency_args = concurrency_args
+        self.processes = processes
+
+    def __enter__(self) -> "UploadPool":
+        # one extra worker runs the throttler
+        max_workers = self.concurrency_args["maximum"] + 1
+
+        self.man: Optional[TransferStateManager] = None
+        if self.processes:
+            self.exec: Executor = ProcessPoolExecutor(max_workers=max_workers)
+            self.man = TransferStateManager()
+            self.man.start()
+
+            self.throttle: Throttle = self.man.Throttle()
+            self.latency_q: "LatencyQueueType" = self.man.Queue()
+            self.controller: ConcurrencyController = self.man.ConcurrencyController(
+                **self.concurrency_args
+            )
+        else:
+            self.exec = ThreadPoolExecutor(max_workers=max_workers)
 
-                num_files = len(jobs)
-
-                url_generation_bar: ProgressBars
-                with closing(
-                    man.ProgressBars(0, show_total_progress=(progress != Progress.none))
-                ) as url_generation_bar:
-                    url_generation_bar.set_total(num_files, "Generating URLs")
-
-                    start_upload_futs: List[
-                        Future[Optional[StartUploadReturnType]]
-                    ] = []
-
-                    start = time.monotonic()
-                    for job in jobs:
-                        start_upload_futs.append(
-                            exec.submit(
-                                start_upload,
-                                job.src,
-                                job.dest,
-                                url_generation_bar,
-                                throttle,
-                                latency_q,
-                                chunk_size_mib,
-                                ingress_source,
-                            )
-                        )
+            self.throttle = Throttle()
+            self.latency_q = Queue()
+            self.controller = ConcurrencyController(**self.concurrency_args)
 
-                    for fut in as_completed(start_upload_futs):
-                        res = fut.result()
-                        if res is not None:
-                            upload_info_by_src[res.src] = res
+        self.throttle_listener = self.exec.submit(
+            throttler, self.throttle, self.latency_q
+        )
 
-                    latency_q.put(None)
-                    wait([throttle_listener])
+        return self
 
-                chunk_upload_bars: ProgressBars
-                with closing(
-                    man.ProgressBars(
-                        min(num_bars, num_files),
-                        show_total_progress=show_total_progress,
-                        verbose=verbose,
-                    )
-                ) as chunk_upload_bars:
-                    chunk_upload_bars.set_total(num_files, "Uploading Files")
+    def __exit__(self, *args: Any) -> None:
+        try:
+            self.latency_q.put(None)
+            wait([self.throttle_listener])
+        finally:
+            self.exec.shutdown(cancel_futures=True)
+            if self.man is not None:
+                self.man.shutdown()
+
+    def dict(self) -> Dict[Any, Any]:
+        return {} if self.man is None else self.man.dict()
+
+    def list(self) -> List[Any]:
+        return [] if self.man is None else self.man.list()
+
+    def progress_bars(
+        self, num_bars: int, *, show_total_progress: bool, verbose: bool
+    ) -> ProgressBars:
+        if self.man is None:
+            return ProgressBars(
+                num_bars, show_total_progress=show_total_progress, verbose=verbose
+            )
 
-                    # todo(ayush): async-ify
-                    chunk_futs: List[Future[CompletedPart]] = []
-                    for data in start_upload_futs:
-                        res = data.result()
+        return self.man.ProgressBars(
+            num_bars, show_total_progress=show_total_progress, verbose=verbose
+        )
 
-                        if res is None:
-                            chunk_upload_bars.update_total_progress(1)
-                            continue
 
-                        pbar_index = chunk_upload_bars.get_free_task_bar_index()
-                        chunk_upload_bars.set(
-                            pbar_index, res.src.stat().st_size, res.src.name
-                        )
-                        chunk_upload_bars.set_usage(str(res.src), res.part_count)
-
-                        for part_index, url in enumerate(res.urls):
-                            chunk_futs.append(
-                                exec.submit(
-                                    upload_file_chunk,
-                                    src=res.src,
-                                    url=url,
-                                    part_index=part_index,
-                                    part_size=res.part_size,
-                                    progress_bars=chunk_upload_bars,
-                                    pbar_index=pbar_index,
-                                    parts_by_source=parts_by_src,
-                                    upload_id=res.upload_id,
-                                    dest=res.dest,
-                                    ingress_source=ingress_source,
-                                )
-                            )
-
-                    for fut in as_completed(chunk_futs):
-                        exc = fut.exception()
-                        if exc is not None:
-                            raise exc
-
-                if progress != Progress.none:
-                    print("\x1b[0GFinalizing uploads...")
-            else:
-                if dest_data.exists() and dest_is_dir:
-                    normalized = urljoins(normalized, src_path.name)
-
-                num_files = 1
-                total_bytes = src_path.stat().st_size
-
-                progress_bars: ProgressBars
-                with closing(
-                    man.ProgressBars(
-                        num_bars,
-                        show_total_progress=show_total_progress,
-                        verbose=verbose,
-                    )
-                ) as progress_bars:
-                    pbar_index = progress_bars.get_free_task_bar_index()
-
-                    start = time.monotonic()
-                    res = start_upload(
-                        src_path,
-                        normalized,
-                        chunk_size_mib=chunk_size_mib,
+def upload_jobs(
+    jobs: Iterator[UploadJob],
+    walk_stats: "WalkStats",
+    *,
+    num_bars: int,
+    show_total_progress: bool,
+    verbose: bool,
+    concurrency_args: Dict[str, Any],
+    chunk_size_mib: Optional[int] = None,
+    ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
+    pool: Optional[UploadPool] = None,
+) -> UploadResult:
+    """Upload every job in `jobs`, splitting files into parts which are uploaded
+    in parallel.
+
+    All parts of all files share one pool and one concurrency limit, so a
+    single large file can use every worker. `walk_stats` must describe `jobs`
+    (it may be filled in lazily while `jobs` is consumed).
+
+    Runs on `pool` if given (`concurrency_args` is then ignored in favor of the
+    pool's), otherwise on a new pool which is shut down before returning. New
+    pools only use worker processes if there are enough jobs to make up for
+    starting them (see `use_process_pool`).
+    """
+    if pool is None:
+        head = list(islice(jobs, process_pool_min_files))
+        jobs = chain(head, jobs)
+
+        processes = use_process_pool(len(head))
+        with UploadPool(concurrency_args, processes=processes) as new_pool:
+            return upload_jobs(
+                jobs,
+                walk_stats,
+                num_bars=num_bars,
+                show_total_progress=show_total_progress,
+                verbose=verbose,
+                concurrency_args=concurrency_args,
+                chunk_size_mib=chunk_size_mib,
+                ingress_source=ingress_source,
+                journal=journal,
+                pool=new_pool,
+            )
+
+    exec = pool.exec
+    throttle = pool.throttle
+    latency_q = pool.latency_q
+    controller = pool.controller
+
+    parts_by_src: "PartsBySrcType" = pool.dict()
+
+    # the walk, url generation and part uploads are pipelined. requests
+    # are only submitted while fewer than `controller.get_limit()` are
+    # in flight, and new files are only pulled from the walker once the
+    # parts of the files already started have been submitted, so memory
+    # use stays bounded no matter how large the directory is
+    walk_done = False
+    pending_parts: Deque[Tuple[StartUploadReturnType, int, Optional[int]]] = deque()
+
+    start_upload_futs: Set[Future[Optional[StartUploadReturnType]]] = set()
+    chunk_futs: Set[Future[Optional[CompletedPart]]] = set()
+
+    progress_bars: ProgressBars
+    with closing(
+        pool.progress_bars(
+            num_bars, show_total_progress=show_total_progress, verbose=verbose
+        )
+    ) as progress_bars:
+        progress_bars.set_total(0, "Uploading Files")
+
+        start = time.monotonic()
+        while True:
+            limit = controller.get_limit()
+
+            while (
+                len(pending_parts) > 0
+                and len(start_upload_futs) + len(chunk_futs) < limit
+            ):
+                res, part_index, pbar_index = pending_parts.popleft()
+                chunk_futs.add(
+                    exec.submit(
+                        upload_file_chunk,
+                        src=res.src,
+                        url=res.urls[part_index],
+                        part_index=part_index,
+                        part_size=res.part_size,
+                        progress_bars=progress_bars,
+                        pbar_index=pbar_index,
+                        parts_by_source=parts_by_src,
+                        upload_id=res.upload_id,
+                        dest=res.dest,
                         ingress_source=ingress_source,
+                        journal=journal,
+                        controller=controller,
+                    )
+                )
+
+            while (
+                not walk_done
+                and len(pending_parts) == 0
+                and len(start_upload_futs) + len(chunk_futs) < limit
+            ):
+                job = next(jobs, None)
+                if job is None:
+                    walk_done = True
+                    break
+
+                parts_by_src[job.src] = pool.list()
+                progress_bars.set_total(walk_stats.num_files)
+
+                start_upload_futs.add(
+                    exec.submit(
+                        start_upload,
+                        job.src,
+                        job.dest,
+                        None,
+                        throttle,
+                        latency_q,
+                        chunk_size_mib,
+                        ingress_source,
+                        journal,
                     )
+                )
 
-                    if res is not None:
-                        progress_bars.set(
-                            pbar_index, res.src.stat().st_size, res.src.name
-                        )
+            if len(start_upload_futs) == 0 and len(chunk_futs) == 0:
+                if walk_done and len(pending_parts) == 0:
+                    break
+
+                continue
+
+            done, _ = wait(start_upload_futs | chunk_futs, return_when=FIRST_COMPLETED)
+
+            for fut in done:
+                if fut in chunk_futs:
+                    chunk_futs.remove(fut)
 
-                        chunk_futs: List[Future[CompletedPart]] = []
-                        for part_index, url in enumerate(res.urls):
-                            chunk_futs.append(
-                                exec.submit(
-                                    upload_file_chunk,
-                                    src_path,
-                                    url,
-                                    part_index,
-                                    res.part_size,
-                                    progress_bars,
-                                    pbar_index,
-                                )
-                            )
-
-                        for fut in as_completed(chunk_futs):
-                            exc = fut.exception()
-                            if exc is not None:
-                                raise exc
-
-                        end_upload(
-                            normalized,
+                    exc = fut.exception()
+                    if exc is not None:
+                        raise exc
+
+                    continue
+
+                start_upload_futs.remove(fut)
+
+                res = fut.result()
+                if res is None:
+                    progress_bars.update_total_progress(1)
+                    continue
+
+                missing = res.missing_part_indices()
+                if len(missing) == 0:
+                    # every part was uploaded by a previous run
+                    chunk_futs.add(
+                        exec.submit(
+                            end_upload,
+                            res.dest,
                             res.upload_id,
-                            [fut.result() for fut in chunk_futs],
-                            ingress_source=ingress_source,
+                            res.completed_parts,
+                            progress_bars,
+                            ingress_source,
+                            journal,
                         )
+                    )
+                    continue
+
+                parts_by_src[res.src].extend(res.completed_parts)
+
+                pbar_index = progress_bars.try_get_free_task_bar_index()
+                progress_bars.set(pbar_index, res.src.stat().st_size, res.src.name)
+                progress_bars.update(pbar_index, res.completed_bytes())
+                progress_bars.set_usage(str(res.src), len(missing))
+
+                pending_parts.extend(
+                    (res, part_index, pbar_index) for part_index in missing
+                )
 
     end = time.monotonic()
     total_time = end - start
 
-    return UploadResult(num_files, total_bytes, total_time)
+    return UploadResult(walk_stats.num_files, walk_stats.total_bytes, total_time)
+
+
+@dataclass
+class WalkStats:
+    num_files: int = 0
+    total_bytes: int = 0
+
+
+def walk_jobs(
+    src: Path, dest: str, stats: Optional[WalkStats] = None
+) -> Iterator[UploadJob]:
+    """Lazily yield an upload job for every file under `src`.
+
+    If `stats` is provided, it is updated as files are discovered.
+    """
+    for dir_path, _, file_names in os.walk(src, followlinks=True):
+        for file_name in file_names:
+            rel_path = Path(dir_path) / file_name
+
+            try:
+                size = rel_path.stat().st_size
+            except FileNotFoundError:
+                print(f"WARNING: file {rel_path} not found, skipping...")
+                continue
+
+            if stats is not None:
+                stats.num_files += 1
+                stats.total_bytes += size
+
+            yield UploadJob(rel_path, urljoins(dest, str(rel_path.relative_to(src))))
 
 
 @dataclass(frozen=True)
@@ -306,20 +502,25 @@ class StartUploadReturnType:
     part_size: int
     src: Path
     dest: str
+    # parts already uploaded by a previous, interrupted run
+    completed_parts: List["CompletedPart"] = field(default_factory=list)
+
+    def missing_part_indices(self) -> List[int]:
+        done = {part.part_number for part in self.completed_parts}
+        return [i for i in range(len(self.urls)) if i + 1 not in done]
+
+    def completed_bytes(self) -> int:
+        file_size = self.src.stat().st_size
+        return sum(
+            min(self.part_size, file_size - self.part_size * (part.part_number - 1))
+            for part in self.completed_parts
+        )
 
 
-def start_upload(
-    src: Path,
-    dest: str,
-    progress_bars: Optional[ProgressBars] = None,
-    throttle: Optional[Throttle] = None,
-    latency_q: Optional["LatencyQueueType"] = None,
-    chunk_size_mib: Optional[int] = None,
-    ingress_source: Optional[dict[str, str]] = None,
-) -> Optional[StartUploadReturnType]:
-    if not src.exists():
-        raise ValueError(f"could not find {src}: no such file or link")
-
+def get_upload_layout(
+    src: Path, chunk_size_mib: Optional[int] = None
+) -> Tuple[str, int, int]:
+    """Returns the content type, part count and part size to upload `src` with."""
     resolved = src
     if src.is_symlink():
         resolved = src.resolve()
@@ -354,6 +555,40 @@ def start_upload(
         chunk_size, math.ceil(file_size / latch_constants.maximum_upload_parts)
     )
 
+    return content_type, part_count, part_size
+
+
+def get_ingress_event_data(ingress_source: Optional[dict[str, str]]) -> dict[str, str]:
+    return {
+        "purpose": json.dumps({
+            "method": "latch-cli",
+            **({"source": ingress_source} if ingress_source is not None else {}),
+        })
+    }
+
+
+def start_upload(
+    src: Path,
+    dest: str,
+    progress_bars: Optional[ProgressBars] = None,
+    throttle: Optional[Throttle] = None,
+    latency_q: Optional["LatencyQueueType"] = None,
+    chunk_size_mib: Optional[int] = None,
+    ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
+) -> Optional[StartUploadReturnType]:
+    if not src.exists():
+        raise ValueError(f"could not find {src}: no such file or link")
+
+    if journal is not None:
+        res = resume_upload(src, dest, journal)
+        if res is not None or journal.is_finished(dest):
+            if progress_bars is not None:
+                progress_bars.update_total_progress(1)
+            return res
+
+    content_type, part_count, part_size = get_upload_layout(src, chunk_size_mib)
+
     if throttle is not None:
         time.sleep(throttle.get_delay())
 
@@ -365,14 +600,7 @@ def start_upload(
             "path": dest,
             "content_type": content_type,
             "part_count": part_count,
-            "ingress_event_data": {
-                "purpose": json.dumps({
-                    "method": "latch-cli",
-                    **(
-                        {"source": ingress_source} if ingress_source is not None else {}
-                    ),
-                })
-            },
+            "ingress_event_data": get_ingress_event_data(ingress_source),
         },
     )
     end = time.monotonic()
@@ -389,15 +617,49 @@ def start_upload(
         progress_bars.update_total_progress(1)
 
     if "version_id" in json_data["data"]:
-        return  # file is empty, so no need to upload any content
+        # file is empty, so no need to upload any content
+        if journal is not None:
+            journal.finish_empty(src, dest)
+        return
 
     data: StartUploadData = json_data["data"]
 
+    if journal is not None:
+        journal.start(
+            src,
+            dest,
+            upload_id=data["upload_id"],
+            urls=data["urls"],
+            part_count=part_count,
+            part_size=part_size,
+        )
+
     return StartUploadReturnType(
         **data, part_count=part_count, part_size=part_size, src=src, dest=dest
     )
 
 
+def resume_upload(
+    src: Path, dest: str, journal: UploadJournal
+) -> Optional[StartUploadReturnType]:
+    entry = journal.get(src, dest)
+    if entry is None or entry.completed:
+        return None
+
+    return StartUploadReturnType(
+        upload_id=entry.upload_id,
+        urls=entry.urls,
+        part_count=entry.part_count,
+        part_size=entry.part_size,
+        src=src,
+        dest=dest,
+        completed_parts=[
+            CompletedPart(src=src, etag=etag, part_number=part_number)
+            for part_number, etag in entry.parts
+        ],
+    )
+
+
 @dataclass(frozen=True)
 class CompletedPart:
     src: Path
@@ -416,16 +678,30 @@ def upload_file_chunk(
     upload_id: Optional[str] = None,
     dest: Optional[str] = None,
     ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
+    controller: Optional[ConcurrencyController] = None,
 ) -> CompletedPart:
     # todo(ayush): proper exception handling that aborts everything
     try:
         time.sleep(0.1 * random.random())
 
-        with open(src, "rb") as f:
-            f.seek(part_size * part_index)
-            data = f.read(part_size)
+        with FileSlice(src, part_size * part_index, part_size) as data:
+            start = time.monotonic()
+            res = http_session.put(url, data=data)
+            end = time.monotonic()
+
+        if controller is not None:
+            controller.record(len(data), end - start, throttled=was_throttled(res))
 
-        res = http_session.put(url, data=data)
+        if res.status_code == 403 and journal is not None and dest is not None:
+            # the presigned urls recorded for a resumed upload can expire, and
+            # they can't be renewed for an existing upload id
+            journal.forget(dest)
+            raise HTTPException(
+                f"failed to upload part {part_index} of {src}: upload URL was"
+                " rejected (403). If this upload was resumed, its URLs may have"
+                " expired - rerun with `--resume` to restart this file."
+            )
         if res.status_code != 200:
             raise HTTPException(
                 f"failed to upload part {part_index} of {src}: {res.status_code}"
@@ -439,6 +715,9 @@ def upload_file_chunk(
 
         ret = CompletedPart(src=src, etag=etag, part_number=part_index + 1)
 
+        if journal is not None and dest is not None:
+            journal.record_part(dest, ret.part_number, ret.etag)
+
         if parts_by_source is not None:
             parts_by_source[src].append(ret)
 
@@ -461,7 +740,9 @@ def upload_file_chunk(
                         upload_id=upload_id,
                         parts=list(parts_by_source[src]),
                         ingress_source=ingress_source,
+                        journal=journal,
                     )
+                    del parts_by_source[src]
 
         return ret
     except:
@@ -477,6 +758,7 @@ def end_upload(
     parts: List[CompletedPart],
     progress_bars: Optional[ProgressBars] = None,
     ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
 ):
     res = http_session.post(
         latch_config.api.data.end_upload,
@@ -487,14 +769,7 @@ def end_upload(
             "parts": [
                 {"ETag": part.etag, "PartNumber": part.part_number} for part in parts
             ],
-            "ingress_event_data": {
-                "purpose": json.dumps({
-                    "method": "latch-cli",
-                    **(
-                        {"source": ingress_source} if ingress_source is not None else {}
-                    ),
-                })
-            },
+            "ingress_event_data": get_ingress_event_data(ingress_source),
         },
     )
 
@@ -508,6 +783,9 @@ def end_upload(
             f"end upload request failed with code {res.status_code}: {err}"
         )
 
+    if journal is not None:
+        journal.finish(dest)
+
     if progress_bars is not None:
         progress_bars.update_total_progress(1)
 
@@ -0,0 +1,492 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from dataclasses import dataclass
+from http.client import HTTPException
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+import aiohttp
+import orjson
+
+from latch_cli.constants import Units
+from latch_cli.utils import get_auth_header
+from latch_sdk_config.latch import config as latch_config
+
+from .concurrency import ConcurrencyController
+from .journal import UploadJournal
+from .progress import ProgressBars
+from .upload import (
+    CompletedPart,
+    StartUploadData,
+    StartUploadReturnType,
+    UploadJob,
+    UploadResult,
+    WalkStats,
+    get_ingress_event_data,
+    get_upload_layout,
+    resume_upload,
+    walk_jobs,
+)
+
+# mirrors the retry policy of `http_session`
+retry_statuses = {429, 500, 502, 503, 504}
+max_retries = 10
+backoff_factor = 1
+backoff_max = 120  # seconds
+
+read_block_size = Units.MiB
+
+walk_batch_size = 256
+max_queued_batches = 4
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    def json(self) -> Any:
+        return orjson.loads(self.content)
+
+
+class Limiter:
+    """Async counterpart of a semaphore whose size follows a `ConcurrencyController`."""
+
+    def __init__(self, controller: ConcurrencyController):
+        self.controller = controller
+        self.in_flight = 0
+        self.cond = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self.cond:
+            await self.cond.wait_for(
+                lambda: self.in_flight < self.controller.get_limit()
+            )
+            self.in_flight += 1
+
+    async def __aexit__(self, *args: Any) -> None:
+        async with self.cond:
+            self.in_flight -= 1
+            # the limit may have grown as well, so wake up everyone
+            self.cond.notify_all()
+
+
+class Uploader:
+    """Shares a single connection pool between every request of an upload.
+
+    All requests (start, part and end) are bounded by the same limiter, so the
+    controller's limit is the total number of concurrent requests.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        controller: ConcurrencyController,
+        chunk_size_mib: Optional[int] = None,
+        ingress_source: Optional[dict[str, str]] = None,
+        journal: Optional[UploadJournal] = None,
+    ):
+        self.session = session
+        self.controller = controller
+        self.limiter = Limiter(controller)
+        self.chunk_size_mib = chunk_size_mib
+        self.ingress_source = ingress_source
+        self.journal = journal
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[Callable[[], Any]] = None,
+        num_bytes: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """Send a request, retrying like `http_session`.
+
+        If `num_bytes` is set, the final attempt is reported to the controller.
+        """
+        attempt = 0
+        throttled = False
+        while True:
+            try:
+                async with self.limiter:
+                    start = time.monotonic()
+                    async with self.session.request(
+                        method, url, data=None if body is None else body(), **kwargs
+                    ) as res:
+                        ret = Response(res.status, res.headers, await res.read())
+                    end = time.monotonic()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= max_retries:
+                    raise
+            else:
+                throttled = throttled or ret.status in {429, 503}
+
+                if ret.status not in retry_statuses or attempt >= max_retries:
+                    if num_bytes is not None:
+                        self.controller.record(
+                            num_bytes, end - start, throttled=throttled
+                        )
+                    return ret
+
+            await asyncio.sleep(min(backoff_factor * 2**attempt, backoff_max))
+            attempt += 1
+
+    async def start_upload(
+        self, src: Path, dest: str
+    ) -> Optional[StartUploadReturnType]:
+        if not src.exists():
+            raise ValueError(f"could not find {src}: no such file or link")
+
+        if self.journal is not None:
+            res = resume_upload(src, dest, self.journal)
+            if res is not None or self.journal.is_finished(dest):
+                return res
+
+        content_type, part_count, part_size = await asyncio.to_thread(
+            get_upload_layout, src, self.chunk_size_mib
+        )
+
+        res = await self.request(
+            "POST",
+            latch_config.api.data.start_upload,
+            headers={"Authorization": get_auth_header()},
+            json={
+                "path": dest,
+                "content_type": content_type,
+                "part_count": part_count,
+                "ingress_event_data": get_ingress_event_data(self.ingress_source),
+            },
+        )
+
+        json_data = res.json()
+
+        if res.status != 200:
+            raise RuntimeError(
+                f"unable to start upload for {src}: {json_data['error']}"
+            )
+
+        if "version_id" in json_data["data"]:
+            # file is empty, so no need to upload any content
+            if self.journal is not None:
+                self.journal.finish_empty(src, dest)
+            return
+
+        data: StartUploadData = json_data["data"]
+
+        if self.journal is not None:
+            self.journal.start(
+                src,
+                dest,
+                upload_id=data["upload_id"],
+                urls=data["urls"],
+                part_count=part_count,
+                part_size=part_size,
+            )
+
+        return StartUploadReturnType(
+            **data, part_count=part_count, part_size=part_size, src=src, dest=dest
+        )
+
+    async def upload_file_chunk(
+        self,
+        src: Path,
+        dest: str,
+        url: str,
+        part_index: int,
+        part_size: int,
+        file_size: int,
+    ) -> CompletedPart:
+        offset = part_size * part_index
+        length = min(part_size, file_size - offset)
+
+        # the body is streamed from disk so that in-flight parts don't each hold
+        # a full `part_size` buffer
+        res = await self.request(
+            "PUT",
+            url,
+            body=lambda: iter_file_range(src, offset, length),
+            num_bytes=length,
+            headers={"Content-Length": str(length)},
+        )
+        if res.status == 403 and self.journal is not None:
+            # see `upload_file_chunk` in `upload.py`
+            self.journal.forget(dest)
+            raise HTTPException(
+                f"failed to upload part {part_index} of {src}: upload URL was"
+                " rejected (403). If this upload was resumed, its URLs may have"
+                " expired - rerun with `--resume` to restart this file."
+            )
+        if res.status != 200:
+            raise HTTPException(
+                f"failed to upload part {part_index} of {src}: {res.status}"
+            )
+
+        etag = res.headers.get("ETag")
+        assert etag is not None, (
+            f"Malformed response from chunk upload for {src}, Part {part_index},"
+            f" Headers: {res.headers}"
+        )
+
+        ret = CompletedPart(src=src, etag=etag, part_number=part_index + 1)
+
+        if self.journal is not None:
+            self.journal.record_part(dest, ret.part_number, ret.etag)
+
+        return ret
+
+    async def end_upload(
+        self, dest: str, upload_id: str, parts: List[CompletedPart]
+    ) -> None:
+        res = await self.request(
+            "POST",
+            latch_config.api.data.end_upload,
+            headers={"Authorization": get_auth_header()},
+            json={
+                "path": dest,
+                "upload_id": upload_id,
+                "parts": [
+                    {"ETag": part.etag, "PartNumber": part.part_number}
+                    for part in parts
+                ],
+                "ingress_event_data": get_ingress_event_data(self.ingress_source),
+            },
+        )
+
+        if res.status != 200:
+            err = res.json()["error"]
+            if res.status == 400:
+                raise ValueError(f"upload request invalid: {err}")
+            if res.status == 401:
+                raise RuntimeError(f"authorization failed: {err}")
+            raise RuntimeError(
+                f"end upload request failed with code {res.status}: {err}"
+            )
+
+        if self.journal is not None:
+            self.journal.finish(dest)
+
+    async def upload_file(self, job: UploadJob, progress_bars: ProgressBars) -> None:
+        res = await self.start_upload(job.src, job.dest)
+        if res is None:
+            progress_bars.update_total_progress(1)
+            return
+
+        file_size = res.src.stat().st_size
+
+        pbar_index = progress_bars.try_get_free_task_bar_index()
+        try:
+            progress_bars.set(pbar_index, file_size, res.src.name)
+            progress_bars.update(pbar_index, res.completed_bytes())
+
+            async def upload_part(part_index: int) -> CompletedPart:
+                part = await self.upload_file_chunk(
+                    res.src,
+                    res.dest,
+                    res.urls[part_index],
+                    part_index,
+                    res.part_size,
+                    file_size,
+                )
+                progress_bars.update(
+                    pbar_index,
+                    min(res.part_size, file_size - res.part_size * part_index),
+                )
+                return part
+
+            parts = await gather_or_cancel(
+                upload_part(part_index) for part_index in res.missing_part_indices()
+            )
+
+            await self.end_upload(
+                res.dest, res.upload_id, [*res.completed_parts, *parts]
+            )
+        finally:
+            progress_bars.return_task_bar(pbar_index)
+
+        progress_bars.update_total_progress(1)
+        progress_bars.write(f"Copied {res.src}")
+
+
+async def iter_file_range(src: Path, offset: int, length: int) -> AsyncIterator[bytes]:
+    with open(src, "rb") as f:
+        f.seek(offset)
+
+        remaining = length
+        while remaining > 0:
+            data = await asyncio.to_thread(f.read, min(read_block_size, remaining))
+            if len(data) == 0:
+                raise RuntimeError(f"{src} was truncated during upload")
+
+            remaining -= len(data)
+            yield data
+
+
+async def gather_or_cancel(coros: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Like `asyncio.gather`, but cancels the remaining tasks on the first error."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def upload_jobs(
+    jobs: Iterable[UploadJob],
+    progress_bars: ProgressBars,
+    *,
+    concurrency_args: Dict[str, Any],
+    chunk_size_mib: Optional[int] = None,
+    ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
+) -> None:
+    """Upload every job in `jobs`, which may be a lazy iterator.
+
+    `jobs` is consumed on a separate thread and fed through a bounded queue, so
+    uploads begin as soon as the first files are discovered and the number of
+    pending jobs held in memory stays constant.
+
+    One worker is started per request the controller may ever allow - idle
+    workers cost nothing since they just wait on the limiter.
+    """
+    controller = ConcurrencyController(**concurrency_args)
+    max_in_flight = controller.maximum
+
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=60, sock_read=300)
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, raise_for_status=False
+    ) as session:
+        uploader = Uploader(
+            session,
+            controller=controller,
+            chunk_size_mib=chunk_size_mib,
+            ingress_source=ingress_source,
+            journal=journal,
+        )
+
+        loop = asyncio.get_running_loop()
+        batches: "asyncio.Queue[Optional[List[UploadJob]]]" = asyncio.Queue(
+            maxsize=max_queued_batches
+        )
+        stopped = threading.Event()
+
+        def produce() -> None:
+            def put(batch: Optional[List[UploadJob]]) -> None:
+                asyncio.run_coroutine_threadsafe(batches.put(batch), loop).result()
+
+            batch: List[UploadJob] = []
+            for job in jobs:
+                if stopped.is_set():
+                    return
+
+                batch.append(job)
+                if len(batch) == walk_batch_size:
+                    put(batch)
+                    batch = []
+
+            if len(batch) > 0:
+                put(batch)
+            put(None)
+
+        pending: Deque[UploadJob] = deque()
+        num_files = 0
+
+        async def next_job() -> Optional[UploadJob]:
+            nonlocal num_files
+
+            while len(pending) == 0:
+                batch = await batches.get()
+                if batch is None:
+                    # leave the sentinel for the other workers
+                    batches.put_nowait(None)
+                    return None
+
+                pending.extend(batch)
+                num_files += len(batch)
+                progress_bars.set_total(num_files)
+
+            return pending.popleft()
+
+        async def worker() -> None:
+            while True:
+                job = await next_job()
+                if job is None:
+                    return
+
+                await uploader.upload_file(job, progress_bars)
+
+        try:
+            await gather_or_cancel([
+                asyncio.to_thread(produce),
+                *(worker() for _ in range(max_in_flight)),
+            ])
+        finally:
+            stopped.set()
+
+
+def upload(
+    src: Path,
+    dest: str,
+    *,
+    num_bars: int,
+    show_total_progress: bool,
+    verbose: bool,
+    concurrency_args: Dict[str, Any],
+    chunk_size_mib: Optional[int] = None,
+    ingress_source: Optional[dict[str, str]] = None,
+    journal: Optional[UploadJournal] = None,
+) -> UploadResult:
+    walk_stats = WalkStats()
+    if src.is_dir():
+        jobs = walk_jobs(src, dest, walk_stats)
+    else:
+        jobs = [UploadJob(src, dest)]
+        walk_stats.num_files = 1
+        walk_stats.total_bytes = src.stat().st_size
+        num_bars = min(num_bars, 1)
+
+    with closing(
+        ProgressBars(
+            num_bars, show_total_progress=show_total_progress, verbose=verbose
+        )
+    ) as progress_bars:
+        progress_bars.set_total(0, "Uploading Files")
+
+        start = time.monotonic()
+        asyncio.run(
+            upload_jobs(
+                jobs,
+                progress_bars,
+                concurrency_args=concurrency_args,
+                chunk_size_mib=chunk_size_mib,
+                ingress_source=ingress_source,
+                journal=journal,
+            )
+        )
+
+    end = time.monotonic()
+
+    if journal is not None:
+        journal.remove()
+
+    return UploadResult(walk_stats.num_files, walk_stats.total_bytes, end - start)
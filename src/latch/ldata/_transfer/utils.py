@@ -1,9 +1,14 @@
+import io
+import multiprocessing
 import os
+import sys
 import time
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
 
 import requests
 import requests.adapters
+import xattr
 from gql.transport.exceptions import TransportClosed, TransportServerError
 from graphql.language import DocumentNode
 from latch_sdk_gql import JsonValue
@@ -22,9 +27,67 @@ http_session.mount("https://", _adapter)
 http_session.mount("http://", _adapter)
 
 
+class FileSlice(io.RawIOBase):
+    """Read-only view of the byte range `[offset, offset + length)` of a file.
+
+    Used as a request body so that parts are streamed from disk in small blocks
+    instead of being read into memory in full. Seekable so that `urllib3` can
+    rewind the body when retrying a request.
+    """
+
+    def __init__(self, path: Path, offset: int, length: int):
+        super().__init__()
+
+        self._f = open(path, "rb")  # noqa: SIM115
+        size = os.fstat(self._f.fileno()).st_size
+
+        self.offset = min(offset, size)
+        self.length = max(0, min(length, size - self.offset))
+        self.pos = 0
+
+        self._f.seek(self.offset)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        remaining = self.length - self.pos
+        if remaining <= 0:
+            return 0
+
+        with memoryview(b) as view:
+            n = self._f.readinto(view[:remaining])
+
+        self.pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += self.length
+
+        self.pos = max(0, min(offset, self.length))
+        self._f.seek(self.offset + self.pos)
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
 # todo(rahul): move this function into latch_sdk_gql.execute
 def query_with_retry(
-    document: DocumentNode,
+    document: Union[str, DocumentNode],
     variables: Optional[Dict[str, JsonValue]] = None,
     *,
     num_retries: int = 3,
@@ -53,17 +116,85 @@ def query_with_retry(
     raise RuntimeError("gql retries exceeded")
 
 
+def was_throttled(res: requests.Response) -> bool:
+    """Whether any attempt of `res` was rejected with 429 or 503.
+
+    `http_session` retries these transparently, so they are only visible in
+    the retry history.
+    """
+    if res.status_code in {429, 503}:
+        return True
+
+    retries: Optional[requests.adapters.Retry] = getattr(res.raw, "retries", None)
+    if retries is None:
+        return False
+
+    return any(x.status in {429, 503} for x in retries.history)
+
+
+def get_initial_in_flight_requests() -> int:
+    return 16
+
+
+def get_max_in_flight_requests() -> int:
+    return 256
+
+
+initial_workers = 4
+
+
 def get_max_workers() -> int:
-    return 4
-
-    # todo(ayush): dynamically set workers based on available memory
-    # try:
-    #     max_workers = len(os.sched_getaffinity(0)) * 4
-    # except AttributeError:
-    #     cpu = os.cpu_count()
-    #     if cpu is not None:
-    #         max_workers = cpu * 4
-    #     else:
-    #         max_workers = 16
-
-    # return min(max_workers, 16)
+    """Upper bound on the number of concurrent transfer processes."""
+    try:
+        max_workers = len(os.sched_getaffinity(0)) * 4
+    except AttributeError:
+        cpu = os.cpu_count()
+        if cpu is not None:
+            max_workers = cpu * 4
+        else:
+            max_workers = 16
+
+    return max(initial_workers, min(max_workers, 32))
+
+
+# transfers of fewer files run on threads in the calling process, since starting
+# worker processes and a state manager would take longer than the transfer
+process_pool_min_files = 32
+
+
+def use_process_pool(num_files: int) -> bool:
+    """Whether a transfer of `num_files` files should run on worker processes
+    instead of on threads in the calling process.
+
+    Daemonic processes (e.g. `multiprocessing` pool workers) are not allowed to
+    have children, so they always use threads.
+    """
+    if multiprocessing.current_process().daemon:
+        return False
+
+    return num_files >= process_pool_min_files
+
+
+version_xattr = "user.version_id"
+
+
+def get_version_xattr(path: Path) -> Optional[str]:
+    """Version ID of the remote object `path` was downloaded from, if recorded."""
+    if sys.platform == "win32":
+        return None
+
+    try:
+        return xattr.getxattr(str(path), version_xattr).decode()
+    except OSError:
+        # missing attribute, missing file, or filesystem without xattr support
+        return None
+
+
+def set_version_xattr(path: Path, version_id: str) -> None:
+    if sys.platform == "win32":
+        return
+
+    try:
+        xattr.setxattr(str(path), version_xattr, version_id.encode())
+    except OSError:
+        pass
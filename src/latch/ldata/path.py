@@ -1,15 +1,17 @@
 import atexit
+import dataclasses
+import io
+import math
+import os
 import re
 import shutil
-import sys
 import warnings
 from collections.abc import Iterator
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Optional, Type
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Dict, Iterable, List, Optional, Type
 
-import gql
-import xattr
+import graphql.language as l
 from flytekit import (
     Blob,
     BlobMetadata,
@@ -20,14 +22,38 @@ from flytekit import (
     Scalar,
 )
 from flytekit.extend import TypeEngine, TypeTransformer
-from latch_persistence import LatchPersistence
+from latch_sdk_gql.execute import execute_async
+from latch_sdk_gql.utils import _json_value, _name_node, _parse_selection
 
 from latch.ldata.type import LatchPathError, LDataNodeType
+from latch_cli.constants import Units
 from latch_cli.utils import urljoins
-
+from latch_cli.utils.path import normalize_path
+
+from ._download_cache import DownloadCache
+from ._metadata_cache import MetadataCache
+from ._transfer.concurrency import controller_args as _controller_args
+from ._transfer.download import DownloadJob as _DownloadJob
+from ._transfer.download import download_jobs as _download_jobs
+from ._transfer.download import download_one as _download_one
+from ._transfer.download import download_range_size as _download_range_size
+from ._transfer.download import get_download_jobs as _get_download_jobs
+from ._transfer.download import get_signed_urls as _get_signed_urls
+from ._transfer.download import is_unchanged as _is_unchanged
 from ._transfer.node import get_node_data as _get_node_data
+from ._transfer.node import iter_descendant_paths as _iter_descendant_paths
+from ._transfer.reader import RangeReader as _RangeReader
+from ._transfer.reader import default_block_size as _default_block_size
+from ._transfer.reader import default_cache_blocks as _default_cache_blocks
+from ._transfer.reader import default_readahead_blocks as _default_readahead_blocks
+from ._transfer.progress import Progress as _Progress
 from ._transfer.remote_copy import remote_copy as _remote_copy
-from ._transfer.utils import query_with_retry
+from ._transfer.upload import UploadJob as _UploadJob
+from ._transfer.upload import WalkStats as _WalkStats
+from ._transfer.upload import get_ingress_source as _get_ingress_source
+from ._transfer.upload import upload_jobs as _upload_jobs
+from ._transfer.upload import walk_jobs as _walk_jobs
+from ._transfer.utils import get_version_xattr, query_with_retry, set_version_xattr
 
 node_id_regex = re.compile(r"^latch://(?P<id>[0-9]+)\.node$")
 
@@ -42,6 +68,61 @@ _dir_types = {
 
 _download_idx = 0
 
+_shared_cache: "Optional[MetadataCache[_Cache]]" = None
+
+_download_cache: Optional[DownloadCache] = None
+if os.environ.get("LATCH_DOWNLOAD_CACHE_MAX_BYTES") is not None:
+    _download_cache = DownloadCache(
+        max_bytes=int(os.environ["LATCH_DOWNLOAD_CACHE_MAX_BYTES"])
+    )
+
+_get_node_data_query = """
+    query GetNodeData($path: String!) {
+        ldataResolvePathToNode(path: $path) {
+            path
+            ldataNode {
+                finalLinkTarget {
+                    id
+                    name
+                    type
+                    ldataObjectMeta {
+                        contentSize
+                        contentType
+                        versionId
+                    }
+                }
+            }
+        }
+    }
+"""
+
+# number of paths resolved by a single aliased query in `LPath.fetch_metadata_many`
+metadata_batch_size = 500
+
+# number of children listed by a single request in `LPath.iterdir`
+iterdir_page_size = 1000
+
+# number of descendants listed by a single request in `LPath.walk`/`LPath.rglob`
+walk_page_size = 10000
+
+_metadata_selection = """
+    ldataResolvePathToNode(path: {}) {
+        path
+        ldataNode {
+            finalLinkTarget {
+                id
+                name
+                type
+                ldataObjectMeta {
+                    contentSize
+                    contentType
+                    versionId
+                }
+            }
+        }
+    }
+"""
+
 
 @dataclass
 class _Cache:
@@ -55,6 +136,54 @@ class _Cache:
     version_id: Optional[str] = None
 
 
+def enable_metadata_cache(*, ttl: float = 60, max_entries: int = 10000) -> None:
+    """Share metadata between every LPath in this process.
+
+    Once enabled, getters (`size`, `version_id`, ...) on any LPath reuse metadata
+    fetched by another LPath for the same path or node ID within the last `ttl`
+    seconds instead of making a network request. At most `max_entries` nodes are
+    kept, evicting the least recently used.
+
+    Mutations made through LPath (`rmr`, `mkdirp`, `copy_to`, `upload_from`)
+    invalidate the affected paths, but changes made elsewhere are only seen once
+    entries expire. `fetch_metadata` always bypasses the cache.
+    """
+    global _shared_cache
+    _shared_cache = MetadataCache(ttl=ttl, max_entries=max_entries)
+
+
+def disable_metadata_cache() -> None:
+    """Stop sharing metadata between LPaths and drop everything cached."""
+    global _shared_cache
+    _shared_cache = None
+
+
+def enable_download_cache(
+    *, max_bytes: int = 50 * Units.GiB, root: Optional[Path] = None
+) -> None:
+    """Keep downloaded files in a persistent cache shared by every process.
+
+    Once enabled, `LPath.download` stores each file it downloads under `root`
+    (`~/.latch/download_cache` by default) keyed by node ID and version ID, and
+    later downloads of the same version - from any process on this machine - are
+    served from there. Destinations are reflinked to the cached copy where the
+    filesystem allows and copied otherwise, so downloaded files can be modified
+    freely. The least recently used files are evicted once the cache holds more
+    than `max_bytes`.
+
+    Also enabled on import if `LATCH_DOWNLOAD_CACHE_MAX_BYTES` is set. Only
+    applies to files - directories are always downloaded.
+    """
+    global _download_cache
+    _download_cache = DownloadCache(max_bytes=max_bytes, root=root)
+
+
+def disable_download_cache() -> None:
+    """Stop using the persistent download cache. Cached files are kept on disk."""
+    global _download_cache
+    _download_cache = None
+
+
 @dataclass(frozen=True)
 class LPath:
     """Latch Path.
@@ -70,14 +199,6 @@ class LPath:
         default_factory=_Cache, init=False, repr=False, hash=False, compare=False
     )
 
-    _persistence: LatchPersistence = field(
-        default_factory=LatchPersistence,
-        init=False,
-        repr=False,
-        hash=False,
-        compare=False,
-    )
-
     path: str
 
     def __post_init__(self):
@@ -93,28 +214,89 @@ class LPath:
 
         Always makes a network request.
         """
-        data = query_with_retry(
-            gql.gql("""
-            query GetNodeData($path: String!) {
-                ldataResolvePathToNode(path: $path) {
-                    path
-                    ldataNode {
-                        finalLinkTarget {
-                            id
-                            name
-                            type
-                            ldataObjectMeta {
-                                contentSize
-                                contentType
-                                versionId
-                            }
-                        }
-                    }
+        data = query_with_retry(_get_node_data_query, {"path": self.path})[
+            "ldataResolvePathToNode"
+        ]
+
+        self._set_metadata(data)
+
+    async def fetch_metadata_async(self) -> None:
+        """Like `fetch_metadata`, but without blocking the event loop.
+
+        Many paths can be resolved concurrently with e.g. `asyncio.gather`.
+        """
+        data = (await execute_async(_get_node_data_query, {"path": self.path}))[
+            "ldataResolvePathToNode"
+        ]
+
+        self._set_metadata(data)
+
+    @staticmethod
+    def fetch_metadata_many(paths: Iterable["LPath"]) -> None:
+        """(Re-)populate the cache of every LPath in `paths`.
+
+        Equivalent to calling `fetch_metadata` on each path, but paths are
+        resolved in bulk - `metadata_batch_size` per network request - instead of
+        one request each.
+
+        Throws LatchPathError for the first path that does not exist, after the
+        caches of all other paths have been populated.
+
+        Always makes a network request.
+        """
+        by_path: Dict[str, List[LPath]] = {}
+        for p in paths:
+            by_path.setdefault(p.path, []).append(p)
+
+        unique = list(by_path.keys())
+
+        missing: Optional[str] = None
+        for i in range(0, len(unique), metadata_batch_size):
+            batch = unique[i : i + metadata_batch_size]
+
+            sels: List[l.FieldNode] = []
+            for j, path in enumerate(batch):
+                sel = _parse_selection(_metadata_selection)
+                assert isinstance(sel, l.FieldNode)
+
+                args = l.ArgumentNode()
+                args.name = _name_node("path")
+                args.value = _json_value(path)
+
+                sel.alias = _name_node(f"q{j}")
+                sel.arguments = (args,)
+
+                sels.append(sel)
+
+            sel_set = l.SelectionSetNode()
+            sel_set.selections = tuple(sels)
+
+            doc = l.parse("""
+                query GetNodeDataMany {
+                    placeholder
                 }
-            }"""),
-            {"path": self.path},
-        )["ldataResolvePathToNode"]
+            """)
+
+            assert len(doc.definitions) == 1
+            query = doc.definitions[0]
 
+            assert isinstance(query, l.OperationDefinitionNode)
+            query.selection_set = sel_set
+
+            res = query_with_retry(doc)
+
+            for j, path in enumerate(batch):
+                for p in by_path[path]:
+                    try:
+                        p._set_metadata(res[f"q{j}"])
+                    except LatchPathError:
+                        if missing is None:
+                            missing = path
+
+        if missing is not None:
+            raise LatchPathError("no such Latch file or directory", missing)
+
+    def _set_metadata(self, data: Optional[Dict[str, Any]]) -> None:
         if (
             data is None
             or data["ldataNode"] is None
@@ -139,6 +321,47 @@ class LPath:
             self._cache.content_type = meta["contentType"]
             self._cache.version_id = meta["versionId"]
 
+        if _shared_cache is not None:
+            _shared_cache.put(
+                self.path, self._cache.node_id, dataclasses.replace(self._cache)
+            )
+
+    def _load_metadata(self) -> None:
+        """Populate this instance's cache from the shared metadata cache if
+        enabled and it has an entry for this path, and from the network otherwise.
+        """
+        if _shared_cache is not None:
+            match = node_id_regex.match(self.path)
+            if match:
+                data = _shared_cache.get_by_node_id(match.group("id"))
+            else:
+                data = _shared_cache.get(self.path)
+
+            if data is not None:
+                for f in dataclasses.fields(data):
+                    setattr(self._cache, f.name, getattr(data, f.name))
+                return
+
+        self.fetch_metadata()
+
+    def _invalidate(self) -> None:
+        """Clear this instance's cache and drop this path (and everything below
+        it) from the shared metadata cache."""
+        node_id = self._cache.node_id
+        self._clear_cache()
+
+        if _shared_cache is None:
+            return
+
+        if node_id is not None:
+            _shared_cache.invalidate_node_id(node_id)
+
+        match = node_id_regex.match(self.path)
+        if match:
+            _shared_cache.invalidate_node_id(match.group("id"))
+        else:
+            _shared_cache.invalidate(self.path)
+
     def _clear_cache(self):
         self._cache.path = None
         self._cache.node_id = None
@@ -155,17 +378,17 @@ class LPath:
             return match.group("id")
 
         if self._cache.node_id is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.node_id
 
     def name(self, *, load_if_missing: bool = True) -> Optional[str]:
         if self._cache.name is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.name
 
     def type(self, *, load_if_missing: bool = True) -> Optional[LDataNodeType]:
         if self._cache.type is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.type
 
     def size_recursive(self, *, load_if_missing: bool = True) -> Optional[int]:
@@ -174,11 +397,11 @@ class LPath:
 
         if self._cache.dir_size is None and load_if_missing:
             data = query_with_retry(
-                gql.gql("""
+                """
                 query GetLDataSubtreeSize($nodeId: BigInt!) {
                     ldataGetSubtreeSizeRecursive(argNodeId: $nodeId)
                 }
-                """),
+                """,
                 {"nodeId": self.node_id()},
                 num_retries=2,
             )["ldataGetSubtreeSizeRecursive"]
@@ -188,17 +411,17 @@ class LPath:
 
     def size(self, *, load_if_missing: bool = True) -> Optional[int]:
         if self._cache.size is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.size
 
     def content_type(self, *, load_if_missing: bool = True) -> Optional[str]:
         if self._cache.content_type is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.content_type
 
     def version_id(self, *, load_if_missing: bool = True) -> Optional[str]:
         if self._cache.version_id is None and load_if_missing:
-            self.fetch_metadata()
+            self._load_metadata()
         return self._cache.version_id
 
     def is_dir(self, *, load_if_missing: bool = True) -> bool:
@@ -209,34 +432,151 @@ class LPath:
 
         Should only be called on directories. Does not recursively list directories.
 
+        Children are listed `iterdir_page_size` at a time and come with their
+        metadata already populated, so getters like `size` and `is_dir` on them
+        do not make further network requests.
+
         Always makes a network request.
         """
-        data = query_with_retry(
-            gql.gql("""
-            query LDataChildren($argPath: String!) {
-                ldataResolvePathData(argPath: $argPath) {
-                    finalLinkTarget {
-                        type
-                        childLdataTreeEdges(filter: { child: { removed: { equalTo: false }, pending: { equalTo: false }, copiedFrom: { isNull: true } } }) {
-                            nodes {
-                                child {
-                                    name
+        offset = 0
+        while True:
+            data = query_with_retry(
+                """
+                query LDataChildren($argPath: String!, $first: Int!, $offset: Int!) {
+                    ldataResolvePathData(argPath: $argPath) {
+                        finalLinkTarget {
+                            type
+                            childLdataTreeEdges(
+                                filter: { child: { removed: { equalTo: false }, pending: { equalTo: false }, copiedFrom: { isNull: true } } }
+                                first: $first
+                                offset: $offset
+                            ) {
+                                nodes {
+                                    child {
+                                        name
+                                        finalLinkTarget {
+                                            id
+                                            name
+                                            type
+                                            ldataObjectMeta {
+                                                contentSize
+                                                contentType
+                                                versionId
+                                            }
+                                        }
+                                    }
                                 }
                             }
                         }
                     }
-                }
-            }"""),
-            {"argPath": self.path},
-        )["ldataResolvePathData"]
+                }""",
+                {"argPath": self.path, "first": iterdir_page_size, "offset": offset},
+            )["ldataResolvePathData"]
 
-        if data is None:
-            raise LatchPathError("no such Latch file or directory", self.path)
-        if data["finalLinkTarget"]["type"].lower() not in _dir_types:
-            raise ValueError(f"not a directory: {self.path}")
+            if data is None:
+                raise LatchPathError("no such Latch file or directory", self.path)
+            if data["finalLinkTarget"]["type"].lower() not in _dir_types:
+                raise ValueError(f"not a directory: {self.path}")
+
+            nodes = data["finalLinkTarget"]["childLdataTreeEdges"]["nodes"]
+            for node in nodes:
+                child = LPath(urljoins(self.path, node["child"]["name"]))
+                child._set_metadata({
+                    "path": "",
+                    "ldataNode": {"finalLinkTarget": node["child"]["finalLinkTarget"]},
+                })
+                yield child
+
+            if len(nodes) < iterdir_page_size:
+                return
+
+            offset += len(nodes)
+
+    def walk(self, *, fetch_metadata: bool = False) -> Iterator["LPath"]:
+        """Yield an LPath for every file below this directory, recursively.
+
+        Files are listed from the server `walk_page_size` at a time, so crawling a
+        large tree takes one request per page rather than one per directory.
+        Directories themselves are not yielded.
+
+        Args:
+        fetch_metadata: Whether to populate the metadata of the yielded LPaths.
+            Costs one extra request per `metadata_batch_size` files.
+        """
+        return self._iter_descendants(None, fetch_metadata=fetch_metadata)
+
+    def rglob(self, pattern: str, *, fetch_metadata: bool = False) -> Iterator["LPath"]:
+        """Like `walk`, but only yield files whose path matches `pattern`.
+
+        Matching follows `pathlib.PurePath.match`, i.e. relative patterns match
+        from the right, so `rglob("*.bam")` finds every BAM file at any depth.
+        """
+        return self._iter_descendants(pattern, fetch_metadata=fetch_metadata)
+
+    def _iter_descendants(
+        self, pattern: Optional[str], *, fetch_metadata: bool
+    ) -> Iterator["LPath"]:
+        page: List[LPath] = []
+
+        def flush() -> List[LPath]:
+            if not fetch_metadata or len(page) == 0:
+                return page
+
+            try:
+                LPath.fetch_metadata_many(page)
+            except LatchPathError:
+                # removed since it was listed
+                return [p for p in page if p._cache.node_id is not None]
 
-        for node in data["finalLinkTarget"]["childLdataTreeEdges"]["nodes"]:
-            yield LPath(urljoins(self.path, node["child"]["name"]))
+            return page
+
+        for rel_path in _iter_descendant_paths(self.path, page_size=walk_page_size):
+            if pattern is not None and not PurePosixPath(rel_path).match(pattern):
+                continue
+
+            page.append(LPath(urljoins(self.path, rel_path)))
+            if len(page) < walk_page_size:
+                continue
+
+            yield from flush()
+            page = []
+
+        yield from flush()
+
+    def open(
+        self,
+        mode: str = "rb",
+        *,
+        block_size: int = _default_block_size,
+        cache_blocks: int = _default_cache_blocks,
+        readahead_blocks: int = _default_readahead_blocks,
+        encoding: Optional[str] = None,
+    ) -> IO[Any]:
+        """Open the file at this instance's path for reading without downloading it.
+
+        Returns a seekable file object which fetches data with range requests, so
+        only the parts of the file which are actually read are transferred.
+
+        Args:
+        mode: "rb" for binary or "r" for text.
+        block_size: Number of bytes fetched per request.
+        cache_blocks: Number of recently read blocks kept in memory.
+        readahead_blocks: Number of blocks fetched ahead of sequential reads.
+        encoding: Text encoding, only used in "r" mode.
+        """
+        if mode not in {"r", "rb"}:
+            raise ValueError(f"unsupported mode: {mode!r} (only 'r' and 'rb' are)")
+
+        raw = _RangeReader(
+            self.path,
+            block_size=block_size,
+            cache_blocks=cache_blocks,
+            readahead_blocks=readahead_blocks,
+        )
+        if mode == "rb":
+            return raw
+
+        return io.TextIOWrapper(io.BufferedReader(raw), encoding=encoding)
 
     def mkdirp(self) -> None:
         node = _get_node_data(self.path, allow_resolve_to_parent=True).data[self.path]
@@ -248,16 +588,16 @@ class LPath:
         path = f"latch://{node.id}.node/{node.remaining}"
         path += "/" if not path.endswith("/") else ""
         query_with_retry(
-            gql.gql("""
+            """
             mutation LDataMkdirP($path: String!) {
                 ldataMkdirp(input: { argPath: $path }) {
                     bigInt
                 }
             }
-            """),
+            """,
             {"path": path},
         )
-        self._clear_cache()
+        self._invalidate()
 
     def rmr(self) -> None:
         """Recursively delete files at this instance's path.
@@ -267,16 +607,16 @@ class LPath:
         Always makes a network request.
         """
         query_with_retry(
-            gql.gql("""
+            """
             mutation LDataRmr($nodeId: BigInt!) {
                 ldataRmr(input: { argNodeId: $nodeId }) {
                     clientMutationId
                 }
             }
-            """),
+            """,
             {"nodeId": self.node_id()},
         )
-        self._clear_cache()
+        self._invalidate()
 
     def copy_to(self, dst: "LPath") -> None:
         """Copy the file at this instance's path to the given destination.
@@ -286,13 +626,27 @@ class LPath:
         show_summary: Whether to print a summary of the copy operation.
         """
         _remote_copy(self.path, dst.path, create_parents=True)
+        dst._invalidate()
 
-    def upload_from(self, src: Path, *, show_progress_bar: bool = False) -> None:
+    def upload_from(
+        self,
+        src: Path,
+        *,
+        show_progress_bar: bool = False,
+        max_concurrency: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> None:
         """Upload the file at the given source to this instance's path.
 
+        Files are uploaded in parallel, as are the parts of each file.
+
         Args:
         src: The source path.
         show_progress_bar: Whether to show a progress bar during the upload.
+        max_concurrency: The maximum number of parts in flight. If None, this is
+            adjusted automatically based on throughput.
+        chunk_size: The size in bytes of each part, rounded up to a whole MiB.
+            Defaults to 64 MiB.
         """
         if show_progress_bar:
             warnings.warn(
@@ -300,12 +654,30 @@ class LPath:
                 stacklevel=2,
             )
 
+        normalized = normalize_path(self.path)
+
+        walk_stats = _WalkStats()
         if src.is_dir():
-            self._persistence.upload_directory(str(src), self.path)
+            jobs = _walk_jobs(src, normalized, walk_stats)
         else:
-            self._persistence.upload(str(src), self.path)
+            jobs = iter([_UploadJob(src, normalized)])
+            walk_stats.num_files = 1
+            walk_stats.total_bytes = src.stat().st_size
+
+        _upload_jobs(
+            jobs,
+            walk_stats,
+            num_bars=0,
+            show_total_progress=False,
+            verbose=False,
+            concurrency_args=_controller_args(max_concurrency),
+            chunk_size_mib=(
+                math.ceil(chunk_size / Units.MiB) if chunk_size is not None else None
+            ),
+            ingress_source=_get_ingress_source(),
+        )
 
-        self._clear_cache()
+        self._invalidate()
 
     def download(
         self,
@@ -313,13 +685,22 @@ class LPath:
         *,
         show_progress_bar: bool = False,
         cache: bool = False,
+        max_concurrency: Optional[int] = None,
+        chunk_size: Optional[int] = None,
     ) -> Path:
         """Download the file at this instance's path to the given destination.
 
+        Files in a directory are downloaded in parallel, and large files are
+        downloaded as byte ranges fetched in parallel.
+
         Args:
         dst: The destination path. If None, a temporary directory is created and the file is
             downloaded there. The temprary directory is deleted when the program exits.
         show_progress_bar: Whether to show a progress bar during the download.
+        max_concurrency: The maximum number of files or ranges in flight. If None,
+            this is adjusted automatically based on throughput.
+        chunk_size: The size in bytes of the ranges large files are split into.
+            Defaults to 16 MiB.
         """
         if show_progress_bar:
             warnings.warn(
@@ -338,30 +719,63 @@ class LPath:
                 raise Exception("unable get name of ldata node")
             dst = tmp_dir / name
 
-        not_windows = sys.platform != "win32"
-        dst_str = str(dst)
-
-        self._clear_cache()
+        self.fetch_metadata()
         version_id = self.version_id()
-        version_xattr = b"user.version_id"
 
         if (
-            not_windows
-            and cache
+            cache
+            and version_id is not None
             and dst.exists()
-            and xattr.listxattr(dst_str) is not None
-            and version_xattr in xattr.listxattr(dst_str)
-            and version_id == xattr.getxattr(dst_str, version_xattr).decode()
+            and version_id == get_version_xattr(dst)
         ):
             return dst
 
+        normalized = normalize_path(self.path)
+        range_size = chunk_size if chunk_size is not None else _download_range_size
+
+        node_id = self.node_id()
         if self.is_dir():
-            self._persistence.download_directory(self.path, str(dst))
+            urls = _get_signed_urls(self.path, normalized, recursive=True)["data"][
+                "urls"
+            ]
+
+            jobs: List[_DownloadJob] = []
+            for _, job in _get_download_jobs(normalized, urls, dst):
+                job = dataclasses.replace(job, range_size=range_size)
+                if cache and _is_unchanged(job):
+                    continue
+
+                job.dest.parent.mkdir(parents=True, exist_ok=True)
+                jobs.append(job)
+
+            dst.mkdir(parents=True, exist_ok=True)
+            _download_jobs(
+                jobs, progress=_Progress.none, verbose=False, cores=max_concurrency
+            )
         else:
-            self._persistence.download(self.path, str(dst))
 
-        if not_windows and version_id is not None:
-            xattr.setxattr(dst_str, version_xattr, version_id)
+            def download_to(p: Path) -> None:
+                url = _get_signed_urls(self.path, normalized, recursive=False)["data"][
+                    "url"
+                ]
+                _download_one(
+                    _DownloadJob(url, p, version_id, self.size(), range_size=range_size),
+                    progress=_Progress.none,
+                    verbose=False,
+                    cores=max_concurrency,
+                )
+
+            if (
+                _download_cache is not None
+                and node_id is not None
+                and version_id is not None
+            ):
+                _download_cache.fetch(node_id, version_id, dst, download_to)
+            else:
+                download_to(dst)
+
+        if version_id is not None:
+            set_version_xattr(dst, version_id)
 
         return dst
 
@@ -2,7 +2,6 @@ from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Iterator, List, Literal, Optional, TypedDict, Union, overload
 
-import gql
 import graphql.language as l
 from latch_sdk_gql.execute import execute
 from latch_sdk_gql.utils import _GqlJsonValue, _json_value, _name_node, _parse_selection
@@ -52,7 +51,7 @@ class Project:
         Always makes a network request.
         """
         data = execute(
-            document=gql.gql("""
+            document="""
                 query ProjectQuery($id: BigInt!) {
                     catalogProject(id: $id) {
                         id
@@ -70,7 +69,7 @@ class Project:
                         }
                     }
                 }
-                """),
+                """,
             variables={"id": self.id},
         )["catalogProject"]
 
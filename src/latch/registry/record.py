@@ -12,7 +12,6 @@ from typing import (
     overload,
 )
 
-import gql
 from latch_sdk_gql.execute import execute
 
 from latch.registry.upstream_types.types import DBType
@@ -111,7 +110,7 @@ class Record:
         from latch.registry.utils import to_python_literal, to_python_type
 
         data: _CatalogSample = execute(
-            gql.gql("""
+            """
             query RecordQuery($id: BigInt!) {
                 catalogSample(id: $id) {
                     id
@@ -134,7 +133,7 @@ class Record:
                     }
                 }
             }
-            """),
+            """,
             {"id": self.id},
         )["catalogSample"]
 
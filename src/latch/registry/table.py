@@ -4,6 +4,7 @@ from datetime import date, datetime
 from enum import Enum
 from inspect import isclass
 from typing import (
+    AsyncIterator,
     Dict,
     Iterator,
     List,
@@ -19,7 +20,6 @@ from typing import (
     overload,
 )
 
-import gql
 import gql.transport.exceptions
 import graphql.language as l
 from typing_extensions import TypeAlias
@@ -46,7 +46,7 @@ from latch.registry.utils import (
 from latch.types.directory import LatchDir
 from latch.types.file import LatchFile
 from latch.utils import NotFoundError
-from latch_sdk_gql.execute import execute
+from latch_sdk_gql.execute import execute, execute_async
 from latch_sdk_gql.utils import (
     _GqlJsonValue,
     _json_value,
@@ -71,6 +71,46 @@ class _ColumnNode(TypedDict("_ColumnNodeReserved", {"def": DBValue})):
     type: DBType
 
 
+_table_query = """
+    query TableQuery($id: BigInt!) {
+        catalogExperiment(id: $id) {
+            id
+            displayName
+            catalogExperimentColumnDefinitionsByExperimentId {
+                nodes {
+                    key
+                    type
+                    def
+                }
+            }
+            projectId
+        }
+    }
+"""
+
+_records_page_query = """
+    query TableQuery(
+        $id: BigInt!,
+        $argLimit: BigInt!,
+        $argOffset: BigInt!
+    ) {
+        catalogExperiment(id: $id) {
+            allSamplesJoinInfoPaginated(
+                argLimit: $argLimit,
+                argOffset: $argOffset
+            ) {
+                nodes {
+                    id
+                    name
+                    key
+                    data
+                }
+            }
+        }
+    }
+"""
+
+
 @dataclass
 class _Cache:
     display_name: Optional[str] = None
@@ -99,33 +139,36 @@ class Table:
     id: str
     """Unique identifier."""
 
-    def load(self) -> None:
+    def load(self, *, bypass_cache: bool = False) -> None:
         """(Re-)populate this table instance's cache.
 
         Future calls to most getters will return immediately without making a network request.
 
-        Always makes a network request.
+        Always makes a network request, unless the GraphQL response cache is enabled
+        (see :func:`latch_sdk_gql.execute.enable_response_cache`) and holds a response
+        from the last minute. Pass `bypass_cache` to always make a network request.
         """
         data = execute(
-            gql.gql("""
-                query TableQuery($id: BigInt!) {
-                    catalogExperiment(id: $id) {
-                        id
-                        displayName
-                        catalogExperimentColumnDefinitionsByExperimentId {
-                            nodes {
-                                key
-                                type
-                                def
-                            }
-                        }
-                        projectId
-                    }
-                }
-                """),
+            _table_query,
             variables={"id": self.id},
+            cache_ttl=60,
+            bypass_cache=bypass_cache,
         )["catalogExperiment"]
+        self._set_data(data)
+
+    async def load_async(self, *, bypass_cache: bool = False) -> None:
+        """Like :meth:`load`, but without blocking the event loop."""
+        data = (
+            await execute_async(
+                _table_query,
+                variables={"id": self.id},
+                cache_ttl=60,
+                bypass_cache=bypass_cache,
+            )
+        )["catalogExperiment"]
+        self._set_data(data)
 
+    def _set_data(self, data) -> None:
         if data is None:
             raise TableNotFoundError(
                 f"table does not exist or you lack permissions: id={self.id}"
@@ -248,68 +291,40 @@ class Table:
         offset = 0
         while True:
             data = execute(
-                gql.gql("""
-                    query TableQuery(
-                        $id: BigInt!,
-                        $argLimit: BigInt!,
-                        $argOffset: BigInt!
-                    ) {
-                        catalogExperiment(id: $id) {
-                            allSamplesJoinInfoPaginated(
-                                argLimit: $argLimit,
-                                argOffset: $argOffset
-                            ) {
-                                nodes {
-                                    id
-                                    name
-                                    key
-                                    data
-                                }
-                            }
-                        }
-                    }
-                """),
+                _records_page_query,
                 {"id": self.id, "argLimit": page_size, "argOffset": offset},
             )["catalogExperiment"]
 
-            if data is None:
-                raise TableNotFoundError(
-                    f"table does not exist or you lack permissions: id={self.id}"
-                )
-
-            nodes: List[_AllRecordsNode] = data["allSamplesJoinInfoPaginated"]["nodes"]
+            page = self._to_page(data, cols)
+            if len(page) > 0:
+                yield page
 
-            record_names: Dict[str, str] = {}
-            record_values: Dict[str, Dict[str, RecordValue]] = {}
+                if len(page) < page_size:
+                    break
 
-            for node in nodes:
-                record_names[node["id"]] = node["name"]
-                vals = record_values.setdefault(node["id"], {})
+                offset += page_size
+            else:
+                break
 
-                col = cols.get(node["key"])
-                if col is None:
-                    continue
+    async def list_records_async(
+        self, *, page_size: int = 100
+    ) -> AsyncIterator[Dict[str, Record]]:
+        """Like :meth:`list_records`, but without blocking the event loop."""
+        cols = self.get_columns(load_if_missing=False)
+        if cols is None:
+            await self.load_async()
+            cols = self.get_columns()
 
-                # todo(maximsmol): in the future, allow storing or yielding values that failed to parse
-                vals[col.key] = to_python_literal(
-                    node["data"], col.upstream_type["type"]
+        offset = 0
+        while True:
+            data = (
+                await execute_async(
+                    _records_page_query,
+                    {"id": self.id, "argLimit": page_size, "argOffset": offset},
                 )
+            )["catalogExperiment"]
 
-            page: Dict[str, Record] = {}
-            for id, values in record_values.items():
-                for col in cols.values():
-                    if col.key in values:
-                        continue
-
-                    if not col.upstream_type["allowEmpty"]:
-                        values[col.key] = InvalidValue("")
-
-                cur = Record(id)
-                cur._cache.name = record_names[id]
-                cur._cache.values = values
-                cur._cache.columns = cols
-                page[id] = cur
-
+            page = self._to_page(data, cols)
             if len(page) > 0:
                 yield page
 
@@ -320,6 +335,47 @@ class Table:
             else:
                 break
 
+    def _to_page(self, data, cols: Dict[str, Column]) -> Dict[str, Record]:
+        if data is None:
+            raise TableNotFoundError(
+                f"table does not exist or you lack permissions: id={self.id}"
+            )
+
+        nodes: List[_AllRecordsNode] = data["allSamplesJoinInfoPaginated"]["nodes"]
+
+        record_names: Dict[str, str] = {}
+        record_values: Dict[str, Dict[str, RecordValue]] = {}
+
+        for node in nodes:
+            record_names[node["id"]] = node["name"]
+            vals = record_values.setdefault(node["id"], {})
+
+            col = cols.get(node["key"])
+            if col is None:
+                continue
+
+            # todo(maximsmol): in the future, allow storing or yielding values that failed to parse
+            vals[col.key] = to_python_literal(
+                node["data"], col.upstream_type["type"]
+            )
+
+        page: Dict[str, Record] = {}
+        for id, values in record_values.items():
+            for col in cols.values():
+                if col.key in values:
+                    continue
+
+                if not col.upstream_type["allowEmpty"]:
+                    values[col.key] = InvalidValue("")
+
+            cur = Record(id)
+            cur._cache.name = record_names[id]
+            cur._cache.values = values
+            cur._cache.columns = cols
+            page[id] = cur
+
+        return page
+
     def get_dataframe(self):
         """Get a pandas DataFrame of all records in this table.
 
@@ -723,11 +779,11 @@ class TableUpdate:
 
         try:
             res = execute(
-                gql.gql("""
+                """
                     query ResolvePaths($argPaths: [String]!) {
                         fastLdataMultiResolvePath(argPaths: $argPaths)
                     }
-                    """),
+                    """,
                 {"argPaths": [data["remote_path"] for data in unresolved]},
             )["fastLdataMultiResolvePath"]
         except gql.transport.exceptions.TransportQueryError as e:
@@ -3,7 +3,6 @@ from datetime import date, datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Dict, List, Optional, Type, TypeVar, Union, cast
 
-import gql
 from dateutil.parser import parse
 from latch_sdk_config.user import user_config
 from latch_sdk_gql.execute import execute
@@ -344,7 +343,7 @@ def to_registry_literal(
 
             if ws_id is None:
                 data = execute(
-                    gql.gql("""
+                    """
                     query nodeIdQ($argPath: String!) {
                         ldataResolvePath(
                             path: $argPath
@@ -353,12 +352,12 @@ def to_registry_literal(
                             path
                         }
                     }
-                    """),
+                    """,
                     {"argPath": python_literal.remote_path},
                 )["ldataResolvePath"]
             else:
                 data = execute(
-                    gql.gql("""
+                    """
                     query nodeIdQ($argPath: String!, $wsId: BigInt!) {
                         ldataResolvePathExt(
                             path: $argPath,
@@ -368,7 +367,7 @@ def to_registry_literal(
                             path
                         }
                     }
-                    """),
+                    """,
                     {"argPath": python_literal.remote_path, "wsId": ws_id},
                 )["ldataResolvePathExt"]
 
@@ -4,7 +4,6 @@ from textwrap import dedent
 from typing import Any, Callable, Dict, Union
 
 import click
-import gql
 from flytekit.configuration import SerializationSettings
 from flytekit.core.context_manager import ExecutionParameters
 from flytekit.core.task import TaskPlugins
@@ -32,7 +31,7 @@ def _override_task_resources(task_config: Pod) -> None:
     }
 
     execute(
-        gql.gql("""
+        """
             mutation OverrideTaskResources(
                 $argToken: String!
                 $argNodeName: String!,
@@ -52,7 +51,7 @@ def _override_task_resources(task_config: Pod) -> None:
                     clientMutationId
                 }
             }
-        """),
+        """,
         {
             "argToken": task_id.token,
             "argNodeName": task_id.node_name,
@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import List, Optional, Type, TypedDict, Union, get_args, get_origin
 from urllib.parse import urlparse
 
-import gql
 from flytekit.core.annotation import FlyteAnnotation
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
 from flytekit.core.type_engine import TypeEngine, TypeTransformer
@@ -167,7 +166,7 @@ class LatchDir(FlyteDirectory):
             return ret
 
         res: Optional[IterdirLdataResolvePathData] = execute(
-            gql.gql("""
+            """
             query LDataChildren($argPath: String!) {
                 ldataResolvePathData(argPath: $argPath) {
                     finalLinkTarget {
@@ -181,7 +180,7 @@ class LatchDir(FlyteDirectory):
                         }
                     }
                 }
-            }"""),
+            }""",
             {"argPath": self.remote_path},
         )["ldataResolvePathData"]
 
@@ -206,7 +205,7 @@ class LatchDir(FlyteDirectory):
         self._idempotent_set_path()
 
         res: Optional[NodeDescendantsLDataResolvePathData] = execute(
-            gql.gql("""
+            """
                 query NodeDescendantsQuery($path: String!) {
                     ldataResolvePathData(argPath: $path) {
                         finalLinkTarget {
@@ -218,7 +217,7 @@ class LatchDir(FlyteDirectory):
                         }
                     }
                 }
-            """),
+            """,
             {"path": self._remote_directory},
         )["ldataResolvePathData"]
 
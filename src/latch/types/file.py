@@ -5,7 +5,6 @@ from pathlib import Path
 from typing import Optional, Type, Union
 from urllib.parse import urlparse
 
-import gql
 from flytekit.core.annotation import FlyteAnnotation
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
 from flytekit.core.type_engine import TypeEngine, TypeTransformer
@@ -99,13 +98,13 @@ class LatchFile(FlyteFile):
                     local_path_hint = self._remote_path
                     if is_absolute_node_path.match(self._remote_path) is not None:
                         data = execute(
-                            gql.gql("""
+                            """
                             query getName($argPath: String!) {
                                 ldataResolvePathData(argPath: $argPath) {
                                     name
                                 }
                             }
-                            """),
+                            """,
                             {"argPath": self._remote_path},
                         )["ldataResolvePathData"]
 
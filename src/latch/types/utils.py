@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Optional, Union
 from urllib.parse import urlparse
 
-import gql
 from latch_sdk_gql.execute import execute
 
 
@@ -37,12 +36,12 @@ def format_path(path: str) -> str:
     node_id = match.group("node_id")
 
     data = execute(
-        gql.gql("""
+        """
         query ldataGetPathQ($id: BigInt!) {
             ldataGetPath(argNodeId: $id)
             ldataOwner(argNodeId: $id)
         }
-        """),
+        """,
         {"id": node_id},
     )
 
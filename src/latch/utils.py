@@ -2,7 +2,6 @@ import itertools
 import os
 from typing import Dict, TypedDict
 
-import gql
 import jwt
 from latch_sdk_config.user import user_config
 from latch_sdk_gql.execute import execute
@@ -55,7 +54,7 @@ def get_workspaces() -> Dict[str, WSInfo]:
     """
     account_id = account_id_from_token(retrieve_or_login())
     res = execute(
-        gql.gql("""
+        """
             query GetWorkspaces($accountId: BigInt!) {
                 userInfoByAccountId(accountId: $accountId) {
                     id
@@ -102,8 +101,10 @@ def get_workspaces() -> Dict[str, WSInfo]:
                     }
                 }
             }
-        """),
+        """,
         {"accountId": account_id},
+        # workspace membership rarely changes
+        cache_ttl=300,
     )
 
     owned_teams = res["teamInfos"]["nodes"]
@@ -158,7 +159,7 @@ def current_workspace() -> str:
         return ws
 
     res = execute(
-        gql.gql("""
+        """
             query DefaultAccountQuery {
                 accountInfoCurrent {
                     id
@@ -167,7 +168,8 @@ def current_workspace() -> str:
                     }
                 }
             }
-        """),
+        """,
+        cache_ttl=300,
     )["accountInfoCurrent"]
 
     ws = res["id"]
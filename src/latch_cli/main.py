@@ -803,13 +803,38 @@ LDATA COMMANDS
     show_default=True,
 )
 @click.option(
-    "--cores", help="Manually specify number of cores to parallelize over", type=int
+    "--cores",
+    help=(
+        "Manually specify the number of concurrent requests. By default this is"
+        " tuned automatically based on observed throughput."
+    ),
+    type=int,
 )
 @click.option(
     "--chunk-size-mib",
     help="Manually specify the upload chunk size in MiB. Must be >= 5",
     type=int,
 )
+@click.option(
+    "--engine",
+    help=(
+        "Transfer engine to use for uploads. `async` runs all requests from a"
+        " single process and is faster for directories with many files"
+    ),
+    type=click.Choice(["process", "async"], case_sensitive=False),
+    default="process",
+    show_default=True,
+)
+@click.option(
+    "--resume",
+    help=(
+        "Resume an interrupted upload, skipping files and parts that were already"
+        " uploaded"
+    ),
+    is_flag=True,
+    default=False,
+    show_default=True,
+)
 @requires_login
 def cp(
     src: List[str],
@@ -819,6 +844,8 @@ def cp(
     no_glob: bool,
     cores: Optional[int] = None,
     chunk_size_mib: Optional[int] = None,
+    engine: str = "process",
+    resume: bool = False,
 ):
     """
     Copy files between Latch Data and local, or between two Latch Data locations.
@@ -838,6 +865,8 @@ def cp(
         expand_globs=not no_glob,
         cores=cores,
         chunk_size_mib=chunk_size_mib,
+        engine=engine,
+        resume=resume,
     )
 
 
@@ -965,7 +994,34 @@ def mkdir(remote_directory: str):
     is_flag=True,
     default=False,
 )
-@click.option("--cores", help="Number of cores to use for parallel syncing.", type=int)
+@click.option(
+    "--cores",
+    help=(
+        "Number of concurrent transfers to use for syncing. By default this is tuned"
+        " automatically based on observed throughput."
+    ),
+    type=int,
+)
+@click.option(
+    "--checksum",
+    help=(
+        "Compare existing files by content instead of by modification time. Local"
+        " checksums are cached in `~/.latch` so unchanged files are only hashed"
+        " once."
+    ),
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--watch",
+    help=(
+        "Keep running after the initial sync and upload files as they change."
+        " Files are only uploaded once they have stopped changing for a few"
+        " seconds."
+    ),
+    is_flag=True,
+    default=False,
+)
 @requires_login
 def sync(
     srcs: List[str],
@@ -973,15 +1029,25 @@ def sync(
     delete: bool,
     ignore_unsyncable: bool,
     cores: Optional[int] = None,
+    checksum: bool = False,
+    watch: bool = False,
 ):
     """
-    Update the contents of a remote directory with local data.
+    Update the contents of a remote directory with local data, or of a local
+    directory with remote data.
     """
     from latch_cli.services.sync import sync
 
-    # todo(maximsmol): remote -> local
     # todo(maximsmol): remote -> remote
-    sync(srcs, dst, delete=delete, ignore_unsyncable=ignore_unsyncable, cores=cores)
+    sync(
+        srcs,
+        dst,
+        delete=delete,
+        ignore_unsyncable=ignore_unsyncable,
+        cores=cores,
+        checksum=checksum,
+        watch=watch,
+    )
 
 
 """
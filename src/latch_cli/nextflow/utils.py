@@ -1,7 +1,6 @@
 import os
 from typing import Optional
 
-import gql
 from latch_sdk_gql.execute import execute
 
 
@@ -11,7 +10,7 @@ def _get_execution_name() -> Optional[str]:
         return None
 
     res = execute(
-        gql.gql("""
+        """
         query executionCreatorsByToken($token: String!) {
             executionCreatorByToken(token: $token) {
                 flytedbId
@@ -20,7 +19,7 @@ def _get_execution_name() -> Optional[str]:
                 }
             }
         }
-        """),
+        """,
         {"token": token},
     )["executionCreatorByToken"]
 
@@ -7,6 +7,7 @@ import click
 from latch.ldata._transfer.download import download as _download
 from latch.ldata._transfer.progress import Progress
 from latch.ldata._transfer.remote_copy import remote_copy as _remote_copy
+from latch.ldata._transfer.upload import UploadEngine
 from latch.ldata._transfer.upload import upload as _upload
 from latch.ldata.type import LatchPathError
 from latch_cli.services.cp.glob import expand_pattern
@@ -23,10 +24,16 @@ def _copy_and_print(src: str, dst: str, progress: Progress) -> None:
             {click.style("Destination: ", fg="blue")}{(dst)}"""))
 
 
-def _download_and_print(src: str, dst: Path, progress: Progress, verbose: bool) -> None:
+def _download_and_print(
+    src: str,
+    dst: Path,
+    progress: Progress,
+    verbose: bool,
+    cores: Optional[int] = None,
+) -> None:
     if progress != Progress.none:
         click.secho(f"Downloading {dst.name}", fg="blue")
-    res = _download(src, dst, progress, verbose)
+    res = _download(src, dst, progress, verbose, cores=cores)
     if progress != Progress.none:
         click.echo(dedent(f"""
 			{click.style("Download Complete", fg="green")}
@@ -45,6 +52,8 @@ def cp(
     expand_globs: bool,
     cores: Optional[int] = None,
     chunk_size_mib: Optional[int] = None,
+    engine: str = "process",
+    resume: bool = False,
 ):
     if chunk_size_mib is not None and chunk_size_mib < 5:
         click.secho(
@@ -63,11 +72,11 @@ def cp(
             if src_remote and not dest_remote:
                 if expand_globs:
                     [
-                        _download_and_print(p, Path(dest), progress, verbose)
+                        _download_and_print(p, Path(dest), progress, verbose, cores)
                         for p in expand_pattern(src)
                     ]
                 else:
-                    _download_and_print(src, Path(dest), progress, verbose)
+                    _download_and_print(src, Path(dest), progress, verbose, cores)
             elif not src_remote and dest_remote:
                 if progress != Progress.none:
                     click.secho(f"Uploading {src}", fg="blue")
@@ -78,6 +87,8 @@ def cp(
                     verbose=verbose,
                     cores=cores,
                     chunk_size_mib=chunk_size_mib,
+                    engine=UploadEngine(engine.lower()),
+                    resume=resume,
                 )
                 if progress != Progress.none:
                     click.echo(dedent(f"""
@@ -5,7 +5,6 @@ try:
 except ImportError:
     from functools import lru_cache as cache
 
-import gql
 from latch_sdk_gql.execute import execute
 
 
@@ -28,7 +27,7 @@ class LdataResolvePathData(TypedDict):
 @cache
 def _get_immediate_children_of_node(path: str) -> List[str]:
     lrpd: LdataResolvePathData = execute(
-        gql.gql("""
+        """
             query MyQuery($argPath: String!) {
                 ldataResolvePathData(argPath: $argPath) {
                     childLdataTreeEdges(
@@ -42,7 +41,7 @@ def _get_immediate_children_of_node(path: str) -> List[str]:
                     }
                 }
             }
-        """),
+        """,
         {"argPath": path},
     )["ldataResolvePathData"]
 
@@ -106,7 +105,7 @@ class AccountInfoCurrent(TypedDict):
 # suggestions
 @cache
 def _get_known_domains_for_account() -> List[str]:
-    aic: AccountInfoCurrent = execute(gql.gql("""
+    aic: AccountInfoCurrent = execute("""
         query DomainCompletionQuery {
             accountInfoCurrent {
                 userInfoByAccountId {
@@ -137,7 +136,7 @@ def _get_known_domains_for_account() -> List[str]:
                 }
             }
         }
-    """))["accountInfoCurrent"]
+    """)["accountInfoCurrent"]
 
     ui = aic["userInfoByAccountId"]
 
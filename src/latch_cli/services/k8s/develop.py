@@ -11,7 +11,6 @@ from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 import click
-import gql
 import websockets.client as websockets
 
 from latch.utils import current_workspace
@@ -85,7 +84,7 @@ def get_latest_registered_version(pkg_root: Path) -> str:
     wf_name = workflow_name(pkg_root)
 
     res = execute(
-        gql.gql("""
+        """
         query LatestVersion($wsId: BigInt!, $name: String!) {
             workflowInfosLatestVersionInAccount(
                 argOwnerId: $wsId
@@ -96,7 +95,7 @@ def get_latest_registered_version(pkg_root: Path) -> str:
                 }
             }
         }
-        """),
+        """,
         {"wsId": ws_id, "name": wf_name},
     )["workflowInfosLatestVersionInAccount"]
 
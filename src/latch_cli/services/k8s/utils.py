@@ -386,7 +386,7 @@ def get_pvc_info(execution_id: Optional[str]) -> str:
     workspace_str: str = user_config.workspace_name or user_config.workspace_id
 
     res: NFAvailablePvcs = execute(
-        gql.gql("""
+        """
             query NFWorkdirs($wsId: BigInt!) {
                 nfAvailablePvcs(argWsId: $wsId) {
                     nodes {
@@ -395,7 +395,7 @@ def get_pvc_info(execution_id: Optional[str]) -> str:
                     }
                 }
             }
-        """),
+        """,
         {"wsId": user_config.workspace_id},
     )["nfAvailablePvcs"]
 
@@ -1,7 +1,7 @@
 import asyncio
 import base64
 import json
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from dataclasses import dataclass
 from json.decoder import JSONDecodeError
 from typing import Any, Literal, Optional, Union, get_args, get_origin
@@ -10,7 +10,6 @@ from urllib.parse import urljoin
 import dill
 import flyteidl.core.literals_pb2 as pb
 import google.protobuf.json_format as gpjson
-import gql
 from flyteidl.core import interface_pb2 as _interface_pb2
 from flytekit.core.context_manager import FlyteContextManager
 from flytekit.core.promise import translate_inputs_to_literals
@@ -24,7 +23,7 @@ from latch_cli import tinyrequests
 from latch_cli.services.launch.interface import get_workflow_interface
 from latch_cli.utils import get_auth_header
 from latch_sdk_config.latch import NUCLEUS_URL, config
-from latch_sdk_gql.execute import execute
+from latch_sdk_gql.execute import execute, execute_async
 
 ExecutionStatus = Literal[
     "UNDEFINED",
@@ -87,8 +86,7 @@ def process_output(outputs_url: str, python_outputs: dict[str, type]) -> dict[st
 
 def get_ingress_data(flytedb_id: str) -> list[LPath]:
     query_res: dict[str, Any] = execute(
-        gql.gql(
-            """
+        """
             query ExecutionIngressTag($flytedbId: BigInt!) {
                 ldataNodeEvents(
                     condition: { causeExecutionFlytedbId: $flytedbId }
@@ -102,8 +100,7 @@ def get_ingress_data(flytedb_id: str) -> list[LPath]:
                     }
                 }
             }
-            """
-        ),
+            """,
         {"flytedbId": flytedb_id},
     )
 
@@ -127,6 +124,18 @@ class CompletedExecution:
     status: ExecutionStatus
 
 
+_execution_status_query = """
+    query GetExecutionStatus($executionId: BigInt!) {
+        executionInfo(id: $executionId) {
+            id
+            flytedbId
+            status
+            outputsUrl
+        }
+    }
+"""
+
+
 @dataclass
 class Execution:
     id: str
@@ -138,30 +147,30 @@ class Execution:
     def poll(self) -> Generator[None, Any, None]:
         while True:
             res: dict[str, Any] = execute(
-                gql.gql(
-                    """
-                    query GetExecutionStatus($executionId: BigInt!) {
-                        executionInfo(id: $executionId) {
-                            id
-                            flytedbId
-                            status
-                            outputsUrl
-                        }
-                    }
-                    """
-                ),
-                {"executionId": self.id},
+                _execution_status_query, {"executionId": self.id}
             )
+            self._set_status(res)
 
-            execution_info = res.get("executionInfo", {})
-            self.status = execution_info.get("status", "UNDEFINED")
-            self.outputs_url = execution_info.get("outputsUrl")
-            self.flytedb_id = execution_info.get("flytedbId")
+            yield
+
+    async def poll_async(self) -> AsyncGenerator[None, Any]:
+        """Like `poll`, but without blocking the event loop."""
+        while True:
+            res: dict[str, Any] = await execute_async(
+                _execution_status_query, {"executionId": self.id}
+            )
+            self._set_status(res)
 
             yield
 
+    def _set_status(self, res: dict[str, Any]) -> None:
+        execution_info = res.get("executionInfo", {})
+        self.status = execution_info.get("status", "UNDEFINED")
+        self.outputs_url = execution_info.get("outputsUrl")
+        self.flytedb_id = execution_info.get("flytedbId")
+
     async def wait(self) -> Union[CompletedExecution, None]:
-        for _ in self.poll():
+        async for _ in self.poll_async():
             if self.flytedb_id is None:
                 continue
 
@@ -202,8 +211,7 @@ def launch_from_launch_plan(
     ).variables
 
     lp_default_resp: dict[str, Any] = execute(
-        gql.gql(
-            """
+        """
             query LaunchPlanDefaultInputs($workflowId: BigInt!, $namePattern: String!) {
                 lpInfos(
                     filter: {
@@ -216,8 +224,7 @@ def launch_from_launch_plan(
                     }
                 }
             }
-            """
-        ),
+            """,
         {"workflowId": wf_id, "namePattern": f"%.{lp_name}"},
     )
 
@@ -7,7 +7,6 @@ from typing import List, Optional, TypedDict
 
 import click
 import dateutil.parser as dp
-import gql
 from latch_sdk_gql.execute import execute
 
 from latch.ldata.type import LDataNodeType
@@ -78,7 +77,7 @@ def ls(path: str, *, group_directories_first: bool = False):
     normalized_path = normalize_path(path, assume_remote=True)
 
     query = execute(
-        gql.gql("""
+        """
             query LdataInfo ($argPath: String!) {
                 accountInfoCurrent {
                     id
@@ -111,7 +110,7 @@ def ls(path: str, *, group_directories_first: bool = False):
                     }
                 }
             }
-        """),
+        """,
         {"argPath": normalized_path},
     )
 
@@ -1,7 +1,6 @@
 from textwrap import dedent
 
 import click
-import gql
 from gql.transport.exceptions import TransportQueryError
 from latch_sdk_gql.execute import execute
 
@@ -81,7 +80,7 @@ def move(
 
         try:
             execute(
-                gql.gql("""
+                """
                     mutation Move(
                         $argNode: BigInt!
                         $argDestParent: BigInt!
@@ -97,7 +96,7 @@ def move(
                             clientMutationId
                         }
                     }
-                """),
+                """,
                 {
                     "argNode": src_data.id,
                     "argDestParent": dest_data.id,
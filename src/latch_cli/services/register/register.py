@@ -10,7 +10,6 @@ from textwrap import dedent
 from typing import Iterable, List, Optional
 
 import click
-import gql
 from flytekit.core.workflow import WorkflowBase
 from scp import SCPClient
 
@@ -576,7 +575,7 @@ def register(
 
             while len(wf_infos) == 0:
                 wf_infos = l_gql.execute(
-                    gql.gql("""
+                    """
                     query workflowQuery($name: String, $ownerId: BigInt, $version: String) {
                         workflowInfos(condition: { name: $name, ownerId: $ownerId, version: $version}) {
                             nodes {
@@ -584,7 +583,7 @@ def register(
                             }
                         }
                     }
-                    """),
+                    """,
                     {
                         "name": wf_name,
                         "version": ctx.version,
@@ -624,13 +623,13 @@ def register(
 
                 if mark_as_release:
                     l_gql.execute(
-                        gql.gql("""
+                        """
                         mutation MarkWorkflowAsRelease($id: BigInt!) {
                             updateWorkflowInfo(input: {patch: {isRelease: true}, id: $id}) {
                                 clientMutationId
                             }
                         }
-                        """),
+                        """,
                         {
                             "id": wf_id,
                         },
@@ -1,5 +1,4 @@
 import click
-import gql
 from latch_sdk_gql.execute import execute
 
 from latch.ldata._transfer.node import get_node_data as _get_node_data
@@ -64,13 +63,13 @@ def rmr(
 
     for path in to_remove:
         execute(
-            gql.gql("""
+            """
                 mutation LatchCLIRmr($argNodeId: BigInt!) {
                     ldataRmr(input: {argNodeId: $argNodeId}) {
                         clientMutationId
                     }
                 }
-            """),
+            """,
             {"argNodeId": node_data[path].id},
         )
         if verbose:
@@ -1,39 +1,56 @@
+import asyncio
 import os
+import shutil
 import stat
 import sys
-from concurrent.futures import ProcessPoolExecutor
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from queue import Empty, Queue
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import click
 import dateutil.parser as dp
-import gql
-from gql.transport.exceptions import TransportQueryError
-from latch_sdk_gql.execute import JsonValue, execute
+import graphql.language as l
+import watchfiles
+from latch_sdk_gql.execute import close_async_session, execute, execute_async
+from latch_sdk_gql.utils import _json_value, _name_node, _parse_selection
 
+import latch.ldata._transfer.checksum as _ck
+import latch.ldata._transfer.download as _dl
 import latch.ldata._transfer.upload as _upl
-from latch.ldata._transfer.utils import get_max_workers
+from latch.ldata._transfer.concurrency import controller_args
+from latch.ldata._transfer.node import (
+    NodeData,
+    get_node_data,
+    node_data_batch_size,
+    node_data_max_concurrent_batches,
+    remove_nodes,
+)
+from latch.ldata._transfer.partial import partial_path, sidecar_path
+from latch.ldata._transfer.progress import Progress
+from latch.ldata._transfer.utils import query_with_retry
+from latch.ldata.type import LDataNodeType
+from latch_cli.utils import human_readable_time, with_si_suffix
 from latch_cli.utils.path import is_remote_path, normalize_path
 
+# number of aliased removal mutations sent at once by `--delete`
+max_concurrent_removals = 4
 
-def upload_file(src: Path, dest: str):
-    start = _upl.start_upload(src, dest)
-    if start is None:
-        return
+# `--watch` only uploads a file once it has gone this many seconds without
+# changing, so that files which are still being written are skipped
+watch_settle_time = 5
+watch_debounce_ms = 500
 
-    parts: List[_upl.CompletedPart] = []
-    for idx, url in enumerate(start.urls):
-        parts.append(
-            _upl.upload_file_chunk(
-                src,
-                url,
-                idx,
-                start.part_size,
-            )
-        )
-
-    _upl.end_upload(dest, start.upload_id, parts)
+_dir_types = {
+    LDataNodeType.account_root,
+    LDataNodeType.dir,
+    LDataNodeType.mount,
+    LDataNodeType.mount_gcp,
+    LDataNodeType.mount_azure,
+}
 
 
 def check_src(p: Path, *, indent: str = "") -> Optional[Tuple[Path, os.stat_result]]:
@@ -50,173 +67,419 @@ def check_src(p: Path, *, indent: str = "") -> Optional[Tuple[Path, os.stat_resu
     return (p, p_stat)
 
 
-def sync_rec(
-    srcs: Dict[str, Tuple[Path, os.stat_result]],
-    dest: str,
-    *,
-    delete: bool,
-    level: int = 0,
-    executor: ProcessPoolExecutor,
-):
-    # rsync never deletes from the top level destination
-    delete_effective = delete and level > 0
+@dataclass(frozen=True)
+class LocalEntry:
+    src: Path
+    stat: os.stat_result
+    dest: str
+    level: int
+
+
+@dataclass(frozen=True)
+class RemoteNode:
+    id: str
+    type: str
+    ingress_time: Optional[datetime]
+    version_id: Optional[str] = None
+
+
+def join_remote(parent: str, name: str) -> str:
+    if parent[-1] == "/":
+        return f"{parent}{name}"
+
+    return f"{parent}/{name}"
+
+
+def scan_srcs(
+    srcs: Dict[str, Tuple[Path, os.stat_result]], dest: str, *, level: int = 0
+) -> List[LocalEntry]:
+    """Every file and directory in `srcs`, in pre-order."""
     indent = "  " * level
 
+    res: List[LocalEntry] = []
+    for name, (p, p_stat) in srcs.items():
+        child_dest = join_remote(dest, name)
+        res.append(LocalEntry(p, p_stat, child_dest, level))
+
+        if not stat.S_ISDIR(p_stat.st_mode):
+            continue
+
+        sub_srcs: Dict[str, Tuple[Path, os.stat_result]] = {}
+        for x in p.iterdir():
+            x_res = check_src(x, indent=indent + "  ")
+            if x_res is None:
+                # todo(maximsmol): pre-check or confirm?
+                continue
+
+            sub_srcs[x.name] = x_res
+
+        res.extend(scan_srcs(sub_srcs, child_dest, level=level + 1))
+
+    return res
+
+
+def _aliased_document(name: str, selection: str, paths: List[str]) -> l.DocumentNode:
+    """Query `name` with one copy of `selection` per path, aliased `q0`, `q1`, ...
+
+    `selection` must be an `ldataResolvePathData` field, whose `argPath` is set
+    to each path in turn.
+    """
+    sels: List[l.FieldNode] = []
+    for j, path in enumerate(paths):
+        sel = _parse_selection(selection)
+        assert isinstance(sel, l.FieldNode)
+
+        args = l.ArgumentNode()
+        args.name = _name_node("argPath")
+        args.value = _json_value(path)
+
+        sel.alias = _name_node(f"q{j}")
+        sel.arguments = (args,)
+
+        sels.append(sel)
+
+    sel_set = l.SelectionSetNode()
+    sel_set.selections = tuple(sels)
+
+    doc = l.parse(f"""
+        query {name} {{
+            placeholder
+        }}
+    """)
+
+    assert len(doc.definitions) == 1
+    query = doc.definitions[0]
+
+    assert isinstance(query, l.OperationDefinitionNode)
+    query.selection_set = sel_set
+
+    return doc
+
+
+def _query_batches(docs: List[l.DocumentNode]) -> List[Dict[str, Any]]:
+    """Send every query in `docs`, up to `node_data_max_concurrent_batches` at
+    once unless this is called from a running event loop."""
     try:
-        query = """
-            query LatchCLISync($argPath: String! ${name_filter_arg}) {
-                ldataResolvePathData(argPath: $argPath) {
+        asyncio.get_running_loop()
+        in_event_loop = True
+    except RuntimeError:
+        in_event_loop = False
+
+    if len(docs) <= 1 or in_event_loop:
+        return [query_with_retry(doc) for doc in docs]
+
+    return asyncio.run(_query_batches_async(docs))
+
+
+async def _query_batches_async(docs: List[l.DocumentNode]) -> List[Dict[str, Any]]:
+    sema = asyncio.Semaphore(node_data_max_concurrent_batches)
+
+    async def run(doc: l.DocumentNode) -> Dict[str, Any]:
+        async with sema:
+            return await execute_async(doc)
+
+    try:
+        return await asyncio.gather(*(run(doc) for doc in docs))
+    finally:
+        await close_async_session()
+
+
+def get_remote_nodes(paths: List[str]) -> Dict[str, RemoteNode]:
+    """Resolve `paths` in bulk, `node_data_batch_size` at a time with one aliased
+    query per batch. Batches are sent concurrently (see `_query_batches`).
+
+    Paths which do not exist (or are still pending) are omitted.
+    """
+    batches = [
+        paths[i : i + node_data_batch_size]
+        for i in range(0, len(paths), node_data_batch_size)
+    ]
+    docs = [
+        _aliased_document(
+            "LatchCLISyncResolve",
+            """
+                ldataResolvePathData(argPath: {}) {
                     finalLinkTarget {
+                        id
                         type
+                        pending
+                        removed
+                        ldataObjectMeta {
+                            versionId
+                        }
+                        ldataNodeEvents(
+                            condition: {type: INGRESS},
+                            orderBy: TIME_DESC,
+                            first: 1
+                        ) {
+                            nodes {
+                                time
+                            }
+                        }
+                    }
+                }
+            """,
+            batch,
+        )
+        for batch in batches
+    ]
+
+    ret: Dict[str, RemoteNode] = {}
+    for batch, res in zip(batches, _query_batches(docs)):
+        for j, path in enumerate(batch):
+            data = res[f"q{j}"]
+            if data is None:
+                continue
+
+            flt = data["finalLinkTarget"]
+            if flt is None or flt["pending"] or flt["removed"]:
+                continue
+
+            ingress_time = None
+            if len(flt["ldataNodeEvents"]["nodes"]) > 0:
+                ingress_time = dp.isoparse(flt["ldataNodeEvents"]["nodes"][0]["time"])
+
+            version_id = None
+            if flt["ldataObjectMeta"] is not None:
+                version_id = flt["ldataObjectMeta"]["versionId"]
+
+            ret[path] = RemoteNode(flt["id"], flt["type"], ingress_time, version_id)
+
+    return ret
+
+
+def get_remote_children(paths: List[str]) -> Dict[str, List[str]]:
+    """Names of the children of each remote directory in `paths`, files and
+    directories alike.
+
+    Fetched `node_data_batch_size` directories at a time with one aliased query
+    per batch, sent concurrently (see `_query_batches`). Directories which do
+    not exist are omitted.
+    """
+    batches = [
+        paths[i : i + node_data_batch_size]
+        for i in range(0, len(paths), node_data_batch_size)
+    ]
+    docs = [
+        _aliased_document(
+            "LatchCLISyncChildren",
+            """
+                ldataResolvePathData(argPath: {}) {
+                    finalLinkTarget {
                         childLdataTreeEdges(
                             filter: {
                                 child: {
                                     removed: {equalTo: false},
                                     pending: {equalTo: false},
                                     copiedFrom: {isNull: true}
-                                    ${name_filter}
                                 }
                             }
                         ) {
                             nodes {
                                 child {
-                                    id
                                     name
-                                    finalLinkTarget {
-                                        type
-                                        ldataNodeEvents(
-                                            condition: {type: INGRESS},
-                                            orderBy: TIME_DESC,
-                                            first: 1
-                                        ) {
-                                            nodes {
-                                                time
-                                            }
-                                        }
-                                    }
                                 }
                             }
                         }
                     }
                 }
-            }
-        """
-
-        args: JsonValue = {"argPath": dest, "nameFilter": []}
-        if not delete_effective:
-            query = query.replace("${name_filter_arg}", ", $nameFilter: [String!]")
-            query = query.replace("${name_filter}", ", name: {in: $nameFilter}")
-            args["nameFilter"] = list(srcs.keys())
-        else:
-            query = query.replace("${name_filter_arg}", "")
-            query = query.replace("${name_filter}", "")
+            """,
+            batch,
+        )
+        for batch in batches
+    ]
 
-        resolve_data = execute(
-            gql.gql(query),
-            args,
-        )["ldataResolvePathData"]
+    ret: Dict[str, List[str]] = {}
+    for batch, res in zip(batches, _query_batches(docs)):
+        for j, path in enumerate(batch):
+            data = res[f"q{j}"]
+            if data is None:
+                continue
 
-        dest_data = None
-        if resolve_data is not None:
-            dest_data = resolve_data["finalLinkTarget"]
-    except TransportQueryError as e:
-        if e.errors is None or len(e.errors) == 0:
-            raise
+            flt = data["finalLinkTarget"]
+            if flt is None:
+                continue
 
-        msg: str = e.errors[0]["message"]
+            ret[path] = [
+                x["child"]["name"]
+                for x in flt["childLdataTreeEdges"]["nodes"]
+                if x["child"] is not None
+            ]
 
-        raise
+    return ret
 
-    if len(srcs) == 0:
-        if dest_data is not None:
-            if dest_data["type"] != "DIR":
-                click.secho(
-                    indent + f"`{dest}` is in the way of a directory",
-                    fg="red",
-                )
-                return
 
-            click.secho(indent + "Empty directory", dim=True)
-            return
+def get_extraneous(entries: List[LocalEntry], delete_roots: List[str]) -> List[str]:
+    """Remote paths below `delete_roots` with no local counterpart, files and
+    (possibly empty) directories alike.
 
-        if not dest[-1] == "/":
-            dest += "/"
+    Only the top-most path of each extraneous subtree is returned. Every such
+    path is a child of a directory which exists locally, so only the children
+    of local directories are listed.
+    """
+    local_paths = {x.dest for x in entries}
 
-        click.secho(indent + "Creating empty directory", fg="bright_blue")
-        execute(
-            gql.gql("""
-                mutation LatchCLISyncMkdir($argPath: String!) {
-                    ldataMkdirp(input: {argPath: $argPath}) {
-                        clientMutationId
-                    }
-                }
-            """),
-            {"argPath": dest},
-        )
-        return
+    local_dirs = [
+        x.dest
+        for x in entries
+        if stat.S_ISDIR(x.stat.st_mode)
+        and any(x.dest == root or x.dest.startswith(root + "/") for root in delete_roots)
+    ]
+
+    res: List[str] = []
+    for parent, names in get_remote_children(local_dirs).items():
+        for name in names:
+            path = join_remote(parent, name)
+            if path not in local_paths:
+                res.append(path)
+
+    return sorted(res)
+
+
+def get_matching_files(
+    entries: List[LocalEntry],
+    remote: Dict[str, RemoteNode],
+    *,
+    cores: Optional[int] = None,
+) -> Set[Path]:
+    """Local files in `entries` whose content matches their existing remote copy.
+
+    Remote checksums are read from presigned URLs, fetched once per top-level
+    source, unless already cached for the remote version.
+    """
+    jobs: List[_ck.ChecksumJob] = []
+    for top in entries:
+        if top.level != 0:
+            continue
+
+        candidates = [
+            x
+            for x in entries
+            if (x.dest == top.dest or x.dest.startswith(top.dest + "/"))
+            and stat.S_ISREG(x.stat.st_mode)
+            and x.dest in remote
+            and remote[x.dest].type == "OBJ"
+        ]
+        if len(candidates) == 0:
+            continue
+
+        if not stat.S_ISDIR(top.stat.st_mode):
+            url: str = _dl.get_signed_urls(top.dest, top.dest, recursive=False)[
+                "data"
+            ]["url"]
+            node = remote[top.dest]
+            jobs.append(_ck.ChecksumJob(top.src, url, node.id, node.version_id))
+            continue
+
+        urls: Dict[str, str] = _dl.get_signed_urls(
+            top.dest, top.dest, recursive=True
+        )["data"]["urls"]
+        for x in candidates:
+            url = urls.get(x.dest[len(top.dest) + 1 :])
+            if url is not None:
+                node = remote[x.dest]
+                jobs.append(_ck.ChecksumJob(x.src, url, node.id, node.version_id))
+
+    return _ck.matching_files(jobs, cores=cores)
 
-    if (
-        (len(srcs) > 1 or stat.S_ISDIR(list(srcs.values())[0][1].st_mode))
-        and dest_data is not None
-        and dest_data["type"] not in {"DIR", "ACCOUNT_ROOT"}
-    ):
-        click.secho(f"`{dest}` is not a directory", fg="red", bold=True)
-        click.secho("\nOnly a single file can be synced with a file", fg="red")
-        sys.exit(1)
 
-    if dest_data is not None and dest_data["type"] not in {"DIR", "ACCOUNT_ROOT"}:
+def sync_local_to_remote(
+    srcs: Dict[str, Tuple[Path, os.stat_result]],
+    dest: str,
+    *,
+    delete: bool,
+    checksum: bool = False,
+    cores: Optional[int] = None,
+) -> List[_upl.UploadJob]:
+    """Sync `srcs` into the remote directory `dest`.
+
+    The local trees are scanned once and the remote side is fetched in bulk
+    (resolving every local path, plus listing every remote file below each
+    synced directory if `delete` is set), so the number of requests does not
+    grow with the number of directories.
+
+    If `checksum` is set, existing files are compared by content instead of by
+    modification time.
+
+    Returns the files which need to be uploaded.
+    """
+    entries = scan_srcs(srcs, dest)
+
+    # rsync never deletes from the top level destination
+    delete_roots = (
+        [x.dest for x in entries if x.level == 0 and stat.S_ISDIR(x.stat.st_mode)]
+        if delete
+        else []
+    )
+    extraneous = get_extraneous(entries, delete_roots)
+
+    remote = get_remote_nodes([dest, *(x.dest for x in entries), *extraneous])
+
+    dest_data = remote.get(dest)
+    if dest_data is not None and dest_data.type not in {"DIR", "ACCOUNT_ROOT"}:
+        if len(srcs) > 1 or stat.S_ISDIR(list(srcs.values())[0][1].st_mode):
+            click.secho(f"`{dest}` is not a directory", fg="red", bold=True)
+            click.secho("\nOnly a single file can be synced with a file", fg="red")
+            sys.exit(1)
+
         # todo(maximsmol): implement
         click.secho(
             "Syncing single files is currently not supported", bold=True, fg="red"
         )
         sys.exit(1)
 
-    dest_children_by_name = (
-        {
-            x["name"]: x
-            for x in (raw["child"] for raw in dest_data["childLdataTreeEdges"]["nodes"] if raw["child"])
-        }
-        if dest_data is not None
-        else {}
-    )
+    matching: Set[Path] = set()
+    if checksum:
+        matching = get_matching_files(entries, remote, cores=cores)
 
-    for name, (p, p_stat) in srcs.items():
-        is_dir = stat.S_ISDIR(p_stat.st_mode)
+    num_children: Dict[str, int] = {}
+    for x in entries:
+        parent = x.dest.rsplit("/", 1)[0]
+        num_children[parent] = num_children.get(parent, 0) + 1
 
-        child = dest_children_by_name.get(name)
+    jobs: List[_upl.UploadJob] = []
+    skipped_dirs: Set[str] = set()
+    for x in entries:
+        p = x.src
+        is_dir = stat.S_ISDIR(x.stat.st_mode)
+        indent = "  " * x.level
 
-        if dest[-1] == "/":
-            child_dest = f"{dest}{name}"
-        else:
-            child_dest = f"{dest}/{name}"
+        if x.dest.rsplit("/", 1)[0] in skipped_dirs:
+            if is_dir:
+                skipped_dirs.add(x.dest)
+            continue
+
+        child = remote.get(x.dest)
 
         skip = False
         verb = "Uploading"
         reason = "new"
         if child is not None:
-            flt = child["finalLinkTarget"]
-            if flt["type"] == "DIR" and not is_dir:
+            if child.type == "DIR" and not is_dir:
                 # todo(maximsmol): confirm? pre-check?
-                click.secho(
-                    indent + f"`{dest}` is in the way of a file",
-                    fg="red",
-                )
+                click.secho(indent + f"`{x.dest}` is in the way of a file", fg="red")
                 continue
 
-            if flt["type"] != "DIR" and is_dir:
+            if child.type != "DIR" and is_dir:
                 # todo(maximsmol): confirm? pre-check?
                 click.secho(
-                    indent + f"`{dest}` is in the way of a directory",
-                    fg="red",
+                    indent + f"`{x.dest}` is in the way of a directory", fg="red"
                 )
+                skipped_dirs.add(x.dest)
                 continue
 
-            if flt["type"] == "OBJ":
-                remote_mtime = None
-                if len(flt["ldataNodeEvents"]["nodes"]) > 0:
-                    remote_mtime = dp.isoparse(flt["ldataNodeEvents"]["nodes"][0]["time"])
+            if child.type == "OBJ" and checksum:
+                if p in matching:
+                    verb = "Skipping"
+                    reason = "unmodified"
+                    skip = True
+                else:
+                    verb = "Uploading"
+                    reason = "updated"
+            elif child.type == "OBJ":
+                remote_mtime = child.ingress_time
 
-                local_mtime = datetime.fromtimestamp(p_stat.st_mtime).astimezone()
+                local_mtime = datetime.fromtimestamp(x.stat.st_mtime).astimezone()
                 if remote_mtime is not None and remote_mtime == local_mtime:
                     verb = "Skipping"
                     reason = "unmodified"
@@ -260,46 +523,530 @@ def sync_rec(
             + click.style(
                 str(p)
                 + ("" if not is_dir else "/")
-                + ("" if skip else click.style(" -> ", dim=True) + child_dest),
+                + ("" if skip else click.style(" -> ", dim=True) + x.dest),
                 dim=dim,
             )
         )
         if skip:
             continue
 
-        if is_dir:
-            sub_srcs: Dict[str, Tuple[Path, os.stat_result]] = {}
-            for x in p.iterdir():
-                res = check_src(x, indent=indent + "  ")
-                if res is None:
-                    # todo(maximsmol): pre-check or confirm?
-                    continue
+        if not is_dir:
+            jobs.append(_upl.UploadJob(p, x.dest))
+            continue
+
+        if num_children.get(x.dest, 0) > 0:
+            continue
 
-                sub_srcs[x.name] = res
-            sync_rec(sub_srcs, child_dest, delete=delete, level=level + 1, executor=executor)
+        if child is not None:
+            click.secho(indent + "  Empty directory", dim=True)
             continue
 
-        executor.submit(upload_file, p, child_dest)
+        click.secho(indent + "  Creating empty directory", fg="bright_blue")
+        execute(
+            """
+                mutation LatchCLISyncMkdir($argPath: String!) {
+                    ldataMkdirp(input: {argPath: $argPath}) {
+                        clientMutationId
+                    }
+                }
+            """,
+            {"argPath": join_remote(x.dest, "")},
+        )
+
+    extraneous_ids: List[str] = []
+    for path in extraneous:
+        node = remote.get(path)
+        if node is None:
+            continue
+
+        click.echo(click.style("Removing extraneous: ", fg="yellow") + path)
+        extraneous_ids.append(node.id)
+
+    remove_nodes(extraneous_ids, max_concurrent_batches=max_concurrent_removals)
+
+    return jobs
+
+
+def confirm_skipped_srcs(*, ignore_unsyncable: bool):
+    click.secho("\nSome source paths will be skipped due to errors", fg="red")
+
+    if not ignore_unsyncable:
+        if not click.confirm(click.style(f"Proceed?", fg="red")):
+            sys.exit(1)
+    else:
+        click.secho(
+            "Proceeding due to " + click.style("`--ignore-unsyncable`", bold=True),
+            fg="yellow",
+        )
+    click.echo()
+
+
+def check_download(
+    job: _dl.DownloadJob, *, content_matches: Optional[bool] = None
+) -> Tuple[bool, str]:
+    """Decide whether `job` needs to run, mirroring the checks made when uploading.
+
+    If `content_matches` is given (`--checksum`), it decides whether an
+    existing file is up to date instead of the version and modification time.
+
+    Returns whether to skip the file and why.
+    """
+    try:
+        local_stat = os.stat(job.dest)
+    except FileNotFoundError:
+        return False, "new"
+
+    if content_matches is not None:
+        if content_matches:
+            return True, "unmodified"
+        return False, "updated"
+
+    if _dl.is_unchanged(job):
+        return True, "unmodified"
+
+    if job.modify_time is None:
+        return False, "updated"
+
+    # files downloaded by sync take on the remote modification time
+    local_mtime = int(local_stat.st_mtime)
+    remote_mtime = int(job.modify_time.timestamp())
+    if local_mtime == remote_mtime and local_stat.st_size == job.size:
+        return True, "unmodified"
+    if local_mtime > remote_mtime:
+        return True, "older"
 
-    if delete_effective:
-        for name, child in dest_children_by_name.items():
-            child_dest = f"{dest}/{name}"
-            if name in srcs:
+    return False, "updated"
+
+
+def delete_extraneous(root: Path, keep: Set[Path]):
+    """Remove everything under `root` that is neither in `keep` nor a parent of
+    something in `keep`."""
+    keep_dirs = {parent for p in keep for parent in p.parents}
+
+    for dir_path, dir_names, file_names in os.walk(root):
+        cur = Path(dir_path)
+
+        for name in file_names:
+            p = cur / name
+            if p in keep:
+                continue
+
+            click.echo(click.style("Removing extraneous: ", fg="yellow") + str(p))
+            p.unlink()
+
+        kept_dir_names: List[str] = []
+        for name in dir_names:
+            p = cur / name
+            if p in keep_dirs:
+                kept_dir_names.append(name)
+                continue
+
+            click.echo(click.style("Removing extraneous: ", fg="yellow") + f"{p}/")
+            if p.is_symlink():
+                p.unlink()
+            else:
+                shutil.rmtree(p)
+
+        # only descend into directories which were kept
+        dir_names[:] = kept_dir_names
+
+
+def sync_remote_to_local(
+    srcs_raw: List[str],
+    dest: Path,
+    *,
+    delete: bool,
+    ignore_unsyncable: bool,
+    cores: Optional[int] = None,
+    checksum: bool = False,
+):
+    have_errors = False
+
+    remote_srcs: List[str] = []
+    for x in srcs_raw:
+        if not is_remote_path(x):
+            click.secho(
+                f"`{x}`: local -> local sync is not supported", fg="red", bold=True
+            )
+            have_errors = True
+            continue
+
+        remote_srcs.append(x)
+
+    srcs: Dict[str, Tuple[str, NodeData]] = {}
+    if len(remote_srcs) > 0:
+        node_data = get_node_data(*remote_srcs, allow_resolve_to_parent=True).data
+        for x in remote_srcs:
+            data = node_data[x]
+            if not data.exists():
+                click.secho(f"`{x}`: no such file or directory", fg="red", bold=True)
+                have_errors = True
                 continue
 
+            srcs[data.name] = (x, data)
+
+    if len(srcs) == 0:
+        click.secho(
+            "\nAll source paths were skipped due to errors", fg="red", bold=True
+        )
+        raise click.exceptions.Exit(1)
+
+    if have_errors:
+        confirm_skipped_srcs(ignore_unsyncable=ignore_unsyncable)
+
+    try:
+        dest.mkdir(exist_ok=True)
+    except FileNotFoundError:
+        click.secho(f"`{dest}`: parent directory does not exist", fg="red", bold=True)
+        raise click.exceptions.Exit(1)
+    except FileExistsError:
+        pass
+
+    if not dest.is_dir():
+        click.secho(f"`{dest}` is not a directory", fg="red", bold=True)
+        raise click.exceptions.Exit(1)
+
+    jobs: List[_dl.DownloadJob] = []
+    for name, (src, data) in srcs.items():
+        child_dest = dest / name
+        normalized = normalize_path(src)
+
+        src_jobs: List[Tuple[str, _dl.DownloadJob]]
+        if data.type in _dir_types:
+            if child_dest.exists() and not child_dest.is_dir():
+                click.secho(f"`{child_dest}` is in the way of a directory", fg="red")
+                continue
+
+            urls: Dict[str, str] = _dl.get_signed_urls(
+                src, normalized, recursive=True
+            )["data"]["urls"]
+            src_jobs = _dl.get_download_jobs(
+                normalized, urls, child_dest, preserve_modify_time=True
+            )
+
+            if delete and child_dest.exists():
+                keep: Set[Path] = set()
+                for _, job in src_jobs:
+                    # keep partial downloads around so they can be resumed
+                    keep.update([job.dest, partial_path(job.dest), sidecar_path(job.dest)])
+
+                delete_extraneous(child_dest, keep)
+        else:
+            url: str = _dl.get_signed_urls(src, normalized, recursive=False)[
+                "data"
+            ]["url"]
+            src_jobs = [
+                (
+                    normalized,
+                    _dl.DownloadJob(
+                        url,
+                        child_dest,
+                        version_id=data.version_id,
+                        size=data.size,
+                        modify_time=data.modify_time,
+                        node_id=data.id,
+                    ),
+                )
+            ]
+
+        matching: Optional[Set[Path]] = None
+        if checksum:
+            matching = _ck.matching_files(
+                [
+                    _ck.ChecksumJob(
+                        job.dest, job.signed_url, job.node_id, job.version_id
+                    )
+                    for _, job in src_jobs
+                    if job.dest.is_file()
+                ],
+                cores=cores,
+            )
+
+        for remote_path, job in sorted(src_jobs, key=lambda x: x[0]):
+            if job.dest.is_dir():
+                click.secho(f"`{job.dest}` is in the way of a file", fg="red")
+                continue
+
+            skip, reason = check_download(
+                job,
+                content_matches=None if matching is None else job.dest in matching,
+            )
+
+            verb = "Skipping" if skip else "Downloading"
+            fg = None if skip else "bright_blue"
+            dim = True if skip else None
+
             click.echo(
-                indent + click.style("Removing extraneous: ", fg="yellow") + child_dest
+                click.style(verb + " ", fg=fg, dim=dim)
+                + click.style(reason, underline=True, fg=fg, dim=dim)
+                + click.style(": ", fg=fg, dim=dim)
+                + click.style(
+                    remote_path
+                    + ("" if skip else click.style(" -> ", dim=True) + str(job.dest)),
+                    dim=dim,
+                )
             )
-            execute(
-                gql.gql("""
-                    mutation LatchCLISyncRemove($argNodeId: BigInt!) {
-                        ldataRmr(input: {argNodeId: $argNodeId}) {
-                            clientMutationId
+            if skip:
+                continue
+
+            try:
+                job.dest.parent.mkdir(parents=True, exist_ok=True)
+            except (FileExistsError, NotADirectoryError):
+                click.secho(
+                    f"`{job.dest.parent}` is in the way of a directory", fg="red"
+                )
+                continue
+
+            jobs.append(job)
+
+    if len(jobs) == 0:
+        return
+
+    click.echo()
+    res = _dl.download_jobs(
+        jobs, progress=Progress.total, verbose=False, cores=cores
+    )
+    click.secho(
+        f"Downloaded {res.num_files} files ({with_si_suffix(res.total_bytes)}) in"
+        f" {human_readable_time(res.total_time)}",
+        fg="green",
+    )
+
+
+def upload_and_print(
+    jobs: List[_upl.UploadJob],
+    *,
+    cores: Optional[int] = None,
+    pool: Optional[_upl.UploadPool] = None,
+):
+    if len(jobs) == 0:
+        return
+
+    stats = _upl.WalkStats(len(jobs), sum(job.src.stat().st_size for job in jobs))
+
+    click.echo()
+    res = _upl.upload_jobs(
+        iter(jobs),
+        stats,
+        num_bars=0,
+        show_total_progress=True,
+        verbose=False,
+        concurrency_args=controller_args(cores),
+        ingress_source=_upl.get_ingress_source(),
+        pool=pool,
+    )
+    click.secho(
+        f"Uploaded {res.num_files} files ({with_si_suffix(res.total_bytes)}) in"
+        f" {human_readable_time(res.total_time)}",
+        fg="green",
+    )
+
+
+def start_watcher(
+    paths: List[Path], stop: threading.Event
+) -> Tuple["Queue[Set[Tuple[watchfiles.Change, str]]]", threading.Thread]:
+    """Watch `paths` from a background thread, queueing every batch of changes
+    until `stop` is set.
+
+    Watching starts before this returns, so changes made while the initial sync
+    runs are not missed.
+    """
+    q: "Queue[Set[Tuple[watchfiles.Change, str]]]" = Queue()
+    started = threading.Event()
+
+    def run():
+        watcher = watchfiles.watch(
+            *paths,
+            # only editor/vcs noise is filtered by default, which could still
+            # be real data here
+            watch_filter=None,
+            debounce=watch_debounce_ms,
+            rust_timeout=watch_debounce_ms,
+            yield_on_timeout=True,
+            stop_event=stop,
+            raise_interrupt=False,
+        )
+
+        started.set()
+        for changes in watcher:
+            if len(changes) > 0:
+                q.put(changes)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    return q, thread
+
+
+def get_watched_dest(
+    roots: Dict[str, Path], dest: str, path: Path
+) -> Optional[Tuple[str, bool]]:
+    """The remote path `path` syncs to, and whether it is inside a synced
+    directory (as opposed to being a top-level source)."""
+    for name, root in roots.items():
+        if path == root:
+            return join_remote(dest, name), False
+
+        try:
+            rel = path.relative_to(root)
+        except ValueError:
+            continue
+
+        return join_remote(join_remote(dest, name), rel.as_posix()), True
+
+    return None
+
+
+def watch_local_to_remote(
+    srcs: Dict[str, Tuple[Path, os.stat_result]],
+    changes: "Queue[Set[Tuple[watchfiles.Change, str]]]",
+    dest: str,
+    *,
+    delete: bool,
+    pool: _upl.UploadPool,
+):
+    """Continuously upload the files in `srcs` which change, as reported by
+    `changes`, on `pool`.
+
+    A file is only uploaded once it has gone `watch_settle_time` seconds without
+    changing, so files which are still being written are not uploaded half-way.
+    Nothing is rescanned - the work done is proportional to the number of
+    changed paths.
+    """
+    roots = {name: p.resolve() for name, (p, _) in srcs.items()}
+
+    # path -> (time of the last change, (size, mtime) at that time)
+    pending: Dict[Path, Tuple[float, Optional[Tuple[int, int]]]] = {}
+
+    def signature(p: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+
+        return st.st_size, st.st_mtime_ns
+
+    click.secho("\nWatching for changes (press Ctrl+C to stop)...", dim=True)
+
+    while True:
+        try:
+            batch = changes.get(timeout=watch_settle_time)
+        except Empty:
+            batch = set()
+
+        now = time.monotonic()
+        for _, raw in batch:
+            p = Path(raw)
+            pending[p] = (now, signature(p))
+
+        ready: List[Path] = []
+        for p, (last_change, sig) in list(pending.items()):
+            if now - last_change < watch_settle_time:
+                continue
+
+            cur = signature(p)
+            if cur != sig:
+                # still being written
+                pending[p] = (now, cur)
+                continue
+
+            del pending[p]
+            ready.append(p)
+
+        if len(ready) == 0:
+            continue
+
+        jobs: Dict[Path, _upl.UploadJob] = {}
+        removed: List[str] = []
+        for p in sorted(ready):
+            res = get_watched_dest(roots, dest, p)
+            if res is None:
+                continue
+
+            remote_path, in_synced_dir = res
+
+            try:
+                p_stat = os.stat(p)
+            except FileNotFoundError:
+                # rsync never deletes from the top level destination
+                if delete and in_synced_dir:
+                    removed.append(remote_path)
+                continue
+
+            if stat.S_ISREG(p_stat.st_mode):
+                click.echo(
+                    click.style("Uploading ", fg="bright_blue")
+                    + click.style("changed", underline=True, fg="bright_blue")
+                    + click.style(": ", fg="bright_blue")
+                    + str(p)
+                    + click.style(" -> ", dim=True)
+                    + remote_path
+                )
+                jobs[p] = _upl.UploadJob(p, remote_path)
+                continue
+
+            if not stat.S_ISDIR(p_stat.st_mode):
+                continue
+
+            # directories moved into place only produce an event for themselves
+            is_empty = True
+            for job in _upl.walk_jobs(p, remote_path):
+                is_empty = False
+                if job.src in jobs:
+                    continue
+
+                click.echo(
+                    click.style("Uploading ", fg="bright_blue")
+                    + click.style("new", underline=True, fg="bright_blue")
+                    + click.style(": ", fg="bright_blue")
+                    + str(job.src)
+                    + click.style(" -> ", dim=True)
+                    + job.dest
+                )
+                jobs[job.src] = job
+
+            if is_empty and len(list(p.iterdir())) == 0:
+                click.secho(f"Creating empty directory: {remote_path}", fg="bright_blue")
+                execute(
+                    """
+                        mutation LatchCLISyncMkdir($argPath: String!) {
+                            ldataMkdirp(input: {argPath: $argPath}) {
+                                clientMutationId
+                            }
                         }
-                    }
-                """),
-                {"argNodeId": child["id"]},
+                    """,
+                    {"argPath": join_remote(remote_path, "")},
+                )
+
+        # removing a directory removes everything below it
+        removed_set = set(removed)
+        removed = [
+            x
+            for x in removed
+            if not any(
+                parent in removed_set
+                for parent in (x[:i] for i, c in enumerate(x) if c == "/")
             )
+        ]
+
+        if len(removed) > 0:
+            remote = get_remote_nodes(removed)
+
+            removed_ids: List[str] = []
+            for remote_path in removed:
+                node = remote.get(remote_path)
+                if node is None:
+                    continue
+
+                click.echo(
+                    click.style("Removing extraneous: ", fg="yellow") + remote_path
+                )
+                removed_ids.append(node.id)
+
+            remove_nodes(removed_ids, max_concurrent_batches=max_concurrent_removals)
+
+        upload_and_print(list(jobs.values()), pool=pool)
 
 
 def sync(
@@ -309,19 +1056,34 @@ def sync(
     delete: bool,
     ignore_unsyncable: bool,
     cores: Optional[int] = None,
+    checksum: bool = False,
+    watch: bool = False,
 ):
     if not is_remote_path(dest):
-        click.secho(
-            f"`{dest}`: only local -> remote sync is supported", fg="red", bold=True
+        if watch:
+            click.secho(
+                "`--watch` is only supported when syncing to Latch Data",
+                fg="red",
+                bold=True,
+            )
+            raise click.exceptions.Exit(1)
+
+        sync_remote_to_local(
+            srcs_raw,
+            Path(dest),
+            delete=delete,
+            ignore_unsyncable=ignore_unsyncable,
+            cores=cores,
+            checksum=checksum,
         )
-        raise click.exceptions.Exit(1)
+        return
 
     srcs: Dict[str, Tuple[Path, os.stat_result]] = {}
     have_errors = False
     for x in srcs_raw:
         if is_remote_path(x):
             click.secho(
-                f"`{x}`: only local -> remote sync is supported", fg="red", bold=True
+                f"`{x}`: remote -> remote sync is not supported", fg="red", bold=True
             )
             have_errors = True
             continue
@@ -342,21 +1104,31 @@ def sync(
 
     if have_errors:
         # todo(maximsmol): do we want to precheck recursively?
-        click.secho("\nSome source paths will be skipped due to errors", fg="red")
+        confirm_skipped_srcs(ignore_unsyncable=ignore_unsyncable)
 
-        if not ignore_unsyncable:
-            if not click.confirm(click.style(f"Proceed?", fg="red")):
-                sys.exit(1)
-        else:
-            click.secho(
-                "Proceeding due to " + click.style("`--ignore-unsyncable`", bold=True),
-                fg="yellow",
-            )
-        click.echo()
+    normalized = normalize_path(dest)
 
-    if cores is None:
-        cores = get_max_workers()
+    if not watch:
+        jobs = sync_local_to_remote(
+            srcs, normalized, delete=delete, checksum=checksum, cores=cores
+        )
+        upload_and_print(jobs, cores=cores)
+        return
+
+    stop = threading.Event()
+    changes, watcher = start_watcher([p.resolve() for p, _ in srcs.values()], stop)
+    try:
+        # one pool for the whole session, rather than a new one for every batch
+        # of changes
+        with _upl.UploadPool(controller_args(cores)) as pool:
+            jobs = sync_local_to_remote(
+                srcs, normalized, delete=delete, checksum=checksum, cores=cores
+            )
+            upload_and_print(jobs, pool=pool)
 
-    with ProcessPoolExecutor(max_workers=cores) as executor:
-        sync_rec(srcs, normalize_path(dest), delete=delete, executor=executor)
-        executor.shutdown(wait=True)
+            watch_local_to_remote(srcs, changes, normalized, delete=delete, pool=pool)
+    except KeyboardInterrupt:
+        click.secho("\nStopped watching", dim=True)
+    finally:
+        stop.set()
+        watcher.join()
@@ -0,0 +1,367 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import graphql.language as l
+from gql.transport.exceptions import TransportQueryError
+
+from latch_sdk_gql import JsonValue
+from latch_sdk_gql.utils import _name_node, _var_node
+
+Runner = Callable[[l.DocumentNode, Optional[Dict[str, JsonValue]]], Any]
+AsyncRunner = Callable[[l.DocumentNode, Optional[Dict[str, JsonValue]]], Awaitable[Any]]
+
+
+@dataclass
+class BatchRequest:
+    document: l.DocumentNode
+    variables: Optional[Dict[str, JsonValue]]
+    # `concurrent.futures.Future` or `asyncio.Future`
+    future: Any
+
+    def set_result(self, x: Any) -> None:
+        # the caller may have cancelled its future in the meantime
+        if not self.future.done():
+            self.future.set_result(x)
+
+    def set_exception(self, e: BaseException) -> None:
+        if not self.future.done():
+            self.future.set_exception(e)
+
+
+@dataclass
+class MergedRequest:
+    """Several queries merged into a single aliased document."""
+
+    document: l.DocumentNode
+    variables: Dict[str, JsonValue] = field(default_factory=dict)
+    # (request, {merged key: original key})
+    parts: List[Tuple[BatchRequest, Dict[str, str]]] = field(default_factory=list)
+
+    def resolve(self, data: Dict[str, Any]) -> None:
+        for req, keys in self.parts:
+            req.set_result({orig: data.get(merged) for merged, orig in keys.items()})
+
+    def resolve_partial(self, e: TransportQueryError) -> List[BatchRequest]:
+        """Resolve the requests whose fields did not cause any of the errors in
+        `e`, and return the rest."""
+        failed: Set[str] = set()
+        for err in e.errors or []:
+            path = err.get("path") if isinstance(err, dict) else None
+            if e.data is None or not path:
+                # cannot tell which request caused this
+                return [req for req, _ in self.parts]
+
+            failed.add(path[0])
+
+        res: List[BatchRequest] = []
+        for req, keys in self.parts:
+            if failed.isdisjoint(keys):
+                req.set_result({
+                    orig: e.data.get(merged) for merged, orig in keys.items()
+                })
+            else:
+                res.append(req)
+
+        return res
+
+
+class _PrefixVariables(l.Visitor):
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def enter_variable(self, node: l.VariableNode, *args: Any) -> l.VariableNode:
+        return _var_node(self.prefix + node.name.value)
+
+
+def _get_query(doc: l.DocumentNode) -> Optional[l.OperationDefinitionNode]:
+    """The operation of `doc` if it can be merged with others.
+
+    Only queries consisting of plain fields can be merged - mutations are never
+    merged since falling back to sending them one by one could apply them twice,
+    and documents with fragments or operation directives are sent as is.
+    """
+    if len(doc.definitions) != 1:
+        return None
+
+    op = doc.definitions[0]
+    if not isinstance(op, l.OperationDefinitionNode):
+        return None
+
+    if op.operation != l.OperationType.QUERY or len(op.directives or ()) > 0:
+        return None
+
+    if not all(isinstance(x, l.FieldNode) for x in op.selection_set.selections):
+        return None
+
+    return op
+
+
+def merge(
+    requests: List[BatchRequest], *, max_size: int
+) -> Tuple[List[MergedRequest], List[BatchRequest]]:
+    """Merge `requests` into documents of at most `max_size` queries each.
+
+    Every top-level field of request `i` is aliased to `b{i}_<key>` and every
+    variable is renamed to `b{i}_<name>`, so requests cannot collide.
+
+    Returns the merged documents and the requests which have to be sent alone.
+    """
+    mergeable: List[Tuple[BatchRequest, l.OperationDefinitionNode]] = []
+    alone: List[BatchRequest] = []
+    for req in requests:
+        op = _get_query(req.document)
+        if op is None:
+            alone.append(req)
+        else:
+            mergeable.append((req, op))
+
+    res: List[MergedRequest] = []
+    for start in range(0, len(mergeable), max_size):
+        chunk = mergeable[start : start + max_size]
+        if len(chunk) == 1:
+            alone.append(chunk[0][0])
+            continue
+
+        var_defs: List[l.VariableDefinitionNode] = []
+        sels: List[l.FieldNode] = []
+
+        merged = MergedRequest(l.DocumentNode())
+        for i, (req, op) in enumerate(chunk):
+            prefix = f"b{i}_"
+            # `visit` copies edited nodes, so the original (possibly shared)
+            # document is left untouched
+            op = l.visit(op, _PrefixVariables(prefix))
+
+            variables = req.variables or {}
+            for x in op.variable_definitions or ():
+                var_defs.append(x)
+
+                name = x.variable.name.value[len(prefix) :]
+                if name in variables:
+                    merged.variables[x.variable.name.value] = variables[name]
+
+            keys: Dict[str, str] = {}
+            for sel in op.selection_set.selections:
+                assert isinstance(sel, l.FieldNode)
+
+                key = sel.alias.value if sel.alias is not None else sel.name.value
+
+                sel = l.FieldNode(
+                    alias=_name_node(prefix + key),
+                    name=sel.name,
+                    arguments=sel.arguments,
+                    directives=sel.directives,
+                    selection_set=sel.selection_set,
+                )
+                sels.append(sel)
+
+                keys[prefix + key] = key
+
+            merged.parts.append((req, keys))
+
+        sel_set = l.SelectionSetNode()
+        sel_set.selections = tuple(sels)
+
+        query = l.OperationDefinitionNode()
+        query.operation = l.OperationType.QUERY
+        query.name = _name_node("Batch")
+        query.variable_definitions = tuple(var_defs)
+        query.directives = ()
+        query.selection_set = sel_set
+
+        merged.document.definitions = (query,)
+        res.append(merged)
+
+    return res, alone
+
+
+def run_batch(requests: List[BatchRequest], run: Runner, *, max_size: int) -> None:
+    """Send `requests` in as few round trips as possible and resolve their
+    futures.
+
+    If a merged document fails, the requests which caused the failure (all of
+    them, unless the errors say otherwise) are retried one by one so that each
+    caller receives its own result or error.
+    """
+    try:
+        merged, alone = merge(requests, max_size=max_size)
+    except Exception:
+        merged, alone = [], list(requests)
+
+    for m in merged:
+        try:
+            data = run(m.document, m.variables)
+        except TransportQueryError as e:
+            alone.extend(m.resolve_partial(e))
+            continue
+        except Exception:
+            alone.extend(req for req, _ in m.parts)
+            continue
+
+        m.resolve(data)
+
+    for req in alone:
+        try:
+            req.set_result(run(req.document, req.variables))
+        except Exception as e:
+            req.set_exception(e)
+
+
+async def run_batch_async(
+    requests: List[BatchRequest], run: AsyncRunner, *, max_size: int
+) -> None:
+    """Like `run_batch`, but sends the merged documents concurrently."""
+    try:
+        merged, alone = merge(requests, max_size=max_size)
+    except Exception:
+        merged, alone = [], list(requests)
+
+    async def run_merged(m: MergedRequest) -> None:
+        try:
+            data = await run(m.document, m.variables)
+        except TransportQueryError as e:
+            await asyncio.gather(*(run_alone(req) for req in m.resolve_partial(e)))
+            return
+        except Exception:
+            await asyncio.gather(*(run_alone(req) for req, _ in m.parts))
+            return
+
+        m.resolve(data)
+
+    async def run_alone(req: BatchRequest) -> None:
+        try:
+            req.set_result(await run(req.document, req.variables))
+        except Exception as e:
+            req.set_exception(e)
+
+    await asyncio.gather(
+        *(run_merged(m) for m in merged), *(run_alone(req) for req in alone)
+    )
+
+
+class Batcher:
+    """Collects requests submitted (from any thread) within `window` seconds of
+    each other and sends them together.
+
+    Thread-safe.
+    """
+
+    def __init__(self, run: Runner, *, window: float, max_size: int):
+        self.run = run
+        self.window = window
+        self.max_size = max_size
+
+        self.pending: List[BatchRequest] = []
+        self.timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+        # the sync client is not thread-safe, so batches are sent one at a time
+        self.send_lock = threading.Lock()
+
+    def submit(
+        self, document: l.DocumentNode, variables: Optional[Dict[str, JsonValue]]
+    ) -> "Future[Any]":
+        fut: "Future[Any]" = Future()
+
+        with self.lock:
+            self.pending.append(BatchRequest(document, variables, fut))
+
+            if self.timer is None:
+                self.timer = threading.Timer(self.window, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+        return fut
+
+    def flush(self) -> None:
+        with self.lock:
+            requests = self.pending
+            self.pending = []
+            self.timer = None
+
+        with self.send_lock:
+            run_batch(requests, self.run, max_size=self.max_size)
+
+
+class AsyncBatcher:
+    """Collects requests submitted on one event loop within `window` seconds of
+    each other and sends them together.
+
+    Not thread-safe - use from the event loop it was created on.
+    """
+
+    def __init__(self, run: AsyncRunner, *, window: float, max_size: int):
+        self.run = run
+        self.window = window
+        self.max_size = max_size
+
+        self.pending: List[BatchRequest] = []
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.tasks: "set[asyncio.Task[None]]" = set()
+
+    def submit(
+        self, document: l.DocumentNode, variables: Optional[Dict[str, JsonValue]]
+    ) -> "asyncio.Future[Any]":
+        loop = asyncio.get_running_loop()
+
+        fut: "asyncio.Future[Any]" = loop.create_future()
+        self.pending.append(BatchRequest(document, variables, fut))
+
+        if self.handle is None:
+            self.handle = loop.call_later(self.window, self.flush)
+
+        return fut
+
+    def flush(self) -> None:
+        requests = self.pending
+        self.pending = []
+        self.handle = None
+
+        # keep a reference so the task is not garbage collected mid-flight
+        task = asyncio.ensure_future(
+            run_batch_async(requests, self.run, max_size=self.max_size)
+        )
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+
+class Batch:
+    """Requests collected by a `batch()` block.
+
+    Not thread-safe.
+    """
+
+    def __init__(self, run: Runner, *, max_size: int):
+        self.run = run
+        self.max_size = max_size
+        self.pending: List[BatchRequest] = []
+
+    def execute(
+        self,
+        document: Union[str, l.DocumentNode],
+        variables: Optional[Dict[str, JsonValue]] = None,
+    ) -> "Future[Any]":
+        """Queue a request. Its result is available once the block exits."""
+        if isinstance(document, str):
+            from latch_sdk_gql.execute import parse_document
+
+            document = parse_document(document)
+
+        fut: "Future[Any]" = Future()
+        self.pending.append(BatchRequest(document, variables, fut))
+        return fut
+
+    def flush(self) -> None:
+        requests = self.pending
+        self.pending = []
+
+        run_batch(requests, self.run, max_size=self.max_size)
+
+    def cancel(self) -> None:
+        for req in self.pending:
+            req.future.cancel()
+
+        self.pending = []
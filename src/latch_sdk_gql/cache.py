@@ -0,0 +1,137 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import graphql.language as l
+
+from latch_sdk_gql import JsonValue
+
+
+def is_mutation(document: l.DocumentNode) -> bool:
+    return any(
+        isinstance(x, l.OperationDefinitionNode)
+        and x.operation == l.OperationType.MUTATION
+        for x in document.definitions
+    )
+
+
+def cache_key(
+    document: l.DocumentNode, variables: Optional[Dict[str, JsonValue]], auth: str
+) -> str:
+    # documents parsed from text keep it around, which is much cheaper than
+    # printing the AST
+    if document.loc is not None:
+        text = document.loc.source.body
+    else:
+        text = l.print_ast(document)
+
+    res = hashlib.sha256()
+    for x in (
+        text,
+        json.dumps(variables or {}, sort_keys=True, default=str),
+        # never store the credentials themselves
+        hashlib.sha256(auth.encode()).hexdigest(),
+    ):
+        res.update(x.encode())
+        res.update(b"\0")
+
+    return res.hexdigest()
+
+
+class ResponseCache:
+    """Cache of GraphQL query responses.
+
+    Entries are kept in memory (at most `max_entries`, evicting the least
+    recently used) and, if `disk_dir` is set, also written to disk so that they
+    are shared with later processes. Each lookup passes its own TTL, so the same
+    entry can be fresh for one query and stale for another.
+
+    Thread-safe.
+    """
+
+    def __init__(self, *, max_entries: int, disk_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+
+        # key -> (time stored, data)
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / f"{key}.json"
+
+    def get(self, key: str, ttl: float) -> Optional[Any]:
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                stored, data = entry
+                if now - stored < ttl:
+                    self.entries.move_to_end(key)
+                    # callers are free to modify their results
+                    return copy.deepcopy(data)
+
+        if self.disk_dir is None:
+            return None
+
+        try:
+            x = json.loads(self._disk_path(key).read_text())
+            stored, data = x["stored"], x["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if now - stored >= ttl:
+            return None
+
+        self._put_memory(key, stored, copy.deepcopy(data))
+        return data
+
+    def _put_memory(self, key: str, stored: float, data: Any) -> None:
+        with self.lock:
+            self.entries[key] = (stored, data)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def put(self, key: str, data: Any) -> None:
+        stored = time.time()
+        self._put_memory(key, stored, copy.deepcopy(data))
+
+        if self.disk_dir is None:
+            return
+
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+            dest = self._disk_path(key)
+            tmp = dest.with_name(
+                f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp.write_text(json.dumps({"stored": stored, "data": data}))
+            os.replace(tmp, dest)
+        except (OSError, TypeError, ValueError):
+            # the disk cache is best-effort
+            pass
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+        if self.disk_dir is None:
+            return
+
+        try:
+            for x in self.disk_dir.iterdir():
+                if x.suffix == ".json":
+                    x.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -5,20 +5,48 @@ try:
 except ImportError:
     from functools import lru_cache as cache
 
+import asyncio
+import ssl
 import time
-from typing import Dict, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Iterator, Optional, Tuple, Union
 
+import aiohttp
 import gql
+from gql.client import AsyncClientSession
+from gql.transport.aiohttp import AIOHTTPTransport
 from gql.transport.requests import RequestsHTTPTransport
 from graphql import DocumentNode
 
 from latch_sdk_config.latch import config
 from latch_sdk_config.user import user_config
 from latch_sdk_gql import AuthenticationError, JsonValue
+from latch_sdk_gql.batch import AsyncBatcher, Batch, Batcher
+from latch_sdk_gql.cache import ResponseCache, cache_key, is_mutation
+
+
+# maximum number of connections kept open by `execute_async` per event loop
+max_async_connections = 100
+
+# `execute_async` sessions are bound to the event loop they were opened on
+_async_sessions: Dict[asyncio.AbstractEventLoop, AsyncClientSession] = {}
+_async_session_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+# see `_session_closer`
+_async_session_closers: Dict[asyncio.AbstractEventLoop, AsyncGenerator[None, None]] = {}
+
+# set by `enable_batching`
+_batch_window: Optional[float] = None
+_batch_max_size = 100
+_batcher: Optional[Batcher] = None
+_async_batchers: Dict[asyncio.AbstractEventLoop, AsyncBatcher] = {}
+
+# set by `enable_response_cache`
+_response_cache: Optional[ResponseCache] = None
 
 
 @cache
-def _get_client() -> gql.Client:
+def _get_auth_header() -> str:
     auth_header: Optional[str] = None
 
     if auth_header is None:
@@ -36,14 +64,274 @@ def _get_client() -> gql.Client:
             "Unable to find credentials to connect to gql server, aborting"
         )
 
+    return auth_header
+
+
+@cache
+def _get_client() -> gql.Client:
     return gql.Client(
         transport=RequestsHTTPTransport(
-            url=config.gql, headers={"Authorization": auth_header}
+            url=config.gql, headers={"Authorization": _get_auth_header()}
         )
     )
 
 
+async def _session_closer(
+    loop: asyncio.AbstractEventLoop, session: AsyncClientSession
+) -> AsyncGenerator[None, None]:
+    """Closes `session`, the session of `loop`, once finalized.
+
+    Event loops finalize their unfinished async generators on shutdown (which
+    `asyncio.run` does before returning), so a started closer ties the session's
+    lifetime to the loop it was opened on.
+    """
+    try:
+        yield
+    finally:
+        if _async_sessions.get(loop) is session:
+            del _async_sessions[loop]
+            _async_session_locks.pop(loop, None)
+            _async_session_closers.pop(loop, None)
+
+        await session.client.close_async()
+
+
+async def _get_async_session() -> AsyncClientSession:
+    loop = asyncio.get_running_loop()
+
+    session = _async_sessions.get(loop)
+    if session is not None:
+        return session
+
+    for x in [x for x in _async_sessions if x.is_closed()]:
+        del _async_sessions[x]
+        _async_session_locks.pop(x, None)
+        _async_session_closers.pop(x, None)
+
+    lock = _async_session_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        session = _async_sessions.get(loop)
+        if session is None:
+            client = gql.Client(
+                transport=AIOHTTPTransport(
+                    url=config.gql,
+                    headers={"Authorization": _get_auth_header()},
+                    ssl=ssl.create_default_context(),
+                    client_session_args={
+                        "connector": aiohttp.TCPConnector(limit=max_async_connections)
+                    },
+                )
+            )
+            session = await client.connect_async()
+            _async_sessions[loop] = session
+
+            # loops only hold weak references to async generators
+            closer = _session_closer(loop, session)
+            await closer.__anext__()
+            _async_session_closers[loop] = closer
+
+    return session
+
+
+async def close_async_session() -> None:
+    """Close the connections opened by `execute_async` on the running event loop.
+
+    Done automatically when the loop shuts down its async generators (e.g. at the
+    end of `asyncio.run`), so this is only needed for loops which are never shut
+    down, or to close the connections early.
+    """
+    closer = _async_session_closers.get(asyncio.get_running_loop())
+    if closer is not None:
+        await closer.aclose()
+
+
+@lru_cache(maxsize=1024)
+def parse_document(query: str) -> DocumentNode:
+    """Parse `query`, reusing the document parsed by earlier calls with the same
+    text.
+
+    The returned document is shared between callers and must not be modified -
+    use `gql.gql` for documents which are edited after parsing.
+    """
+    return gql.gql(query)
+
+
+def enable_response_cache(*, disk: bool = False, max_entries: int = 1000) -> None:
+    """Reuse the responses of queries marked cacheable.
+
+    Once enabled, `execute` and `execute_async` calls passing `cache_ttl` return
+    the response to an identical earlier query (same document, variables and
+    credentials) if it is less than `cache_ttl` seconds old. Responses are kept in
+    memory, at most `max_entries` of them, and with `disk` also under
+    `~/.latch/cache/gql` so that later processes can reuse them.
+
+    Any mutation clears the cache. Pass `bypass_cache=True` to always make a
+    network request (the response still refreshes the cache).
+
+    Also enabled on import if `LATCH_GQL_CACHE` is set - to `disk` to enable the
+    disk cache, or to anything else for memory only.
+    """
+    global _response_cache
+    _response_cache = ResponseCache(
+        max_entries=max_entries,
+        disk_dir=user_config.root / "cache" / "gql" if disk else None,
+    )
+
+
+def disable_response_cache() -> None:
+    """Stop reusing query responses. Responses cached on disk are kept."""
+    global _response_cache
+    _response_cache = None
+
+
+def clear_response_cache() -> None:
+    """Drop every cached response, in memory and on disk."""
+    if _response_cache is not None:
+        _response_cache.clear()
+
+
+def _get_cached(
+    document: DocumentNode,
+    variables: Optional[Dict[str, JsonValue]],
+    *,
+    cache_ttl: Optional[float],
+    bypass_cache: bool,
+) -> Tuple[Optional[str], Optional[Any]]:
+    """The cache key for this query (if it is cacheable) and its cached response
+    (if there is a fresh one). Mutations are never cached."""
+    cache = _response_cache
+    if cache is None or cache_ttl is None or is_mutation(document):
+        return None, None
+
+    key = cache_key(document, variables, _get_auth_header())
+    if bypass_cache:
+        return key, None
+
+    return key, cache.get(key, cache_ttl)
+
+
+def _invalidate(document: DocumentNode) -> None:
+    cache = _response_cache
+    if cache is not None and is_mutation(document):
+        cache.clear()
+
+
+def enable_batching(*, window: float = 0.005, max_size: int = 100) -> None:
+    """Merge queries issued close together into a single request.
+
+    Once enabled, queries passed to `execute` (from any thread) or
+    `execute_async` (on the same event loop) within `window` seconds of each
+    other are sent as one aliased document of up to `max_size` queries, and each
+    caller receives its own slice of the result. Every query is delayed by up to
+    `window` seconds, so this only pays off for concurrent callers.
+
+    Mutations and calls with non-default `max_retries` or `backoff` are sent
+    immediately. Documents with fragments and documents with several operations
+    are always sent alone. If a merged request fails, its queries are retried one
+    by one so that errors reach the caller that caused them.
+    """
+    global _batch_window, _batch_max_size, _batcher
+
+    _batch_window = window
+    _batch_max_size = max_size
+    _batcher = Batcher(_execute, window=window, max_size=max_size)
+    _async_batchers.clear()
+
+
+def disable_batching() -> None:
+    """Send every query as soon as it is issued."""
+    global _batch_window, _batcher
+
+    _batch_window = None
+    _batcher = None
+    _async_batchers.clear()
+
+
+@contextmanager
+def batch(*, max_size: int = 100) -> Iterator[Batch]:
+    """Collect queries and send them together when the block exits.
+
+    `Batch.execute` returns a future instead of waiting for the result:
+
+        with batch() as b:
+            futs = [b.execute(query, {"id": x}) for x in ids]
+
+        results = [fut.result() for fut in futs]
+
+    Queries are merged as with `enable_batching`, up to `max_size` per request.
+    If the block raises, nothing is sent and the futures are cancelled.
+    """
+    b = Batch(_execute, max_size=max_size)
+    try:
+        yield b
+    except BaseException:
+        b.cancel()
+        raise
+
+    b.flush()
+
+
+def _get_async_batcher() -> AsyncBatcher:
+    assert _batch_window is not None
+
+    loop = asyncio.get_running_loop()
+
+    res = _async_batchers.get(loop)
+    if res is None:
+        for x in [x for x in _async_batchers if x.is_closed()]:
+            del _async_batchers[x]
+
+        res = AsyncBatcher(
+            _execute_async, window=_batch_window, max_size=_batch_max_size
+        )
+        _async_batchers[loop] = res
+
+    return res
+
+
+def _batchable(document: DocumentNode, *, max_retries: int, backoff: float) -> bool:
+    """Whether `document` may wait for and be merged with other queries.
+
+    Merged requests are retried with the default options, so callers that ask
+    for different ones are sent alone, as are mutations, which can never be
+    merged and would only be delayed by the batch window.
+    """
+    return not is_mutation(document) and (max_retries, backoff) == (5, 0.1)
+
+
 def execute(
+    document: Union[str, DocumentNode],
+    variables: Optional[Dict[str, JsonValue]] = None,
+    *,
+    max_retries: int = 5,
+    backoff: float = 0.1,
+    cache_ttl: Optional[float] = None,
+    bypass_cache: bool = False,
+):
+    if isinstance(document, str):
+        document = parse_document(document)
+
+    key, res = _get_cached(
+        document, variables, cache_ttl=cache_ttl, bypass_cache=bypass_cache
+    )
+    if res is not None:
+        return res
+
+    batcher = _batcher
+    if batcher is not None and _batchable(
+        document, max_retries=max_retries, backoff=backoff
+    ):
+        res = batcher.submit(document, variables).result()
+    else:
+        res = _execute(document, variables, max_retries=max_retries, backoff=backoff)
+
+    if key is not None and _response_cache is not None:
+        _response_cache.put(key, res)
+
+    return res
+
+
+def _execute(
     document: DocumentNode,
     variables: Optional[Dict[str, JsonValue]] = None,
     *,
@@ -52,15 +340,85 @@ def execute(
 ):
     client = _get_client()
     retries = 0
-    while True:
-        try:
-            return client.execute(document, variables)
-        except Exception:
-            if retries >= max_retries:
-                raise
-
-            time.sleep(backoff * 2**retries)
-            retries += 1
+    try:
+        while True:
+            try:
+                return client.execute(document, variables)
+            except Exception:
+                if retries >= max_retries:
+                    raise
+
+                time.sleep(backoff * 2**retries)
+                retries += 1
+    finally:
+        # even a failed mutation may have changed something
+        _invalidate(document)
+
+
+async def execute_async(
+    document: Union[str, DocumentNode],
+    variables: Optional[Dict[str, JsonValue]] = None,
+    *,
+    max_retries: int = 5,
+    backoff: float = 0.1,
+    cache_ttl: Optional[float] = None,
+    bypass_cache: bool = False,
+):
+    """Like `execute`, but without blocking the event loop.
+
+    Requests from every coroutine on the same event loop share a pool of
+    keep-alive connections (at most `max_async_connections`), so many queries
+    can be in flight at once.
+    """
+    if isinstance(document, str):
+        document = parse_document(document)
+
+    key, res = _get_cached(
+        document, variables, cache_ttl=cache_ttl, bypass_cache=bypass_cache
+    )
+    if res is not None:
+        return res
+
+    if _batch_window is not None and _batchable(
+        document, max_retries=max_retries, backoff=backoff
+    ):
+        res = await _get_async_batcher().submit(document, variables)
+    else:
+        res = await _execute_async(
+            document, variables, max_retries=max_retries, backoff=backoff
+        )
+    if key is not None and _response_cache is not None:
+        _response_cache.put(key, res)
+
+    return res
+
+
+async def _execute_async(
+    document: DocumentNode,
+    variables: Optional[Dict[str, JsonValue]] = None,
+    *,
+    max_retries: int = 5,
+    backoff: float = 0.1,
+):
+    session = await _get_async_session()
+    retries = 0
+    try:
+        while True:
+            try:
+                return await session.execute(document, variables)
+            except Exception:
+                if retries >= max_retries:
+                    raise
+
+                await asyncio.sleep(backoff * 2**retries)
+                retries += 1
+    finally:
+        # even a failed mutation may have changed something
+        _invalidate(document)
+
+
+if os.environ.get("LATCH_GQL_CACHE") is not None:
+    enable_response_cache(disk=os.environ["LATCH_GQL_CACHE"] == "disk")
 
 
 # todo(ayush): add generator impl for subscriptions
@@ -0,0 +1,45 @@
+"""Per-call cost of parsing a query with `gql.gql` vs. `parse_document`.
+
+Run with `python -m tests.bench_parse_document`.
+"""
+
+import timeit
+
+import gql
+
+from latch_sdk_gql.execute import parse_document
+
+# the query sent for every page by `Table.list_records`
+query = """
+    query TableQuery(
+        $id: BigInt!,
+        $argLimit: BigInt!,
+        $argOffset: BigInt!
+    ) {
+        catalogExperiment(id: $id) {
+            allSamplesJoinInfoPaginated(
+                argLimit: $argLimit,
+                argOffset: $argOffset
+            ) {
+                nodes {
+                    id
+                    name
+                    key
+                    data
+                }
+            }
+        }
+    }
+"""
+
+
+def bench(name: str, stmt, number: int) -> None:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{name:>16}: {best / number * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    parse_document.cache_clear()
+
+    bench("gql.gql", lambda: gql.gql(query), 2000)
+    bench("parse_document", lambda: parse_document(query), 200000)
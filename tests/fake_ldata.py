@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import pytest
+from aiohttp import web
+
+from latch.ldata._transfer.node import GetNodeDataResult, NodeData
+from latch.ldata.type import LDataNodeType
+from latch_sdk_config.latch import config
+from latch_sdk_config.user import user_config
+
+
+@dataclass
+class FakeLData:
+    """In-memory stand-in for the LData upload, download and presigned URL
+    endpoints.
+
+    Objects are keyed by their (normalized) remote path. Presigned URLs carry a
+    signature number so that tests can expire them.
+    """
+
+    base: str = ""
+
+    objects: Dict[str, bytes] = field(default_factory=dict)
+    # upload id -> (path, {part number: data})
+    uploads: Dict[str, Tuple[str, Dict[int, bytes]]] = field(default_factory=dict)
+    # (kind, path or upload id, detail)
+    requests: List[Tuple[str, str, Optional[str]]] = field(default_factory=list)
+
+    # presigned urls with these signatures are rejected with 403
+    expired_signatures: Set[int] = field(default_factory=set)
+    next_signature: int = 0
+
+    # the next `fail_parts` part uploads are rejected with `fail_status`
+    fail_parts: int = 0
+    fail_status: int = 400
+    # serve the entire object no matter the Range header
+    ignore_range: bool = False
+
+    modify_time: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for x in self.requests if x[0] == kind)
+
+    def sign(self, path: str) -> str:
+        self.next_signature += 1
+        return f"{self.base}/obj/{path}?sig={self.next_signature}"
+
+    def node_data(self, *paths: str, **kwargs: object) -> GetNodeDataResult:
+        """`get_node_data` for uploads into an existing directory."""
+        return GetNodeDataResult(
+            "1", {p: NodeData("1", "dst", LDataNodeType.dir, "") for p in paths}
+        )
+
+    def remote_node_data(self, *paths: str, **kwargs: object) -> GetNodeDataResult:
+        """`get_node_data` describing the stored objects.
+
+        Objects are versioned by their content and were all modified at
+        `modify_time`.
+        """
+        res: Dict[str, NodeData] = {}
+        for p in paths:
+            path = p.rstrip("/")
+            name = path.rsplit("/", 1)[-1]
+
+            data = self.objects.get(path)
+            if data is not None:
+                res[p] = NodeData(
+                    path,
+                    name,
+                    LDataNodeType.obj,
+                    "",
+                    size=len(data),
+                    modify_time=self.modify_time,
+                    version_id=hashlib.md5(data).hexdigest(),
+                )
+            elif any(k.startswith(f"{path}/") for k in self.objects):
+                res[p] = NodeData(path, name, LDataNodeType.dir, "")
+            else:
+                res[p] = NodeData("", name, LDataNodeType.dir, name)
+
+        return GetNodeDataResult("1", res)
+
+    async def start_upload(self, req: web.Request) -> web.Response:
+        data = await req.json()
+        self.requests.append(("start", data["path"], None))
+
+        if data["part_count"] == 0:
+            self.objects[data["path"]] = b""
+            return web.json_response({"data": {"version_id": "v0"}})
+
+        upload_id = hashlib.md5(
+            f"{data['path']}{len(self.uploads)}".encode()
+        ).hexdigest()
+        self.uploads[upload_id] = (data["path"], {})
+
+        return web.json_response({
+            "data": {
+                "upload_id": upload_id,
+                "urls": [
+                    f"{self.base}/part/{upload_id}/{i + 1}"
+                    for i in range(data["part_count"])
+                ],
+            }
+        })
+
+    async def upload_part(self, req: web.Request) -> web.Response:
+        upload_id = req.match_info["upload_id"]
+        part_number = int(req.match_info["part_number"])
+        body = await req.read()
+
+        if self.fail_parts > 0:
+            self.fail_parts -= 1
+            return web.Response(status=self.fail_status)
+
+        self.uploads[upload_id][1][part_number] = body
+        self.requests.append(("part", upload_id, str(part_number)))
+
+        return web.Response(headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+
+    async def end_upload(self, req: web.Request) -> web.Response:
+        data = await req.json()
+        path, parts = self.uploads[data["upload_id"]]
+
+        content = b""
+        for part in sorted(data["parts"], key=lambda x: x["PartNumber"]):
+            body = parts[part["PartNumber"]]
+            assert part["ETag"] == f'"{hashlib.md5(body).hexdigest()}"'
+            content += body
+
+        self.objects[path] = content
+        self.requests.append(("end", path, None))
+
+        return web.json_response({"data": {}})
+
+    async def get_signed_url(self, req: web.Request) -> web.Response:
+        data = await req.json()
+        self.requests.append(("sign", data["path"], None))
+
+        return web.json_response({"data": {"url": self.sign(data["path"])}})
+
+    async def get_signed_urls_recursive(self, req: web.Request) -> web.Response:
+        data = await req.json()
+        self.requests.append(("sign", data["path"], "recursive"))
+
+        prefix = data["path"].rstrip("/") + "/"
+        return web.json_response({
+            "data": {
+                "urls": {
+                    k[len(prefix) :]: self.sign(k)
+                    for k in self.objects
+                    if k.startswith(prefix)
+                }
+            }
+        })
+
+    async def get_object(self, req: web.Request) -> web.Response:
+        path = req.match_info["path"]
+        rng = req.headers.get("Range")
+        self.requests.append(("get", path, rng))
+
+        if int(req.query["sig"]) in self.expired_signatures:
+            return web.Response(status=403)
+
+        data = self.objects[path]
+        headers = {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+        if rng is None or self.ignore_range:
+            return web.Response(body=data, headers=headers)
+
+        if len(data) == 0:
+            return web.Response(status=416)
+
+        start, end = rng.split("=")[1].split("-")
+        first = int(start)
+        last = min(int(end) if end != "" else len(data) - 1, len(data) - 1)
+
+        headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+        return web.Response(status=206, body=data[first : last + 1], headers=headers)
+
+    async def graphql(self, req: web.Request) -> web.Response:
+        """Answers every query with the number of queries received so far.
+
+        Records the client's port, which identifies the connection the query
+        was sent on.
+        """
+        data = await req.json()
+        port = req.transport.get_extra_info("peername")[1]
+        self.requests.append(("gql", data.get("operationName") or "", str(port)))
+
+        return web.json_response({"data": {"count": self.count("gql")}})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=1024**3)
+        app.router.add_post("/ldata/start-upload", self.start_upload)
+        app.router.add_put("/part/{upload_id}/{part_number}", self.upload_part)
+        app.router.add_post("/ldata/end-upload", self.end_upload)
+        app.router.add_post("/ldata/get-signed-url", self.get_signed_url)
+        app.router.add_post(
+            "/ldata/get-signed-urls-recursive", self.get_signed_urls_recursive
+        )
+        app.router.add_get("/obj/{path:.*}", self.get_object)
+        app.router.add_post("/graphql", self.graphql)
+        return app
+
+
+@pytest.fixture
+def fake_ldata(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[FakeLData]:
+    """Serve a `FakeLData` from a background thread and point the SDK at it.
+
+    Also moves `~/.latch` into `tmp_path` so that journals and indices do not
+    leak between tests.
+    """
+    fake = FakeLData()
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(fake.app())
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+
+    port = site._server.sockets[0].getsockname()[1]
+    fake.base = f"http://127.0.0.1:{port}"
+
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(
+        config.api.data, "start_upload", f"{fake.base}/ldata/start-upload"
+    )
+    monkeypatch.setattr(config.api.data, "end_upload", f"{fake.base}/ldata/end-upload")
+    monkeypatch.setattr(
+        config.api.data, "get_signed_url", f"{fake.base}/ldata/get-signed-url"
+    )
+    monkeypatch.setattr(
+        config.api.data,
+        "get_signed_urls_recursive",
+        f"{fake.base}/ldata/get-signed-urls-recursive",
+    )
+
+    monkeypatch.setattr(user_config, "_root", tmp_path / ".latch")
+    monkeypatch.setattr(user_config, "_token_path", None)
+    monkeypatch.setenv("FLYTE_INTERNAL_EXECUTION_ID", "test")
+
+    try:
+        yield fake
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
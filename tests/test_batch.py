@@ -0,0 +1,195 @@
+import asyncio
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import graphql
+import graphql.language as l
+import pytest
+
+import latch_sdk_gql.execute as execute_module
+from latch_sdk_gql.batch import BatchRequest, merge
+from latch_sdk_gql.execute import execute, execute_async
+
+schema = graphql.build_schema("""
+    type Node {
+        id: ID!
+        name: String
+    }
+
+    type Query {
+        node(id: ID!): Node
+        count: Int
+    }
+
+    type Mutation {
+        rename(id: ID!, name: String!): Node
+    }
+""")
+
+root = {"node": lambda info, id: {"id": id, "name": f"name{id}"}, "count": 3}
+
+
+def request(query: str, variables: Optional[Dict[str, Any]] = None) -> BatchRequest:
+    return BatchRequest(l.parse(query), variables, Future())
+
+
+def run(document: l.DocumentNode, variables: Dict[str, Any]) -> Dict[str, Any]:
+    res = graphql.graphql_sync(
+        schema, l.print_ast(document), root_value=root, variable_values=variables
+    )
+    assert res.errors is None
+    assert res.data is not None
+    return res.data
+
+
+def test_colliding_variables_and_aliases_are_renamed():
+    query = """
+        query Q($id: ID!) {
+            x: node(id: $id) {
+                name
+            }
+            count
+        }
+    """
+    a = request(query, {"id": "1"})
+    b = request(query, {"id": "2"})
+
+    merged, alone = merge([a, b], max_size=10)
+
+    assert alone == []
+    assert len(merged) == 1
+
+    m = merged[0]
+    assert m.variables == {"b0_id": "1", "b1_id": "2"}
+
+    (op,) = m.document.definitions
+    assert isinstance(op, l.OperationDefinitionNode)
+    assert [x.variable.name.value for x in op.variable_definitions] == [
+        "b0_id",
+        "b1_id",
+    ]
+
+    aliases = []
+    for sel in op.selection_set.selections:
+        assert isinstance(sel, l.FieldNode)
+        assert sel.alias is not None
+        aliases.append(sel.alias.value)
+    assert aliases == ["b0_x", "b0_count", "b1_x", "b1_count"]
+
+    m.resolve(run(m.document, m.variables))
+
+    assert a.future.result() == {"x": {"name": "name1"}, "count": 3}
+    assert b.future.result() == {"x": {"name": "name2"}, "count": 3}
+
+
+def test_original_documents_are_not_modified():
+    query = "query Q($id: ID!) { node(id: $id) { id } }"
+    a = request(query, {"id": "1"})
+    b = request(query, {"id": "2"})
+
+    before = l.print_ast(a.document)
+    merge([a, b], max_size=10)
+
+    assert l.print_ast(a.document) == before
+
+
+def test_unmergeable_requests_are_sent_alone():
+    mutation = request(
+        'mutation M($id: ID!) { rename(id: $id, name: "x") { id } }', {"id": "1"}
+    )
+    fragment = request("""
+        query F {
+            node(id: "1") {
+                ...Fields
+            }
+        }
+
+        fragment Fields on Node {
+            name
+        }
+    """)
+    plain = [request("query { count }") for _ in range(2)]
+
+    merged, alone = merge([mutation, *plain, fragment], max_size=10)
+
+    assert len(merged) == 1
+    assert [req for req, _ in merged[0].parts] == plain
+    assert alone == [mutation, fragment]
+
+
+def test_requests_are_split_by_max_size():
+    reqs = [
+        request("query Q($id: ID!) { node(id: $id) { id } }", {"id": str(i)})
+        for i in range(5)
+    ]
+
+    merged, alone = merge(reqs, max_size=2)
+
+    # the last chunk only has one request, which is not worth merging
+    assert [len(m.parts) for m in merged] == [2, 2]
+    assert alone == [reqs[4]]
+
+    for m in merged:
+        m.resolve(run(m.document, m.variables))
+
+    for i, req in enumerate(reqs[:4]):
+        assert req.future.result() == {"node": {"id": str(i)}}
+
+
+def test_mutations_and_custom_retries_bypass_the_batcher(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    submitted: List[str] = []
+    sent: List[Tuple[str, int]] = []
+
+    class FakeBatcher:
+        def submit(self, document: l.DocumentNode, variables: Any) -> "Future[Any]":
+            submitted.append(l.print_ast(document))
+            fut: "Future[Any]" = Future()
+            fut.set_result({})
+            return fut
+
+    def fake_execute(
+        document: l.DocumentNode, variables: Any, *, max_retries: int, backoff: float
+    ) -> Dict[str, Any]:
+        sent.append((l.print_ast(document), max_retries))
+        return {}
+
+    monkeypatch.setattr(execute_module, "_batcher", FakeBatcher())
+    monkeypatch.setattr(execute_module, "_execute", fake_execute)
+
+    query = "query { count }"
+    mutation = 'mutation { rename(id: "1", name: "x") { id } }'
+
+    execute(query)
+    execute(mutation)
+    execute(query, max_retries=0)
+
+    assert submitted == [l.print_ast(l.parse(query))]
+    assert sent == [
+        (l.print_ast(l.parse(mutation)), 5),
+        (l.print_ast(l.parse(query)), 0),
+    ]
+
+
+def test_async_mutations_bypass_the_batcher(monkeypatch: pytest.MonkeyPatch):
+    sent: List[int] = []
+
+    async def fake_execute_async(
+        document: l.DocumentNode, variables: Any, *, max_retries: int, backoff: float
+    ) -> Dict[str, Any]:
+        sent.append(max_retries)
+        return {}
+
+    def get_async_batcher() -> None:
+        raise AssertionError("batched a mutation")
+
+    monkeypatch.setattr(execute_module, "_batch_window", 0.005)
+    monkeypatch.setattr(execute_module, "_get_async_batcher", get_async_batcher)
+    monkeypatch.setattr(execute_module, "_execute_async", fake_execute_async)
+
+    asyncio.run(
+        execute_async('mutation { rename(id: "1", name: "x") { id } }', max_retries=0)
+    )
+
+    assert sent == [0]
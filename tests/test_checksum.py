@@ -0,0 +1,132 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from latch.ldata._transfer import checksum
+from latch.ldata._transfer.checksum import (
+    ChecksumJob,
+    HashIndex,
+    compute_etag,
+    guess_part_size,
+    matching_files,
+    parse_etag,
+)
+from latch_cli.constants import Units, latch_constants
+
+
+def s3_etag(data: bytes, part_size: int) -> str:
+    """Reference implementation of S3's multipart ETag."""
+    parts = [data[i : i + part_size] for i in range(0, len(data), part_size)]
+    digests = b"".join(hashlib.md5(x).digest() for x in parts)
+    return f"{hashlib.md5(digests).hexdigest()}-{len(parts)}"
+
+
+def test_parse_etag():
+    assert parse_etag('"d41d8cd98f00b204e9800998ecf8427e"') == (
+        "d41d8cd98f00b204e9800998ecf8427e",
+        0,
+    )
+    assert parse_etag('"abc-12"') == ("abc", 12)
+    assert parse_etag("abc-12") == ("abc", 12)
+    assert parse_etag("abc-x") == ("abc", 0)
+
+
+def test_guess_part_size_default_chunk_size():
+    size = 3 * latch_constants.file_chunk_size + 1
+    assert guess_part_size(size, 4) == latch_constants.file_chunk_size
+
+
+def test_guess_part_size_large_file():
+    # more than `maximum_upload_parts` default sized chunks
+    size = latch_constants.maximum_upload_parts * latch_constants.file_chunk_size * 2
+    part_size = guess_part_size(size, latch_constants.maximum_upload_parts)
+
+    assert part_size * latch_constants.maximum_upload_parts == size
+
+
+def test_guess_part_size_custom_chunk_size():
+    # e.g. `--chunk-size-mib 5`
+    size = 14 * Units.MiB + 1
+    assert guess_part_size(size, 3) == 5 * Units.MiB
+
+
+def test_guess_part_size_single_part():
+    assert guess_part_size(100, 1) == 100
+    assert guess_part_size(0, 0) == 1
+
+
+@pytest.mark.parametrize("size", [0, 1, Units.MiB, 3 * Units.MiB + 7])
+def test_compute_etag_single_part(tmp_path: Path, size: int):
+    data = os.urandom(size)
+    p = tmp_path / "f"
+    p.write_bytes(data)
+
+    assert compute_etag(p, 0, 0) == hashlib.md5(data).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "size,part_size",
+    [
+        (3 * Units.MiB, Units.MiB),
+        (3 * Units.MiB + 7, Units.MiB),
+        # parts larger than the block size files are hashed in
+        (2 * checksum.hash_block_size + 5, checksum.hash_block_size + 3),
+    ],
+)
+def test_compute_etag_multipart(tmp_path: Path, size: int, part_size: int):
+    data = os.urandom(size)
+    p = tmp_path / "f"
+    p.write_bytes(data)
+
+    expected = s3_etag(data, part_size)
+    _, part_count = parse_etag(expected)
+
+    assert compute_etag(p, part_count, part_size) == expected
+
+
+def test_matching_files_caches_remote_etags(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    data = b"hello"
+    p = tmp_path / "f"
+    p.write_bytes(data)
+
+    fetched: List[str] = []
+
+    def get_remote_etag(signed_url: str) -> str:
+        fetched.append(signed_url)
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    monkeypatch.setattr(checksum, "get_remote_etag", get_remote_etag)
+
+    index = HashIndex(tmp_path / "index.sqlite")
+
+    job = ChecksumJob(p, "url", "node", "v1")
+    assert matching_files([job], index=index) == {p}
+    assert matching_files([job], index=index) == {p}
+    assert len(fetched) == 1
+
+    # a new version is fetched again
+    assert matching_files([ChecksumJob(p, "url", "node", "v2")], index=index) == {p}
+    assert len(fetched) == 2
+
+    # as is an object without a known version
+    assert matching_files([ChecksumJob(p, "url")], index=index) == {p}
+    assert len(fetched) == 3
+
+
+def test_matching_files_detects_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    p = tmp_path / "f"
+    p.write_bytes(b"hello")
+
+    monkeypatch.setattr(
+        checksum, "get_remote_etag", lambda _: hashlib.md5(b"world").hexdigest()
+    )
+
+    index = HashIndex(tmp_path / "index.sqlite")
+    assert matching_files([ChecksumJob(p, "url", "node", "v1")], index=index) == set()
@@ -0,0 +1,152 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from latch.ldata._transfer import concurrency
+from latch.ldata._transfer.concurrency import ConcurrencyController, request_slot
+from latch_cli.constants import Units
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        concurrency, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def run_epoch(
+    controller: ConcurrencyController,
+    clock: SimpleNamespace,
+    *,
+    num_bytes: int = Units.MiB,
+    latency: float = 0.1,
+):
+    """Record one full epoch of requests at the current limit."""
+    clock.now += concurrency.min_epoch_duration
+    for _ in range(controller.get_limit()):
+        controller.record(num_bytes, latency)
+
+
+def test_initial_limit_is_bounded():
+    assert ConcurrencyController(100, maximum=8).get_limit() == 8
+    assert ConcurrencyController(0, minimum=2, maximum=8).get_limit() == 2
+    assert ConcurrencyController(4, minimum=16, maximum=8).get_maximum() == 16
+
+
+def test_slow_start_doubles_up_to_maximum(clock):
+    controller = ConcurrencyController(4, maximum=24)
+
+    limits = []
+    for _ in range(4):
+        run_epoch(controller, clock)
+        limits.append(controller.get_limit())
+
+    assert limits == [8, 16, 24, 24]
+
+
+def test_additive_increase_after_plateau(clock):
+    controller = ConcurrencyController(4, maximum=64)
+
+    run_epoch(controller, clock)
+    assert controller.get_limit() == 8
+
+    # twice as many requests but no more throughput ends slow start
+    run_epoch(controller, clock, num_bytes=Units.MiB // 2)
+    assert controller.get_limit() == 8
+    assert not controller.slow_start
+
+    run_epoch(controller, clock, num_bytes=2 * Units.MiB)
+    assert controller.get_limit() == 9
+
+
+def test_no_decision_before_epoch_ends(clock):
+    controller = ConcurrencyController(4, maximum=64)
+
+    # enough requests, but not enough time
+    for _ in range(10):
+        controller.record(Units.MiB, 0.1)
+    assert controller.get_limit() == 4
+
+    # enough time, but not enough requests
+    controller = ConcurrencyController(4, maximum=64)
+    clock.now += concurrency.min_epoch_duration
+    for _ in range(3):
+        controller.record(Units.MiB, 0.1)
+    assert controller.get_limit() == 4
+
+
+def test_latency_inflation_decreases(clock):
+    controller = ConcurrencyController(8, maximum=64)
+
+    run_epoch(controller, clock, latency=0.1)
+    assert controller.get_limit() == 16
+
+    run_epoch(controller, clock, latency=0.5)
+    assert controller.get_limit() == 8
+    assert not controller.slow_start
+
+
+def test_throttling_decreases_once_per_burst(clock):
+    controller = ConcurrencyController(16, maximum=64)
+
+    clock.now += concurrency.min_epoch_duration
+    for _ in range(5):
+        controller.record(Units.MiB, 0.1, throttled=True)
+    assert controller.get_limit() == 8
+
+    clock.now += concurrency.min_epoch_duration
+    controller.record(Units.MiB, 0.1, throttled=True)
+    assert controller.get_limit() == 4
+
+
+def test_decrease_stops_at_minimum(clock):
+    controller = ConcurrencyController(4, minimum=2, maximum=64)
+
+    for _ in range(5):
+        clock.now += concurrency.min_epoch_duration
+        controller.record(Units.MiB, 0.1, throttled=True)
+
+    assert controller.get_limit() == 2
+
+
+def test_fixed_limit_never_changes(clock):
+    controller = ConcurrencyController(4, maximum=4, fixed=True)
+
+    run_epoch(controller, clock)
+    clock.now += concurrency.min_epoch_duration
+    controller.record(Units.MiB, 0.1, throttled=True)
+
+    assert controller.get_limit() == 4
+
+
+def test_request_slots_are_bounded_by_limit():
+    controller = ConcurrencyController(3, maximum=3, fixed=True)
+
+    lock = threading.Lock()
+    cur = 0
+    peak = 0
+
+    def run():
+        nonlocal cur, peak
+        with request_slot(controller):
+            with lock:
+                cur += 1
+                peak = max(peak, cur)
+
+            time.sleep(0.01)
+
+            with lock:
+                cur -= 1
+
+    threads = [threading.Thread(target=run) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak == 3
+    assert controller.in_flight == 0
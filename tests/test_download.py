@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+from requests.exceptions import ChunkedEncodingError
+
+from latch.ldata._transfer import download
+from latch.ldata._transfer.concurrency import ConcurrencyController
+from latch.ldata._transfer.download import DownloadJob, download_range
+
+
+class FakeProgressBars:
+    def __init__(self):
+        self.total = 0
+
+    def update(self, index: Optional[int], n: int) -> None:
+        self.total += n
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, *, cut_after: Optional[int] = None):
+        self.status_code = 206
+        self.headers: Dict[str, str] = {}
+        self.raw = None
+        self.body = body
+        self.cut_after = cut_after
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        # small chunks so that a cut leaves part of the range written
+        for i in range(0, len(self.body), 10):
+            if self.cut_after is not None and i >= self.cut_after:
+                raise ChunkedEncodingError("connection reset")
+
+            yield self.body[i : i + 10]
+
+    def close(self) -> None: ...
+
+
+def test_cut_off_range_resumes_after_last_byte(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    data = os.urandom(120)
+    requested: List[str] = []
+
+    class FakeSession:
+        def get(self, url: str, *, headers: Dict[str, str], **kwargs: Any):
+            requested.append(headers["Range"])
+
+            start, end = headers["Range"].split("=")[1].split("-")
+            body = data[int(start) : int(end) + 1]
+
+            # the first request is cut off after 30 bytes
+            return FakeResponse(body, cut_after=30 if len(requested) == 1 else None)
+
+    monkeypatch.setattr(download, "http_session", FakeSession())
+    monkeypatch.setattr(download.time, "sleep", lambda _: None)
+
+    dest = tmp_path / "out"
+    dest.write_bytes(b"\0" * 120)
+
+    progress = FakeProgressBars()
+    fd = os.open(dest, os.O_WRONLY)
+    try:
+        download_range(
+            DownloadJob("url", dest),
+            fd,
+            10,
+            100,
+            progress,
+            None,
+            ConcurrencyController(initial=1, maximum=1),
+        )
+    finally:
+        os.close(fd)
+
+    assert requested == ["bytes=10-109", "bytes=40-109"]
+    assert dest.read_bytes()[10:110] == data[10:110]
+    assert progress.total == 100
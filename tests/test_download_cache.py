@@ -0,0 +1,161 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List
+
+import pytest
+
+from latch.ldata import _download_cache
+from latch.ldata._download_cache import DownloadCache, cache_key, link_into
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    clock = SimpleNamespace(now=1000.0)
+
+    def now() -> float:
+        clock.now += 1
+        return clock.now
+
+    monkeypatch.setattr(_download_cache, "time", SimpleNamespace(time=now))
+    return clock
+
+
+def writer(data: bytes, calls: List[Path]) -> Callable[[Path], None]:
+    def download(p: Path) -> None:
+        calls.append(p)
+        p.write_bytes(data)
+
+    return download
+
+
+def test_link_into_copies_without_reflink(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(_download_cache, "reflink", lambda src, dst: False)
+
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"cached")
+
+    dst = tmp_path / "out" / "dst"
+    link_into(blob, dst)
+    assert dst.read_bytes() == b"cached"
+
+    # the destination is an independent copy
+    assert dst.stat().st_ino != blob.stat().st_ino
+    dst.write_bytes(b"edited")
+    assert blob.read_bytes() == b"cached"
+
+    # existing destinations are replaced, without leaving temporary files
+    link_into(blob, dst)
+    assert dst.read_bytes() == b"cached"
+    assert [x.name for x in dst.parent.iterdir()] == ["dst"]
+
+
+@pytest.mark.skipif(_download_cache.fcntl is None, reason="requires fcntl")
+def test_failed_reflink_falls_back_to_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    def ioctl(*args: object) -> None:
+        raise OSError("not supported")
+
+    monkeypatch.setattr(_download_cache.fcntl, "ioctl", ioctl)
+
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"cached")
+
+    assert not _download_cache.reflink(blob, tmp_path / "reflinked")
+    assert not (tmp_path / "reflinked").exists()
+
+    dst = tmp_path / "dst"
+    link_into(blob, dst)
+    assert dst.read_bytes() == b"cached"
+
+
+def test_fetch_reuses_cached_copy(tmp_path: Path):
+    cache = DownloadCache(max_bytes=100, root=tmp_path / "cache")
+    calls: List[Path] = []
+
+    assert not cache.fetch("1", "v1", tmp_path / "a", writer(b"data", calls))
+    assert cache.fetch("1", "v1", tmp_path / "b", writer(b"data", calls))
+    assert len(calls) == 1
+    assert (tmp_path / "b").read_bytes() == b"data"
+
+    # a new version is downloaded again
+    assert not cache.fetch("1", "v2", tmp_path / "c", writer(b"new", calls))
+    assert len(calls) == 2
+
+
+def test_modified_cached_copy_is_not_served(tmp_path: Path):
+    cache = DownloadCache(max_bytes=100, root=tmp_path / "cache")
+    calls: List[Path] = []
+
+    cache.fetch("1", "v1", tmp_path / "a", writer(b"data", calls))
+    cache._blob_path(cache_key("1", "v1")).write_bytes(b"corrupted")
+
+    assert not cache.fetch("1", "v1", tmp_path / "b", writer(b"data", calls))
+    assert (tmp_path / "b").read_bytes() == b"data"
+    assert len(calls) == 2
+
+
+def test_concurrent_fetches_download_once(tmp_path: Path):
+    cache = DownloadCache(max_bytes=100, root=tmp_path / "cache")
+    calls: List[Path] = []
+
+    def slow_download(p: Path) -> None:
+        calls.append(p)
+        time.sleep(0.1)
+        p.write_bytes(b"data")
+
+    threads = [
+        threading.Thread(
+            target=cache.fetch, args=("1", "v1", tmp_path / f"dst{i}", slow_download)
+        )
+        for i in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    for i in range(4):
+        assert (tmp_path / f"dst{i}").read_bytes() == b"data"
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path: Path, clock):
+    cache = DownloadCache(max_bytes=10, root=tmp_path / "cache")
+    calls: List[Path] = []
+
+    cache.fetch("a", "v1", tmp_path / "a", writer(b"aaaaa", calls))
+    cache.fetch("b", "v1", tmp_path / "b", writer(b"bbbbb", calls))
+
+    # `a` is now more recently used than `b`
+    assert cache.fetch("a", "v1", tmp_path / "a", writer(b"aaaaa", calls))
+
+    cache.fetch("c", "v1", tmp_path / "c", writer(b"ccccc", calls))
+
+    assert cache.fetch("a", "v1", tmp_path / "a", writer(b"aaaaa", calls))
+    assert cache.fetch("c", "v1", tmp_path / "c", writer(b"ccccc", calls))
+    assert not cache._blob_path(cache_key("b", "v1")).exists()
+    assert len(calls) == 3
+
+
+@pytest.mark.skipif(_download_cache.fcntl is None, reason="requires fcntl")
+def test_locked_objects_are_not_evicted(tmp_path: Path, clock):
+    cache = DownloadCache(max_bytes=5, root=tmp_path / "cache")
+    calls: List[Path] = []
+
+    cache.fetch("a", "v1", tmp_path / "a", writer(b"aaaaa", calls))
+
+    # e.g. another process linking `a` into its destination
+    with cache._lock(cache_key("a", "v1")):
+        cache.fetch("b", "v1", tmp_path / "b", writer(b"bbbbb", calls))
+
+    assert cache._blob_path(cache_key("a", "v1")).exists()
+
+    # the next eviction catches up
+    cache.fetch("c", "v1", tmp_path / "c", writer(b"ccccc", calls))
+    assert not cache._blob_path(cache_key("a", "v1")).exists()
+    assert not cache._blob_path(cache_key("b", "v1")).exists()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any, List, Optional, Set
+
+import graphql
+import graphql.language as l
+import pytest
+
+import latch_sdk_gql.execute as execute_module
+from latch_sdk_gql.execute import (
+    close_async_session,
+    execute,
+    execute_async,
+    parse_document,
+)
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+
+def test_parse_document_reuses_documents():
+    query = "query Q { count }"
+
+    doc = parse_document(query)
+    assert isinstance(doc, l.DocumentNode)
+    assert parse_document(query) is doc
+
+    # keyed by the exact text
+    other = parse_document("query Q {  count }")
+    assert other is not doc
+    assert l.print_ast(other) == l.print_ast(doc)
+
+
+def test_parse_document_does_not_cache_errors():
+    with pytest.raises(graphql.GraphQLError):
+        parse_document("query {")
+
+    with pytest.raises(graphql.GraphQLError):
+        parse_document("query {")
+
+
+def test_execute_parses_each_query_once(monkeypatch: pytest.MonkeyPatch):
+    sent: List[l.DocumentNode] = []
+
+    def fake_execute(document: l.DocumentNode, variables: Any, **kwargs: Any) -> Any:
+        sent.append(document)
+        return {}
+
+    monkeypatch.setattr(execute_module, "_batcher", None)
+    monkeypatch.setattr(execute_module, "_execute", fake_execute)
+
+    query = "query Q($id: ID!) { node(id: $id) { id } }"
+    execute(query, {"id": "1"})
+    execute(query, {"id": "2"})
+
+    assert sent[0] is sent[1]
+    assert sent[0] is parse_document(query)
+
+
+@pytest.fixture
+def gql_server(fake_ldata: FakeLData, monkeypatch: pytest.MonkeyPatch) -> FakeLData:
+    monkeypatch.setattr(
+        execute_module, "config", SimpleNamespace(gql=f"{fake_ldata.base}/graphql")
+    )
+    monkeypatch.setattr(execute_module, "_get_auth_header", lambda: "token")
+    monkeypatch.setattr(execute_module, "_batch_window", None)
+    monkeypatch.setattr(execute_module, "_response_cache", None)
+    return fake_ldata
+
+
+def connections(fake: FakeLData) -> Set[Optional[str]]:
+    return {port for kind, _, port in fake.requests if kind == "gql"}
+
+
+async def count() -> int:
+    return (await execute_async("query Count { count }"))["count"]
+
+
+def test_concurrent_queries_share_a_session(
+    gql_server: FakeLData, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(execute_module, "max_async_connections", 4)
+
+    async def run() -> List[int]:
+        res = await asyncio.gather(*(count() for _ in range(20)))
+        first = connections(gql_server)
+
+        res += await asyncio.gather(*(count() for _ in range(20)))
+        # kept alive and reused
+        assert connections(gql_server) == first
+
+        # still open until the loop shuts down
+        assert asyncio.get_running_loop() in execute_module._async_sessions
+        return res
+
+    assert sorted(asyncio.run(run())) == list(range(1, 41))
+    assert len(connections(gql_server)) <= 4
+
+    # closed by the loop's shutdown
+    assert execute_module._async_sessions == {}
+    assert execute_module._async_session_closers == {}
+
+
+def test_each_loop_has_its_own_session(gql_server: FakeLData):
+    assert asyncio.run(count()) == 1
+    first = connections(gql_server)
+
+    # the first loop's session is closed, so a new loop opens a new one
+    assert asyncio.run(count()) == 2
+    assert len(connections(gql_server) - first) == 1
+
+
+def test_sessions_are_per_thread_loop(gql_server: FakeLData):
+    results: List[int] = []
+
+    def run() -> None:
+        results.append(asyncio.run(count()))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == [1, 2, 3, 4]
+    assert execute_module._async_sessions == {}
+
+
+def test_close_async_session(gql_server: FakeLData):
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+
+        await count()
+        session = execute_module._async_sessions[loop]
+
+        await close_async_session()
+        assert loop not in execute_module._async_sessions
+
+        # the next query opens a new session
+        await count()
+        assert execute_module._async_sessions[loop] is not session
+
+    asyncio.run(run())
+    assert len(connections(gql_server)) == 2
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from latch.ldata._transfer.journal import UploadJournal
+
+
+def test_journal_is_shared_between_threads(tmp_path: Path):
+    src = tmp_path / "src"
+    src.write_bytes(b"hello")
+
+    journal = UploadJournal(tmp_path / "journal.sqlite")
+
+    def upload(i: int) -> None:
+        journal.start(
+            src, f"dest{i}", upload_id=f"u{i}", urls=["url"], part_count=1, part_size=5
+        )
+        journal.record_part(f"dest{i}", 1, "etag")
+        journal.finish(f"dest{i}")
+
+    with ThreadPoolExecutor(4) as exec:
+        list(exec.map(upload, range(16)))
+
+    assert all(journal.is_finished(f"dest{i}") for i in range(16))
+
+    # closes the connections opened by the worker threads
+    journal.remove()
+    assert not journal.path.exists()
+
+
+def test_resume_entry_round_trip(tmp_path: Path):
+    src = tmp_path / "src"
+    src.write_bytes(b"hello")
+
+    journal = UploadJournal(tmp_path / "journal.sqlite")
+    assert journal.get(src, "dest") is None
+
+    journal.start(
+        src, "dest", upload_id="u", urls=["a", "b"], part_count=2, part_size=3
+    )
+    journal.record_part("dest", 2, "etag2")
+
+    entry = journal.get(src, "dest")
+    assert entry is not None
+    assert entry.upload_id == "u"
+    assert entry.urls == ["a", "b"]
+    assert entry.parts == [(2, "etag2")]
+    assert not entry.completed
+
+    journal.finish("dest")
+    assert journal.is_finished("dest")
+
+
+def test_changed_source_is_not_resumed(tmp_path: Path):
+    src = tmp_path / "src"
+    src.write_bytes(b"hello")
+
+    journal = UploadJournal(tmp_path / "journal.sqlite")
+    journal.start(src, "dest", upload_id="u", urls=["a"], part_count=1, part_size=5)
+
+    src.write_bytes(b"hello world")
+
+    assert journal.get(src, "dest") is None
+    # the stale entry is dropped
+    assert not journal.is_finished("dest")
+    assert journal.conn.execute("select count(*) from uploads").fetchone() == (0,)
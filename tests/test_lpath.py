@@ -0,0 +1,138 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from latch.ldata import path as path_module
+from latch.ldata._transfer import download, upload
+from latch.ldata.path import LPath
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+
+@pytest.fixture
+def remote(fake_ldata: FakeLData, monkeypatch: pytest.MonkeyPatch) -> FakeLData:
+    """Resolves LPath metadata from the objects stored in `fake_ldata`."""
+
+    def query_with_retry(query: str, variables: Dict[str, str]) -> Dict[str, Any]:
+        (data,) = fake_ldata.remote_node_data(variables["path"]).data.values()
+        if not data.exists():
+            return {"ldataResolvePathToNode": None}
+
+        meta = None
+        if data.type == "obj":
+            meta = {
+                "contentSize": str(data.size),
+                "contentType": "application/octet-stream",
+                "versionId": data.version_id,
+            }
+
+        return {
+            "ldataResolvePathToNode": {
+                "path": "",
+                "ldataNode": {
+                    "finalLinkTarget": {
+                        "id": data.id,
+                        "name": data.name,
+                        "type": data.type.upper(),
+                        "ldataObjectMeta": meta,
+                    }
+                },
+            }
+        }
+
+    monkeypatch.setattr(path_module, "query_with_retry", query_with_retry)
+    monkeypatch.setattr(
+        download,
+        "get_node_data_batched",
+        lambda paths, **kwargs: fake_ldata.remote_node_data(*paths),
+    )
+
+    return fake_ldata
+
+
+@pytest.fixture
+def pools(monkeypatch: pytest.MonkeyPatch) -> List[bool]:
+    """Whether each upload pool that is started uses worker processes."""
+    pools: List[bool] = []
+    pool_cls = upload.UploadPool
+
+    def spy(*args: Any, processes: bool = True) -> upload.UploadPool:
+        pools.append(processes)
+        return pool_cls(*args, processes=processes)
+
+    monkeypatch.setattr(upload, "UploadPool", spy)
+    return pools
+
+
+def test_upload_file(fake_ldata: FakeLData, tmp_path: Path, pools: List[bool]):
+    src = tmp_path / "a.txt"
+    src.write_text("a")
+
+    LPath("latch:///a.txt").upload_from(src)
+
+    assert fake_ldata.objects == {"latch:///a.txt": b"a"}
+    # a single file never starts worker processes
+    assert pools == [False]
+
+
+def test_upload_directory(fake_ldata: FakeLData, tmp_path: Path, pools: List[bool]):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    (src / "sub" / "b.txt").write_text("b")
+
+    LPath("latch:///dst").upload_from(src, max_concurrency=2)
+
+    assert fake_ldata.objects == {
+        "latch:///dst/a.txt": b"a",
+        "latch:///dst/sub/b.txt": b"b",
+    }
+    assert pools == [False]
+
+
+def test_download_file_in_ranges(
+    remote: FakeLData, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(download, "ranged_download_threshold", 50)
+
+    data = os.urandom(100)
+    remote.objects["latch:///data.bin"] = data
+
+    dst = LPath("latch:///data.bin").download(tmp_path / "out.bin", chunk_size=30)
+
+    assert dst.read_bytes() == data
+
+    ranges = sorted(
+        (rng for kind, _, rng in remote.requests if kind == "get" and rng is not None),
+        key=lambda x: int(x.split("=")[1].split("-")[0]),
+    )
+    assert ranges == ["bytes=0-", "bytes=30-59", "bytes=60-89", "bytes=90-99"]
+
+
+def test_download_directory(remote: FakeLData, tmp_path: Path):
+    remote.objects["latch:///src/a.txt"] = b"a"
+    remote.objects["latch:///src/sub/b.txt"] = b"b"
+
+    dst = LPath("latch:///src").download(tmp_path / "out")
+
+    assert (dst / "a.txt").read_bytes() == b"a"
+    assert (dst / "sub" / "b.txt").read_bytes() == b"b"
+
+
+def test_cached_download_skips_unchanged_file(remote: FakeLData, tmp_path: Path):
+    remote.objects["latch:///a.txt"] = b"a"
+
+    p = LPath("latch:///a.txt")
+    dst = tmp_path / "a.txt"
+
+    p.download(dst, cache=True)
+    p.download(dst, cache=True)
+    assert remote.count("get") == 1
+
+    remote.objects["latch:///a.txt"] = b"new"
+
+    p.download(dst, cache=True)
+    assert remote.count("get") == 2
+    assert dst.read_bytes() == b"new"
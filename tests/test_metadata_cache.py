@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+
+from latch.ldata import _metadata_cache
+from latch.ldata._metadata_cache import MetadataCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        _metadata_cache, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def test_lookup_by_path_and_node_id():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=10)
+    cache.put("latch:///a/b/", "1", "b")
+
+    assert cache.get("latch:///a/b") == "b"
+    assert cache.get_by_node_id("1") == "b"
+    assert cache.get("latch:///a") is None
+    assert cache.get_by_node_id("2") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache: MetadataCache[str] = MetadataCache(ttl=10, max_entries=10)
+    cache.put("latch:///a", "1", "a")
+
+    clock.now += 10
+    assert cache.get("latch:///a") == "a"
+
+    clock.now += 1
+    assert cache.get("latch:///a") is None
+    assert cache.get_by_node_id("1") is None
+    assert len(cache.entries) == 0
+
+
+def test_put_refreshes_ttl(clock):
+    cache: MetadataCache[str] = MetadataCache(ttl=10, max_entries=10)
+    cache.put("latch:///a", "1", "old")
+
+    clock.now += 8
+    cache.put("latch:///a", "1", "new")
+
+    clock.now += 8
+    assert cache.get("latch:///a") == "new"
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=2)
+    cache.put("latch:///a", "1", "a")
+    cache.put("latch:///b", "2", "b")
+
+    # `a` is now more recently used than `b`
+    assert cache.get("latch:///a") == "a"
+
+    cache.put("latch:///c", "3", "c")
+
+    assert cache.get("latch:///b") is None
+    assert cache.get_by_node_id("2") is None
+    assert cache.get("latch:///a") == "a"
+    assert cache.get("latch:///c") == "c"
+
+
+def test_invalidate_removes_descendants():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=10)
+    cache.put("latch:///a", "1", "a")
+    cache.put("latch:///a/b", "2", "b")
+    cache.put("latch:///a/b/c", "3", "c")
+    cache.put("latch:///ab", "4", "ab")
+
+    cache.invalidate("latch:///a/")
+
+    assert cache.get("latch:///a") is None
+    assert cache.get("latch:///a/b/c") is None
+    assert cache.get_by_node_id("2") is None
+    # only a sibling with a common prefix
+    assert cache.get("latch:///ab") == "ab"
+
+
+def test_invalidate_node_id():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=10)
+    cache.put("latch:///a", "1", "a")
+    cache.put("latch:///a/b", "2", "b")
+    cache.put("latch:///c", "3", "c")
+
+    cache.invalidate_node_id("1")
+
+    assert cache.get("latch:///a") is None
+    assert cache.get("latch:///a/b") is None
+    assert cache.get("latch:///c") == "c"
+
+    # unknown node ids are ignored
+    cache.invalidate_node_id("4")
+    assert cache.get("latch:///c") == "c"
+
+
+def test_moved_node_id_keeps_new_path():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=10)
+    cache.put("latch:///old", "1", "old")
+    cache.put("latch:///new", "1", "new")
+
+    cache.invalidate("latch:///old")
+
+    assert cache.get_by_node_id("1") == "new"
+
+
+def test_clear():
+    cache: MetadataCache[str] = MetadataCache(ttl=60, max_entries=10)
+    cache.put("latch:///a", "1", "a")
+
+    cache.clear()
+
+    assert cache.get("latch:///a") is None
+    assert cache.get_by_node_id("1") is None
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Any, List
+
+import graphql.language as l
+import pytest
+
+from latch.ldata._transfer import node
+
+
+def removed_ids(doc: l.DocumentNode) -> List[str]:
+    (op,) = doc.definitions
+    assert isinstance(op, l.OperationDefinitionNode)
+    assert op.operation == l.OperationType.MUTATION
+
+    res: List[str] = []
+    for i, sel in enumerate(op.selection_set.selections):
+        assert isinstance(sel, l.FieldNode)
+        assert sel.name.value == "ldataRmr"
+        assert sel.alias is not None and sel.alias.value == f"q{i}"
+
+        (arg,) = sel.arguments
+        assert isinstance(arg.value, l.ObjectValueNode)
+        (field,) = arg.value.fields
+        assert field.name.value == "argNodeId"
+        assert isinstance(field.value, l.StringValueNode)
+
+        res.append(field.value.value)
+
+    return res
+
+
+def test_remove_nodes_document():
+    doc = node._remove_nodes_document(["1", "2", "3"])
+    assert removed_ids(doc) == ["1", "2", "3"]
+
+
+def test_remove_nodes_sequential(monkeypatch: pytest.MonkeyPatch):
+    sent: List[List[str]] = []
+
+    def execute(doc: l.DocumentNode, *, max_retries: int) -> Any:
+        # a retry would fail on the nodes removed by the first attempt
+        assert max_retries == 0
+        sent.append(removed_ids(doc))
+
+    monkeypatch.setattr(node, "remove_batch_size", 2)
+    monkeypatch.setattr(node, "execute", execute)
+
+    node.remove_nodes(["1", "2", "3"])
+    assert sent == [["1", "2"], ["3"]]
+
+    # a single batch is never worth an event loop
+    node.remove_nodes(["4", "5"], max_concurrent_batches=4)
+    assert sent[2:] == [["4", "5"]]
+
+
+def test_remove_nodes_concurrent(monkeypatch: pytest.MonkeyPatch):
+    sent: List[List[str]] = []
+    closed: List[bool] = []
+
+    in_flight = 0
+    peak = 0
+
+    async def execute_async(doc: l.DocumentNode, *, max_retries: int) -> Any:
+        nonlocal in_flight, peak
+        assert max_retries == 0
+
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        sent.append(removed_ids(doc))
+
+    async def close_async_session() -> None:
+        closed.append(True)
+
+    monkeypatch.setattr(node, "remove_batch_size", 2)
+    monkeypatch.setattr(node, "execute_async", execute_async)
+    monkeypatch.setattr(node, "close_async_session", close_async_session)
+
+    ids = [str(i) for i in range(9)]
+    node.remove_nodes(ids, max_concurrent_batches=3)
+
+    assert peak == 3
+    assert sorted(x for batch in sent for x in batch) == sorted(ids)
+    assert all(len(batch) <= 2 for batch in sent)
+    # the session is bound to the loop, which is gone once `remove_nodes` returns
+    assert closed == [True]
+
+
+def test_remove_nodes_from_event_loop(monkeypatch: pytest.MonkeyPatch):
+    sent: List[List[str]] = []
+
+    def execute(doc: l.DocumentNode, *, max_retries: int) -> Any:
+        sent.append(removed_ids(doc))
+
+    monkeypatch.setattr(node, "remove_batch_size", 2)
+    monkeypatch.setattr(node, "execute", execute)
+
+    async def run() -> None:
+        node.remove_nodes(["1", "2", "3"], max_concurrent_batches=4)
+
+    asyncio.run(run())
+
+    assert sent == [["1", "2"], ["3"]]
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from latch.ldata._transfer.partial import PartialDownload
+
+
+@pytest.fixture
+def interrupted(tmp_path: Path) -> Path:
+    """Destination of a 100 byte download which wrote two ranges before it was
+    interrupted."""
+    dest = tmp_path / "out.bin"
+
+    partial = PartialDownload(dest)
+    assert not partial.resume("v1", 100)
+
+    partial.path.write_bytes(b"\0" * 100)
+    partial.record(0, 25)
+    partial.record(50, 25)
+
+    return dest
+
+
+def test_sidecar_round_trip(interrupted: Path):
+    partial = PartialDownload(interrupted)
+
+    assert partial.resume("v1", 100)
+    assert partial.ranges == {(0, 25), (50, 25)}
+    assert partial.is_done(50, 25)
+    assert not partial.is_done(25, 25)
+    assert partial.completed_bytes() == 50
+
+
+def test_resume_continues_recording(interrupted: Path):
+    partial = PartialDownload(interrupted)
+    assert partial.resume("v1", 100)
+
+    partial.record(25, 25)
+
+    partial = PartialDownload(interrupted)
+    assert partial.resume("v1", 100)
+    assert partial.completed_bytes() == 75
+
+
+@pytest.mark.parametrize("version_id,size", [("v2", 100), ("v1", 200), (None, 100)])
+def test_changed_object_is_not_resumed(interrupted: Path, version_id, size):
+    partial = PartialDownload(interrupted)
+
+    assert not partial.resume(version_id, size)
+    assert partial.ranges == set()
+    assert partial.completed_bytes() == 0
+
+
+def test_mismatched_version_discards_sidecar(interrupted: Path):
+    partial = PartialDownload(interrupted)
+    assert not partial.resume("v2", 100)
+
+    assert not partial.sidecar.exists()
+    assert not PartialDownload(interrupted).resume("v1", 100)
+
+
+def test_truncated_partial_file_is_not_resumed(interrupted: Path):
+    partial = PartialDownload(interrupted)
+    partial.path.write_bytes(b"\0" * 10)
+
+    assert not partial.resume("v1", 100)
+
+
+def test_corrupt_sidecar_is_not_resumed(interrupted: Path):
+    partial = PartialDownload(interrupted)
+    partial.sidecar.write_text("{")
+
+    assert not partial.resume("v1", 100)
+
+
+def test_finish_moves_into_place(interrupted: Path):
+    partial = PartialDownload(interrupted)
+    assert partial.resume("v1", 100)
+
+    partial.finish()
+
+    assert interrupted.read_bytes() == b"\0" * 100
+    assert not partial.path.exists()
+    assert not partial.sidecar.exists()
@@ -0,0 +1,116 @@
+import io
+import os
+from typing import List, Optional
+
+import pytest
+
+from latch.ldata._transfer.reader import RangeReader
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+path = "latch:///data.bin"
+
+
+@pytest.fixture
+def data(fake_ldata: FakeLData) -> bytes:
+    data = os.urandom(100)
+    fake_ldata.objects[path] = data
+    return data
+
+
+def ranges(fake: FakeLData) -> List[Optional[str]]:
+    """Ranges requested after the reader's size probe."""
+    gets = [rng for kind, _, rng in fake.requests if kind == "get"]
+    assert gets[0] == "bytes=0-0"
+    return gets[1:]
+
+
+def test_random_access(fake_ldata: FakeLData, data: bytes):
+    reader = RangeReader(path, block_size=10, readahead_blocks=0)
+    assert reader.size == 100
+
+    reader.seek(35)
+    assert reader.read(10) == data[35:45]
+
+    reader.seek(-5, io.SEEK_END)
+    assert reader.read() == data[95:]
+    assert reader.read() == b""
+
+    # only the blocks which were touched are fetched
+    assert ranges(fake_ldata) == ["bytes=30-39", "bytes=40-49", "bytes=90-99"]
+
+
+def test_cached_blocks_are_not_refetched(fake_ldata: FakeLData, data: bytes):
+    reader = RangeReader(path, block_size=10, cache_blocks=2, readahead_blocks=0)
+
+    for offset in [0, 5, 10, 0, 20, 0, 10]:
+        reader.seek(offset)
+        assert reader.read(1) == data[offset : offset + 1]
+
+    # block 1 is the least recently used once block 2 is fetched, so it is
+    # evicted while block 0 stays cached
+    assert ranges(fake_ldata) == [
+        "bytes=0-9",
+        "bytes=10-19",
+        "bytes=20-29",
+        "bytes=10-19",
+    ]
+
+
+def test_sequential_reads_fetch_ahead(fake_ldata: FakeLData, data: bytes):
+    reader = RangeReader(path, block_size=10, readahead_blocks=2)
+
+    assert reader.read() == data
+    assert ranges(fake_ldata) == [
+        "bytes=0-9",
+        # the second block starts a sequential read
+        "bytes=10-39",
+        "bytes=40-69",
+        "bytes=70-99",
+    ]
+
+
+def test_expired_url_is_resigned(fake_ldata: FakeLData, data: bytes):
+    reader = RangeReader(path, block_size=10)
+    assert fake_ldata.count("sign") == 1
+
+    fake_ldata.expired_signatures.add(fake_ldata.next_signature)
+
+    assert reader.read(5) == data[:5]
+    assert fake_ldata.count("sign") == 2
+
+    # the new url is kept
+    reader.seek(50)
+    assert reader.read(5) == data[50:55]
+    assert fake_ldata.count("sign") == 2
+
+
+def test_full_object_response(fake_ldata: FakeLData, data: bytes):
+    fake_ldata.ignore_range = True
+    reader = RangeReader(path, block_size=10, readahead_blocks=0)
+
+    # the size comes from the Content-Length of the whole object
+    assert reader.size == 100
+
+    # usable for the first block, since it starts at the beginning of the object
+    assert reader.read(10) == data[:10]
+
+    reader.seek(50)
+    with pytest.raises(RuntimeError):
+        reader.read(10)
+
+
+def test_empty_object(fake_ldata: FakeLData):
+    fake_ldata.objects[path] = b""
+    reader = RangeReader(path)
+
+    assert reader.size == 0
+    assert reader.read() == b""
+
+
+def test_text_mode(fake_ldata: FakeLData):
+    fake_ldata.objects[path] = "héllo\nworld\n".encode()
+    reader = RangeReader(path, block_size=3)
+
+    with io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8") as f:
+        assert f.readlines() == ["héllo\n", "world\n"]
@@ -0,0 +1,128 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import graphql.language as l
+import pytest
+
+import latch_sdk_gql.execute as execute_module
+from latch_sdk_gql import cache as cache_module
+from latch_sdk_gql.cache import ResponseCache, cache_key
+from latch_sdk_gql.execute import execute
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(max_entries=10)
+    cache.put("a", {"x": 1})
+
+    clock.now += 5
+    assert cache.get("a", 10) == {"x": 1}
+    # the TTL is chosen by each lookup
+    assert cache.get("a", 5) is None
+
+    clock.now += 5
+    assert cache.get("a", 10) is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.get("a", 10) == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b", 10) is None
+    assert cache.get("a", 10) == 1
+    assert cache.get("c", 10) == 3
+
+
+def test_results_are_isolated_from_callers():
+    cache = ResponseCache(max_entries=10)
+
+    data = {"node": {"children": [1]}}
+    cache.put("a", data)
+    data["node"]["children"].append(2)
+
+    res = cache.get("a", 10)
+    assert res == {"node": {"children": [1]}}
+    res["node"]["children"].append(3)
+
+    assert cache.get("a", 10) == {"node": {"children": [1]}}
+
+
+def test_disk_cache_is_shared(tmp_path: Path, clock):
+    ResponseCache(max_entries=10, disk_dir=tmp_path).put("a", {"x": 1})
+    assert [x.name for x in tmp_path.iterdir()] == ["a.json"]
+
+    cache = ResponseCache(max_entries=10, disk_dir=tmp_path)
+    assert cache.get("a", 10) == {"x": 1}
+
+    clock.now += 10
+    assert cache.get("a", 10) is None
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_key_is_scoped_to_credentials():
+    doc = l.parse("query Q($id: ID!) { node(id: $id) { id } }")
+
+    key = cache_key(doc, {"id": "1", "x": 2}, "Latch-SDK-Token a")
+    assert key == cache_key(doc, {"x": 2, "id": "1"}, "Latch-SDK-Token a")
+    assert key != cache_key(doc, {"id": "1", "x": 2}, "Latch-SDK-Token b")
+    assert key != cache_key(doc, {"id": "2", "x": 2}, "Latch-SDK-Token a")
+
+
+@pytest.fixture
+def sent(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Documents sent by `execute` while an in-memory response cache is enabled."""
+    sent: List[str] = []
+
+    class FakeClient:
+        def execute(
+            self, document: l.DocumentNode, variables: Optional[Dict[str, Any]]
+        ) -> Dict[str, Any]:
+            sent.append(l.print_ast(document))
+            return {"n": len(sent)}
+
+    monkeypatch.setattr(execute_module, "_batcher", None)
+    monkeypatch.setattr(execute_module, "_get_client", FakeClient)
+    monkeypatch.setattr(execute_module, "_get_auth_header", lambda: "token")
+    monkeypatch.setattr(
+        execute_module, "_response_cache", ResponseCache(max_entries=10)
+    )
+
+    return sent
+
+
+def test_execute_reuses_cacheable_queries(sent: List[str]):
+    query = "query { count }"
+
+    assert execute(query, cache_ttl=60) == {"n": 1}
+    assert execute(query, cache_ttl=60) == {"n": 1}
+    # only queries which opt in are cached
+    assert execute(query) == {"n": 2}
+    # a bypassed lookup still refreshes the cache
+    assert execute(query, cache_ttl=60, bypass_cache=True) == {"n": 3}
+    assert execute(query, cache_ttl=60) == {"n": 3}
+
+
+def test_mutations_bypass_and_clear_the_cache(sent: List[str]):
+    query = "query { count }"
+    mutation = 'mutation { rename(id: "1", name: "x") { id } }'
+
+    assert execute(query, cache_ttl=60) == {"n": 1}
+
+    assert execute(mutation, cache_ttl=60) == {"n": 2}
+    assert execute(mutation, cache_ttl=60) == {"n": 3}
+
+    assert execute(query, cache_ttl=60) == {"n": 4}
@@ -0,0 +1,240 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import graphql.language as l
+import pytest
+
+from latch.ldata._transfer import download
+from latch_cli.services import sync
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+LocalTree = Dict[str, Tuple[Path, os.stat_result]]
+
+
+@pytest.fixture
+def local_tree(tmp_path: Path) -> LocalTree:
+    (tmp_path / "src" / "a").mkdir(parents=True)
+    (tmp_path / "src" / "a" / "x.txt").write_text("x")
+    (tmp_path / "src" / "y.txt").write_text("y")
+
+    src = tmp_path / "src"
+    return {"src": (src, os.stat(src))}
+
+
+def get_extraneous(
+    monkeypatch: pytest.MonkeyPatch, local_tree: LocalTree, remote: Dict[str, List[str]]
+) -> List[str]:
+    listed: List[str] = []
+
+    def get_remote_children(paths: List[str]) -> Dict[str, List[str]]:
+        listed.extend(paths)
+        return {x: remote[x] for x in paths if x in remote}
+
+    monkeypatch.setattr(sync, "get_remote_children", get_remote_children)
+
+    entries = sync.scan_srcs(local_tree, "latch:///dest")
+    res = sync.get_extraneous(entries, ["latch:///dest/src"])
+
+    assert sorted(listed) == ["latch:///dest/src", "latch:///dest/src/a"]
+    return res
+
+
+def test_get_extraneous_removes_empty_directories(
+    monkeypatch: pytest.MonkeyPatch, local_tree: LocalTree
+):
+    res = get_extraneous(
+        monkeypatch,
+        local_tree,
+        {
+            "latch:///dest/src": ["a", "y.txt", "empty"],
+            "latch:///dest/src/a": ["x.txt", "nested_empty"],
+        },
+    )
+
+    assert res == ["latch:///dest/src/a/nested_empty", "latch:///dest/src/empty"]
+
+
+def test_get_extraneous_returns_top_of_subtree(
+    monkeypatch: pytest.MonkeyPatch, local_tree: LocalTree
+):
+    res = get_extraneous(
+        monkeypatch,
+        local_tree,
+        {
+            "latch:///dest/src": ["a", "y.txt", "gone", "z.txt"],
+            "latch:///dest/src/a": ["x.txt"],
+            # never listed since `gone` does not exist locally
+            "latch:///dest/src/gone": ["w.txt"],
+        },
+    )
+
+    assert res == ["latch:///dest/src/gone", "latch:///dest/src/z.txt"]
+
+
+def test_get_extraneous_without_remote_directory(
+    monkeypatch: pytest.MonkeyPatch, local_tree: LocalTree
+):
+    assert get_extraneous(monkeypatch, local_tree, {}) == []
+
+
+@pytest.fixture
+def remote_tree(
+    fake_ldata: FakeLData, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> Path:
+    """Stores `latch:///src` remotely and returns the local sync destination."""
+    fake_ldata.objects["latch:///src/a/x.txt"] = b"x"
+    fake_ldata.objects["latch:///src/y.txt"] = b"y"
+
+    monkeypatch.setattr(sync, "get_node_data", fake_ldata.remote_node_data)
+    monkeypatch.setattr(
+        download,
+        "get_node_data_batched",
+        lambda paths, **kwargs: fake_ldata.remote_node_data(*paths),
+    )
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    return dest
+
+
+def sync_remote(dest: Path, *, delete: bool = False) -> None:
+    sync.sync_remote_to_local(
+        ["latch:///src"], dest, delete=delete, ignore_unsyncable=False
+    )
+
+
+def test_sync_remote_to_local(fake_ldata: FakeLData, remote_tree: Path):
+    sync_remote(remote_tree)
+
+    assert (remote_tree / "src" / "a" / "x.txt").read_bytes() == b"x"
+    assert (remote_tree / "src" / "y.txt").read_bytes() == b"y"
+
+    # downloads take on the remote modification time
+    st = (remote_tree / "src" / "y.txt").stat()
+    assert st.st_mtime == fake_ldata.modify_time.timestamp()
+
+
+def test_sync_remote_to_local_skips_unchanged_files(
+    fake_ldata: FakeLData, remote_tree: Path
+):
+    sync_remote(remote_tree)
+    assert fake_ldata.count("get") == 2
+
+    sync_remote(remote_tree)
+    assert fake_ldata.count("get") == 2
+
+    fake_ldata.objects["latch:///src/y.txt"] = b"new"
+    fake_ldata.modify_time = fake_ldata.modify_time.replace(year=2025)
+
+    sync_remote(remote_tree)
+    assert fake_ldata.count("get") == 3
+    assert (remote_tree / "src" / "y.txt").read_bytes() == b"new"
+
+
+def test_sync_remote_to_local_keeps_newer_local_files(
+    fake_ldata: FakeLData, remote_tree: Path
+):
+    local = remote_tree / "src" / "y.txt"
+    local.parent.mkdir()
+    local.write_bytes(b"local")
+
+    sync_remote(remote_tree)
+
+    assert local.read_bytes() == b"local"
+    assert (remote_tree / "src" / "a" / "x.txt").read_bytes() == b"x"
+
+
+def test_sync_remote_to_local_deletes_extraneous(
+    fake_ldata: FakeLData, remote_tree: Path
+):
+    sync_remote(remote_tree)
+
+    (remote_tree / "src" / "gone.txt").write_text("gone")
+    (remote_tree / "src" / "empty").mkdir()
+    (remote_tree / "src" / "a" / "z.txt").write_text("z")
+
+    sync_remote(remote_tree, delete=True)
+
+    assert sorted(str(p.relative_to(remote_tree)) for p in remote_tree.rglob("*")) == [
+        "src",
+        "src/a",
+        "src/a/x.txt",
+        "src/y.txt",
+    ]
+
+
+def resolve_paths(doc: l.DocumentNode) -> Dict[str, Any]:
+    """Response to a `get_remote_nodes` batch in which every path exists."""
+    (op,) = doc.definitions
+    assert isinstance(op, l.OperationDefinitionNode)
+
+    res: Dict[str, Any] = {}
+    for sel in op.selection_set.selections:
+        assert isinstance(sel, l.FieldNode)
+        assert sel.alias is not None
+
+        (arg,) = sel.arguments
+        assert isinstance(arg.value, l.StringValueNode)
+
+        res[sel.alias.value] = {
+            "finalLinkTarget": {
+                "id": arg.value.value,
+                "type": "OBJ",
+                "pending": False,
+                "removed": False,
+                "ldataObjectMeta": {"versionId": "v1"},
+                "ldataNodeEvents": {"nodes": []},
+            }
+        }
+
+    return res
+
+
+def test_get_remote_nodes_sends_batches_concurrently(monkeypatch: pytest.MonkeyPatch):
+    in_flight = 0
+    peak = 0
+
+    async def execute_async(doc: l.DocumentNode) -> Dict[str, Any]:
+        nonlocal in_flight, peak
+
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        return resolve_paths(doc)
+
+    async def close_async_session() -> None: ...
+
+    def query_with_retry(doc: l.DocumentNode) -> Dict[str, Any]:
+        raise AssertionError("sent a batch sequentially")
+
+    monkeypatch.setattr(sync, "node_data_batch_size", 2)
+    monkeypatch.setattr(sync, "execute_async", execute_async)
+    monkeypatch.setattr(sync, "close_async_session", close_async_session)
+    monkeypatch.setattr(sync, "query_with_retry", query_with_retry)
+
+    paths = [f"latch:///{i}" for i in range(7)]
+    res = sync.get_remote_nodes(paths)
+
+    assert peak > 1
+    assert sorted(res) == paths
+    assert all(res[p].id == p and res[p].version_id == "v1" for p in paths)
+
+
+def test_get_remote_nodes_single_batch(monkeypatch: pytest.MonkeyPatch):
+    sent: List[l.DocumentNode] = []
+
+    def query_with_retry(doc: l.DocumentNode) -> Dict[str, Any]:
+        sent.append(doc)
+        return resolve_paths(doc)
+
+    monkeypatch.setattr(sync, "query_with_retry", query_with_retry)
+
+    res = sync.get_remote_nodes(["latch:///a", "latch:///b"])
+
+    assert len(sent) == 1
+    assert sorted(res) == ["latch:///a", "latch:///b"]
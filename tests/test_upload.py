@@ -0,0 +1,157 @@
+import os
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from latch.ldata._transfer import upload
+from latch.ldata._transfer.concurrency import controller_args
+from latch.ldata._transfer.journal import UploadJournal
+from latch.ldata._transfer.progress import Progress
+from latch_cli.constants import Units
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+
+@pytest.fixture
+def src_tree(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+
+    (src / "a.txt").write_text("a")
+    (src / "empty").write_bytes(b"")
+    (src / "sub" / "big.bin").write_bytes(os.urandom(11 * Units.MiB))
+
+    return src
+
+
+def uploaded(fake: FakeLData, src: Path, dest: str) -> None:
+    for p in src.rglob("*"):
+        if p.is_file():
+            assert fake.objects[f"{dest}/{p.relative_to(src)}"] == p.read_bytes()
+
+
+def test_upload_runs_small_transfers_on_threads(
+    fake_ldata: FakeLData, src_tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(upload, "get_node_data", fake_ldata.node_data)
+
+    pools: List[bool] = []
+    pool_cls = upload.UploadPool
+
+    def spy(*args: Any, processes: bool = True) -> upload.UploadPool:
+        pools.append(processes)
+        return pool_cls(*args, processes=processes)
+
+    monkeypatch.setattr(upload, "UploadPool", spy)
+
+    res = upload.upload(
+        f"{src_tree}/", "latch:///dst", Progress.none, False, chunk_size_mib=5
+    )
+
+    assert pools == [False]
+    assert res.num_files == 3
+    uploaded(fake_ldata, src_tree, "latch:///dst")
+
+    # one part for `a.txt` and three 5 MiB parts for `big.bin`
+    assert fake_ldata.count("part") == 4
+
+    # the journal is removed once the transfer finishes
+    journal = UploadJournal.for_transfer(src_tree, "latch:///dst")
+    assert not journal.path.exists()
+
+
+def run_jobs(jobs: Iterator[upload.UploadJob], *, cores: int) -> None:
+    stats = upload.WalkStats()
+    with upload.UploadPool(controller_args(cores), processes=False) as pool:
+        upload.upload_jobs(
+            jobs,
+            stats,
+            num_bars=0,
+            show_total_progress=False,
+            verbose=False,
+            concurrency_args=controller_args(cores),
+            pool=pool,
+        )
+
+
+def test_walk_is_interleaved_with_uploads(fake_ldata: FakeLData, tmp_path: Path):
+    num_files = 10
+    for i in range(num_files):
+        (tmp_path / f"{i}.txt").write_text(str(i))
+
+    def jobs() -> Iterator[upload.UploadJob]:
+        for i in range(num_files):
+            # files are only pulled from the walk while fewer than 2 are in
+            # flight, so uploads finish before the walk does
+            assert i - fake_ldata.count("end") <= 2
+            yield upload.UploadJob(tmp_path / f"{i}.txt", f"latch:///dst/{i}.txt")
+
+    run_jobs(jobs(), cores=2)
+
+    assert len(fake_ldata.objects) == num_files
+
+
+def test_walk_is_lazy(src_tree: Path):
+    stats = upload.WalkStats()
+    jobs = upload.walk_jobs(src_tree, "latch:///dst", stats)
+
+    # stats only cover the files found so far
+    next(jobs)
+    assert stats.num_files == 1
+
+    rest = list(jobs)
+    assert len(rest) == 2
+    assert stats.num_files == 3
+    assert stats.total_bytes == 11 * Units.MiB + 1
+
+
+def test_interrupted_upload_is_resumed(
+    fake_ldata: FakeLData, src_tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(upload, "get_node_data", fake_ldata.node_data)
+
+    fake_ldata.fail_parts = 1
+    with pytest.raises(Exception):
+        upload.upload(
+            f"{src_tree}/", "latch:///dst", Progress.none, False, chunk_size_mib=5
+        )
+
+    journal = UploadJournal.for_transfer(src_tree, "latch:///dst")
+    assert journal.path.exists()
+
+    upload.upload(
+        f"{src_tree}/",
+        "latch:///dst",
+        Progress.none,
+        False,
+        chunk_size_mib=5,
+        resume=True,
+    )
+
+    uploaded(fake_ldata, src_tree, "latch:///dst")
+
+    # every file kept its upload and no part was sent twice
+    starts = [path for kind, path, _ in fake_ldata.requests if kind == "start"]
+    assert sorted(starts) == sorted(set(starts))
+    assert fake_ldata.count("part") == 4
+    assert not journal.path.exists()
+
+
+def test_upload_without_resume_starts_over(
+    fake_ldata: FakeLData, src_tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(upload, "get_node_data", fake_ldata.node_data)
+
+    fake_ldata.fail_parts = 1
+    with pytest.raises(Exception):
+        upload.upload(
+            f"{src_tree}/", "latch:///dst", Progress.none, False, chunk_size_mib=5
+        )
+
+    upload.upload(
+        f"{src_tree}/", "latch:///dst", Progress.none, False, chunk_size_mib=5
+    )
+
+    uploaded(fake_ldata, src_tree, "latch:///dst")
+    assert fake_ldata.count("start") == 6
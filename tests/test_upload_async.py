@@ -0,0 +1,96 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from latch.ldata._transfer import upload, upload_async
+from latch.ldata._transfer.concurrency import ConcurrencyController
+from latch.ldata._transfer.progress import Progress
+from latch.ldata._transfer.upload_async import Limiter
+from latch_cli.constants import Units
+
+from .fake_ldata import FakeLData, fake_ldata  # noqa: F401
+
+
+@pytest.fixture
+def src_tree(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+
+    (src / "a.txt").write_text("a")
+    (src / "empty").write_bytes(b"")
+    (src / "sub" / "big.bin").write_bytes(os.urandom(11 * Units.MiB))
+
+    return src
+
+
+def upload_tree(
+    fake: FakeLData, src: Path, monkeypatch: pytest.MonkeyPatch
+) -> upload.UploadResult:
+    monkeypatch.setattr(upload, "get_node_data", fake.node_data)
+
+    res = upload.upload(
+        f"{src}/",
+        "latch:///dst",
+        Progress.none,
+        False,
+        chunk_size_mib=5,
+        engine=upload.UploadEngine.aio,
+    )
+
+    for p in src.rglob("*"):
+        if p.is_file():
+            assert fake.objects[f"latch:///dst/{p.relative_to(src)}"] == p.read_bytes()
+
+    return res
+
+
+def test_async_upload(
+    fake_ldata: FakeLData, src_tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    res = upload_tree(fake_ldata, src_tree, monkeypatch)
+
+    assert res.num_files == 3
+    assert res.total_bytes == 11 * Units.MiB + 1
+    # one part for `a.txt` and three 5 MiB parts for `big.bin`
+    assert fake_ldata.count("part") == 4
+
+
+def test_async_upload_retries_throttled_parts(
+    fake_ldata: FakeLData, src_tree: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(upload_async, "backoff_factor", 0)
+    fake_ldata.fail_parts = 2
+    fake_ldata.fail_status = 503
+
+    upload_tree(fake_ldata, src_tree, monkeypatch)
+
+    assert fake_ldata.fail_parts == 0
+    assert fake_ldata.count("part") == 4
+
+
+def test_limiter_follows_controller():
+    controller = ConcurrencyController(2, maximum=4, fixed=True)
+
+    in_flight = 0
+    peak = 0
+
+    async def request(limiter: Limiter) -> None:
+        nonlocal in_flight, peak
+
+        async with limiter:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run() -> Limiter:
+        limiter = Limiter(controller)
+        await asyncio.gather(*(request(limiter) for _ in range(8)))
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert peak == 2
+    assert limiter.in_flight == 0
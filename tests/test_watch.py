@@ -0,0 +1,187 @@
+import os
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+import pytest
+import watchfiles
+
+from latch.ldata._transfer import upload
+from latch_cli.services import sync
+
+Changes = Set[Tuple[watchfiles.Change, str]]
+
+
+class StopWatching(Exception): ...
+
+
+class FakeChanges:
+    """Replays `steps` to `watch_local_to_remote` - sets of changes are returned
+    as is and callables are run before reporting no changes. Stops the watch
+    once every step has been replayed and another `idle` timeouts have passed.
+    """
+
+    def __init__(self, steps: List[Union[Changes, Callable[[], None]]], idle: int = 3):
+        self.steps = steps
+        self.idle = idle
+
+    def get(self, timeout: float) -> Changes:
+        if len(self.steps) > 0:
+            step = self.steps.pop(0)
+            if not callable(step):
+                return step
+
+            step()
+        elif self.idle == 0:
+            raise StopWatching
+        else:
+            self.idle -= 1
+
+        time.sleep(timeout)
+        raise Empty
+
+
+class Remote:
+    def __init__(self, monkeypatch: pytest.MonkeyPatch):
+        self.uploaded: List[Tuple[str, str]] = []
+        self.removed: List[str] = []
+        self.created: List[str] = []
+        self.pools: List[Optional[upload.UploadPool]] = []
+
+        def upload_and_print(
+            jobs: List[upload.UploadJob],
+            *,
+            cores: Optional[int] = None,
+            pool: Optional[upload.UploadPool] = None,
+        ) -> None:
+            self.pools.append(pool)
+            self.uploaded.extend((job.src.read_text(), job.dest) for job in jobs)
+
+        def get_remote_nodes(paths: List[str]) -> Dict[str, sync.RemoteNode]:
+            return {p: sync.RemoteNode(p, "obj", None, None) for p in paths}
+
+        def remove_nodes(ids: List[str], **kwargs: object) -> None:
+            self.removed.extend(ids)
+
+        def execute(document: str, variables: Dict[str, str]) -> None:
+            self.created.append(variables["argPath"])
+
+        monkeypatch.setattr(sync, "watch_settle_time", 0.05)
+        monkeypatch.setattr(sync, "upload_and_print", upload_and_print)
+        monkeypatch.setattr(sync, "get_remote_nodes", get_remote_nodes)
+        monkeypatch.setattr(sync, "remove_nodes", remove_nodes)
+        monkeypatch.setattr(sync, "execute", execute)
+
+
+@pytest.fixture
+def remote(monkeypatch: pytest.MonkeyPatch) -> Remote:
+    return Remote(monkeypatch)
+
+
+@pytest.fixture
+def src(tmp_path: Path) -> Path:
+    src = tmp_path.resolve() / "src"
+    (src / "a").mkdir(parents=True)
+    (src / "a" / "x.txt").write_text("x")
+    (src / "y.txt").write_text("y")
+    return src
+
+
+def watch(
+    src: Path, steps: List[Union[Changes, Callable[[], None]]], *, delete: bool = False
+) -> None:
+    pool = object()
+    with pytest.raises(StopWatching):
+        sync.watch_local_to_remote(
+            {"src": (src, os.stat(src))},
+            FakeChanges(steps),  # type: ignore
+            "latch:///dest",
+            delete=delete,
+            pool=pool,  # type: ignore
+        )
+
+
+def modified(*paths: Path) -> Changes:
+    return {(watchfiles.Change.modified, str(p)) for p in paths}
+
+
+def test_changed_files_are_uploaded(remote: Remote, src: Path):
+    (src / "a" / "x.txt").write_text("x2")
+
+    watch(src, [modified(src / "a" / "x.txt")])
+
+    assert remote.uploaded == [("x2", "latch:///dest/src/a/x.txt")]
+    # every upload shares the session's pool
+    assert len(remote.pools) == 1 and remote.pools[0] is not None
+
+
+def test_files_being_written_are_not_uploaded(remote: Remote, src: Path):
+    p = src / "y.txt"
+
+    def write(data: str) -> Callable[[], None]:
+        def run() -> None:
+            # before the settle time is up, so nothing is uploaded yet
+            assert remote.uploaded == []
+            p.write_text(data)
+
+        return run
+
+    watch(src, [modified(p), write("y1"), write("y12")])
+
+    assert remote.uploaded == [("y12", "latch:///dest/src/y.txt")]
+
+
+def test_deleted_files_are_removed_with_delete(remote: Remote, src: Path):
+    (src / "y.txt").unlink()
+    (src / "a" / "x.txt").unlink()
+    (src / "a").rmdir()
+
+    deleted = {
+        (watchfiles.Change.deleted, str(src / "y.txt")),
+        (watchfiles.Change.deleted, str(src / "a" / "x.txt")),
+        (watchfiles.Change.deleted, str(src / "a")),
+    }
+
+    watch(src, [deleted])
+    assert remote.removed == []
+
+    watch(src, [set(deleted)], delete=True)
+    # only the top of a removed subtree
+    assert sorted(remote.removed) == ["latch:///dest/src/a", "latch:///dest/src/y.txt"]
+
+
+def test_moved_in_directories_are_uploaded(remote: Remote, src: Path):
+    (src / "new" / "sub").mkdir(parents=True)
+    (src / "new" / "sub" / "z.txt").write_text("z")
+    (src / "empty").mkdir()
+
+    watch(
+        src,
+        [
+            {
+                (watchfiles.Change.added, str(src / "new")),
+                (watchfiles.Change.added, str(src / "empty")),
+            }
+        ],
+    )
+
+    assert remote.uploaded == [("z", "latch:///dest/src/new/sub/z.txt")]
+    assert remote.created == ["latch:///dest/src/empty/"]
+
+
+def test_get_watched_dest(tmp_path: Path):
+    roots = {"src": tmp_path / "src", "f.txt": tmp_path / "f.txt"}
+
+    assert sync.get_watched_dest(roots, "latch:///dest", tmp_path / "src") == (
+        "latch:///dest/src",
+        False,
+    )
+    assert sync.get_watched_dest(
+        roots, "latch:///dest", tmp_path / "src" / "a" / "b"
+    ) == ("latch:///dest/src/a/b", True)
+    assert sync.get_watched_dest(roots, "latch:///dest", tmp_path / "f.txt") == (
+        "latch:///dest/f.txt",
+        False,
+    )
+    assert sync.get_watched_dest(roots, "latch:///dest", tmp_path / "other") is None